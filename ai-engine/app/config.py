@@ -29,6 +29,72 @@ class Settings(BaseSettings):
     # App settings
     embedding_model: str = "models/gemini-embedding-001"
     embedding_dimension: int = 768
+    
+    # Batch (document) embedding for ingestion, see app/services/batch_embedder.py
+    embed_batch_max_items: int = 100  # Gemini's per-request limit
+    embed_batch_max_tokens: int = 20_000  # estimated, ~4 chars per token
+    embed_batch_max_bytes: int = 200_000
+    embed_concurrency: int = 4  # starting number of requests in flight
+    embed_max_concurrency: int = 16  # grows towards this while no 429s arrive
+    embed_max_attempts: int = 6
+
+    # Search latency budget
+    query_parse_timeout_seconds: float = 3.0  # fall back to the raw query after this
+    
+    # Shared HTTP connection pools (Gemini and Pinecone, see app/services/api_clients.py)
+    http_max_connections: int = 100
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry_seconds: float = 30.0
+    http_timeout_seconds: float = 10.0
+    pinecone_index_host: str | None = None  # looked up via describe_index when unset
+    
+    # Parsed-query cache (memory LRU + optional Postgres shared tier)
+    parse_cache_size: int = 2048
+    parse_cache_ttl_seconds: int = 86400
+    parse_cache_shared: bool = True  # only used when DATABASE_URL is set
+    rule_parser_min_confidence: float = 1.0  # 1.0 = any unrecognised word goes to the LLM
+    query_embedding_cache_size: int = 4096  # ~3KB per 768-d entry
+    speculative_embedding_min_overlap: float = 0.8  # word overlap needed to reuse the raw-query embedding
+    search_snapshot_max_entries: int = 128  # ranked result sets kept for paging (~300KB each)
+    search_snapshot_ttl_seconds: int = 300
+    # Reuse the ranking of a near-identical recent query (same filters) instead of querying Pinecone
+    enable_semantic_cache: bool = True
+    semantic_cache_size: int = 256  # query vectors kept (one 768-d float32 row each)
+    semantic_cache_ttl_seconds: int = 300
+    semantic_cache_threshold: float = 0.97  # minimum cosine similarity to reuse a ranking
+    
+    # Adaptive Pinecone fetch size for /api/search (widened only when post-filters starve the page).
+    # Off by default: the combined score re-orders whatever window was fetched, so a smaller
+    # window ranks page 1 differently from the fixed top_k. Deeper pages only append.
+    enable_adaptive_fetch: bool = False
+    search_fetch_min_top_k: int = 20
+    search_fetch_max_top_k: int = 100  # ceiling; also the fixed top_k when adaptive fetch is off
+    search_fetch_margin: float = 1.5  # over-fetch factor on top of the selectivity estimate
+    
+    # Two-phase retrieval: query Pinecone for IDs/scores only, rank from a local
+    # store of small fields, fetch full documents for the returned page only
+    search_slim_metadata: bool = False
+    document_store_ranking_size: int = 200_000  # ~200 bytes per issue
+    document_store_size: int = 5_000  # full documents (~3KB each)
+    
+    # Local in-process replica of the index (app/services/local_index.py)
+    search_backend: str = "pinecone"  # "pinecone" or "local"
+    local_index_path: str = "data/local_index"
+    local_index_mode: str = "exact"  # "exact" or "ivf"
+    local_index_nprobe: int = 16  # IVF lists scanned per query
+    local_index_sync: bool = False  # ingestion/cleanup scripts also write the replica
+    
+    # Materialized recent-issues feed
+    enable_recent_feed: bool = True
+    recent_feed_ttl_seconds: int = 300
+    # Per window. ~3KB per match with metadata, so ~1.2MB per refresh response, well
+    # under Pinecone's 4MB query-response limit. Must exceed the /recent query's top_k (200).
+    recent_feed_top_k: int = 400
+    index_stats_ttl_seconds: int = 60  # how long the stats record is trusted before re-reading
+    
+    # Push search topic filters and recent-feed label filters to Pinecone via topics_norm/
+    # labels_norm. Enable once scripts/backfill_normalized_fields.py has run (older records lack the fields).
+    enable_normalized_filters: bool = False
 
     # V4 pipeline feature flags (defaults OFF — enable per-revision via env var)
     enable_v4_shadow: bool = False   # run V4 silently alongside V3, store in audit_v4_shadow
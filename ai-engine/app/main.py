@@ -6,6 +6,7 @@ load_dotenv()  # Load .env file BEFORE other imports that need env vars
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 import logging
 
 from app.routes import search, ingest, issues, users
@@ -24,11 +25,24 @@ async def lifespan(app: FastAPI):
     if engine is not None:
         from app.models import issues, project  # noqa: F401
         from app.models import audit_v4_shadow  # noqa: F401
+        from app.models import query_parse_cache  # noqa: F401
+        from app.models import issue_embedding_cache  # noqa: F401
         Base.metadata.create_all(bind=engine)
     else:
         logging.warning("DATABASE_URL not set - skipping table creation")
+    
+    # Warm search caches in the background so startup isn't blocked on Gemini
+    warm_up_task = None
+    try:
+        warm_up_task = asyncio.create_task(search.get_search_engine().warm_up())
+    except Exception as e:
+        logging.warning(f"Search engine unavailable at startup - skipping warm-up: {e}")
     yield
     # Shutdown: Clean up resources if needed
+    if warm_up_task is not None and not warm_up_task.done():
+        warm_up_task.cancel()
+    from app.services.api_clients import close_api_clients
+    await close_api_clients()
 
 app = FastAPI(
     title="GitHub Contribution Finder",
@@ -56,6 +70,10 @@ app.add_middleware(
 
 )
 
+# Server-Timing header and per-route/per-stage latency histograms for the API
+from app.middleware.server_timing import ServerTimingMiddleware
+app.add_middleware(ServerTimingMiddleware)
+
 # Include routers
 app.include_router(search.router)
 app.include_router(ingest.router)
@@ -0,0 +1,54 @@
+"""Conditional GET (ETag / 304) and Cache-Control for read-mostly endpoints.
+
+Validators are computed from cheap version stamps before the response is
+built: the ingestion generation, ``AuditCache.created_at``,
+``ProjectAudit.v4_audited_at`` and similar. A client or CDN holding a
+matching ETag gets an empty 304 and the route skips building the payload.
+
+ETags are weak (``W/"..."``): two responses that share a validator are
+equivalent, but they may not be byte-identical.
+"""
+
+import hashlib
+import json
+
+from fastapi import Request, Response
+
+# Cache-Control per endpoint. max-age is how long a client may reuse a
+# response without asking; stale-while-revalidate lets CDNs serve the old
+# copy while they fetch a new one.
+CACHE_POLICIES = {
+    "search.recent": "public, max-age=60, stale-while-revalidate=240",
+    "search.stats": "public, max-age=300, stale-while-revalidate=600",
+    "projects.score": "public, max-age=300, stale-while-revalidate=3600",
+    "projects.recent_scores": "public, max-age=60, stale-while-revalidate=300",
+    "users.profile": "public, max-age=60, stale-while-revalidate=300",
+}
+
+
+def make_etag(*parts) -> str:
+    """Weak ETag from version stamps (anything JSON-serialisable via ``str``)."""
+    digest = hashlib.sha256(json.dumps(parts, default=str, sort_keys=True).encode()).hexdigest()
+    return f'W/"{digest[:32]}"'
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison against an If-None-Match header (RFC 9110 13.1.2)."""
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+
+def conditional_response(request: Request, response: Response, etag: str, policy: str) -> Response | None:
+    """Set ETag/Cache-Control on ``response``; return a 304 if the client's copy is current.
+
+    Routes call this with their version stamps before doing the expensive
+    work and return the 304 as-is when it isn't None.
+    """
+    headers = {"ETag": etag, "Cache-Control": CACHE_POLICIES[policy]}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
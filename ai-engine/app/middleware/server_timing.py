@@ -0,0 +1,54 @@
+"""Server-Timing header and per-route latency histograms.
+
+Pure ASGI so the stage record lives in the same context as the endpoint,
+and streaming responses are not buffered. The header is written when the
+response starts, so a streaming route reports only the stages finished by
+then; its route series still records the full duration.
+"""
+
+import time
+
+from app.services.request_timing import server_timing_header, start_request
+from app.services.search_metrics import search_metrics
+
+
+def _route_name(scope) -> str:
+    """Path template of the matched route (bounded cardinality, unlike the raw path)."""
+    route = scope.get("route")
+    if route is not None:
+        return route.path
+    endpoint = scope.get("endpoint")  # Starlette versions that don't expose the route
+    return getattr(endpoint, "__name__", "unmatched")
+
+
+class ServerTimingMiddleware:
+    """Adds ``Server-Timing`` and records ``route:<METHOD> <path>[.<stage>]`` latencies."""
+
+    def __init__(self, app, path_prefix: str = "/api"):
+        self.app = app
+        self.path_prefix = path_prefix
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefix):
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        timings = start_request()
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                total_ms = (time.perf_counter() - start) * 1000
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", server_timing_header(timings, total_ms).encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            series = f"route:{scope['method']} {_route_name(scope)}"
+            search_metrics.observe_ms(series, (time.perf_counter() - start) * 1000)
+            for name, ms in timings.items():
+                search_metrics.observe_ms(f"{series}.{name}", ms)
+                search_metrics.observe_ms(f"stage.{name}", ms)
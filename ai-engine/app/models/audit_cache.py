@@ -39,6 +39,13 @@ class AuditCache(Base):
 
     # Metadata
     created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    # Bumped when a re-audit rewrites the row in place; versions the public score ETags
+    updated_at = Column(
+        DateTime,
+        index=True,
+        default=lambda: datetime.now(timezone.utc),
+        onupdate=lambda: datetime.now(timezone.utc),
+    )
     
     # Composite unique constraint on (repo_url, commit_sha)
     __table_args__ = (
@@ -0,0 +1,44 @@
+"""Index statistics record stored alongside the issues in Pinecone."""
+
+import json
+
+from pydantic import BaseModel
+
+# Fixed Pinecone ID of the stats record. Searches exclude it via `type: stats`.
+STATS_RECORD_ID = "__index_stats__"
+
+
+class IndexStats(BaseModel):
+    """Aggregate numbers maintained by ingestion and cleanup.
+
+    Pinecone metadata can't hold nested objects, so ``language_counts`` is
+    stored as a JSON string (see ``to_metadata`` / ``from_metadata``).
+    """
+
+    last_updated: str | None = None  # newest issue updated_at (ISO format)
+    last_updated_ts: int = 0
+    total_issues: int = 0
+    unique_repos: int | None = None  # recounted by cleanup and rebuild; ingestion leaves it
+    language_counts: dict[str, int] = {}
+    generation: int = 0  # bumped on every write, used as a cheap version stamp
+    computed_at: int = 0  # Unix timestamp of the last write
+
+    def to_metadata(self) -> dict:
+        """Flatten into Pinecone-compatible metadata."""
+        metadata = self.model_dump(exclude={"language_counts"}, exclude_none=True)
+        metadata["type"] = "stats"
+        metadata["language_counts_json"] = json.dumps(self.language_counts, sort_keys=True)
+        return metadata
+
+    @classmethod
+    def from_metadata(cls, metadata: dict) -> "IndexStats":
+        """Inverse of ``to_metadata``. Pinecone returns numbers as floats."""
+        data = {k: v for k, v in metadata.items() if k in cls.model_fields}
+        for key in ("last_updated_ts", "total_issues", "unique_repos", "generation", "computed_at"):
+            if data.get(key) is not None:
+                data[key] = int(data[key])
+        data["language_counts"] = {
+            lang: int(count)
+            for lang, count in json.loads(metadata.get("language_counts_json") or "{}").items()
+        }
+        return cls(**data)
@@ -42,6 +42,10 @@ class IssueMetadata(BaseModel):
     is_good_first_issue: bool = False
     is_help_wanted: bool = False
     
+    # Lower-cased copies for server-side `$in` filters (Pinecone matching is case-sensitive)
+    labels_norm: list[str] = []
+    topics_norm: list[str] = []
+    
     # Ingestion metadata
     ingested_at: int = 0  # Unix timestamp
 
@@ -0,0 +1,29 @@
+"""Issue Embedding Cache Model — content-addressed document embeddings.
+
+Key: ``content_hash`` = sha256(model + dimension + task + issue text).
+GitHub bumps ``updated_at`` for every comment, reaction or label edit, but
+the text we embed often stays the same; ingestion looks the hash up here
+before calling Gemini. Vectors are stored as raw float32 bytes.
+"""
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, String, Integer, LargeBinary, DateTime, Index
+
+from app.database import Base
+
+
+class IssueEmbeddingCache(Base):
+    __tablename__ = "issue_embedding_cache"
+
+    content_hash = Column(String(64), primary_key=True)
+
+    model = Column(String, nullable=False)
+    dimension = Column(Integer, nullable=False)
+    embedding = Column(LargeBinary, nullable=False)  # float32, little-endian
+
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    last_used_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+
+    __table_args__ = (
+        Index("ix_issue_embedding_cache_last_used_at", "last_used_at"),
+    )
@@ -1,6 +1,6 @@
 """Query and search result models."""
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Literal
 
 
@@ -10,6 +10,8 @@ class SearchQuery(BaseModel):
     query: str
     limit: int = 20
     page: int = 1  # Current page (1-indexed)
+    cursor: str | None = None  # Snapshot cursor from a previous page of this search
+    fields: list[str] | None = None  # SearchResult fields to return (e.g. omit "body"); None = all
     
     # Optional Manual Filters (Override AI detection)
     language: str | None = None
@@ -78,3 +80,28 @@ class RecentResponse(BaseModel):
     
     results: list[SearchResult]
     total: int
+
+
+class RecentFeedSpec(BaseModel):
+    """One feed (tab) of a batch recent-issues request; same options as ``/recent``."""
+    
+    limit: int = Field(default=20, ge=1, le=100)
+    sort_by: Literal["newest", "recently_discussed", "relevance", "stars"] = "recently_discussed"
+    languages: list[str] | None = None
+    labels: list[str] | None = None
+    days_ago: float | None = None
+    unassigned_only: bool = False
+
+
+class RecentBatchRequest(BaseModel):
+    """Several recent feeds for one page load."""
+    
+    feeds: list[RecentFeedSpec] = Field(min_length=1, max_length=10)
+    include_stats: bool = True  # Also return what /stats and /last-updated would
+
+
+class RecentBatchResponse(BaseModel):
+    """Feeds in request order, plus index stats when requested."""
+    
+    feeds: list[RecentResponse]
+    stats: dict | None = None
@@ -0,0 +1,33 @@
+"""Query Parse Cache Model — shared tier for parsed search queries.
+
+Key: ``cache_key`` = sha256(prompt version + normalized query text).
+The prompt version changes whenever ``SYSTEM_PROMPT`` or the parser model
+changes, so old rows simply stop matching instead of needing a purge.
+"""
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, String, JSON, DateTime, Index
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.database import Base
+
+
+class QueryParseCache(Base):
+    __tablename__ = "query_parse_cache"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+
+    cache_key = Column(String(64), nullable=False)
+    prompt_version = Column(String(16), nullable=False)
+    query_text = Column(String, nullable=False)
+
+    parsed_query = Column(JSON, nullable=False)
+
+    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    expires_at = Column(DateTime, nullable=True)
+
+    __table_args__ = (
+        Index("ix_query_parse_cache_key", "cache_key", unique=True),
+        Index("ix_query_parse_cache_expires_at", "expires_at"),
+    )
@@ -2,11 +2,13 @@
 
 from fastapi import APIRouter, BackgroundTasks, HTTPException
 from pydantic import BaseModel
+import asyncio
 import logging
 
 from app.config import get_settings
 from app.services.github_fetcher import GitHubFetcher
 from app.services.embedder import EmbeddingService
+from app.services.embedding_store import IssueEmbeddingStore
 from app.services.pinecone_client import PineconeClient
 from app.models.issue import Issue
 
@@ -31,12 +33,22 @@ class IngestStatus(BaseModel):
 ingestion_status = {"running": False, "message": "No ingestion in progress"}
 
 
+def invalidate_search_caches() -> None:
+    """Drop the search engine's index caches. Runs on the event loop, which owns them."""
+    try:
+        from app.routes.search import get_search_engine
+        get_search_engine().invalidate_index_caches()
+    except Exception as e:
+        logger.warning(f"Could not invalidate search caches: {e}")
+
+
 def run_ingestion(
     languages: list[str],
     repos_per_language: int,
-    max_issues_per_repo: int
+    max_issues_per_repo: int,
+    loop: asyncio.AbstractEventLoop
 ):
-    """Background task to run ingestion."""
+    """Background task to run ingestion (in the threadpool; ``loop`` is the app's)."""
     global ingestion_status
     
     try:
@@ -44,6 +56,7 @@ def run_ingestion(
         
         fetcher = GitHubFetcher()
         embedder = EmbeddingService()
+        embedding_store = IssueEmbeddingStore(embedder)
         pinecone = PineconeClient()
         
         # Ensure index exists
@@ -71,7 +84,7 @@ def run_ingestion(
                     
                 # Generate embeddings
                 texts = [embedder.create_issue_text(m) for m in issues_metadata]
-                embeddings = embedder.generate_embeddings_batch(texts)
+                embeddings = embedding_store.embed_documents(texts)
                 
                 # Create Issue objects
                 issues = []
@@ -94,6 +107,9 @@ def run_ingestion(
             "message": f"Completed! Ingested {total_issues} issues."
         }
         
+        # New issues should show up on the homepage without waiting for the TTL
+        loop.call_soon_threadsafe(invalidate_search_caches)
+        
     except Exception as e:
         logger.error(f"Ingestion error: {e}")
         ingestion_status = {"running": False, "message": f"Error: {str(e)}"}
@@ -124,7 +140,8 @@ async def start_ingestion(
         run_ingestion,
         languages,
         request.repos_per_language,
-        request.max_issues_per_repo
+        request.max_issues_per_repo,
+        asyncio.get_running_loop()
     )
     
     return IngestStatus(
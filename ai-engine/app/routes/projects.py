@@ -1,7 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Request
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Request, Response
 from functools import lru_cache
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import desc, func
 from pydantic import BaseModel, Field
 from app.database import SessionLocal, get_db
 from app.models.project import Project, ProjectAudit, TechTag, TagCategory
@@ -11,6 +11,7 @@ from app.models.audit_v4_shadow import AuditV4Shadow
 from app.services.cache_service import AuditCacheService, get_repo_code_hash
 from app.services.v4_shadow_runner import run_v4, run_v4_cached
 from app.middleware.rate_limit import scan_limiter, audit_limiter
+from app.middleware.http_cache import conditional_response, make_etag
 from app.config import get_settings
 from devproof_ranking_algo import AuditService
 import asyncio
@@ -482,6 +483,8 @@ async def get_project_audit_status(
 async def get_public_score(
     owner: str,
     repo: str,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
 ):
     """Lookup cached score for a repo. Powers /score/[owner]/[repo] page.
@@ -489,22 +492,47 @@ async def get_public_score(
     Returns V3 fields from ``audit_cache`` (always) and — when a verified
     project exists for this repo with V4 data populated — also a ``v4``
     block. Frontend prefers V4 when present.
+
+    The ETag comes from the newest cache row's ``updated_at`` and
+    ``v4_audited_at``, read without the JSON columns; a 304 skips loading
+    them at all.
     """
     repo_url = f"https://github.com/{owner}/{repo}"
 
-    entry = (
-        db.query(AuditCache)
+    entry_version = (
+        db.query(AuditCache.id, AuditCache.updated_at)
         .filter(AuditCache.repo_url == repo_url)
         .order_by(desc(AuditCache.created_at))
         .first()
     )
-    if not entry:
+    if not entry_version:
         raise HTTPException(status_code=404, detail="No score found for this repository")
 
+    # V4 augmentation — find the most recent verified project with V4 data
+    # for this repo. Applicant-specific scores, so "first verified" wins on
+    # the public page (essentially whoever claimed it).
+    v4_version = (
+        db.query(ProjectAudit.id, ProjectAudit.v4_audited_at)
+        .join(Project, ProjectAudit.project_id == Project.id)
+        .filter(
+            Project.repo_url == repo_url,
+            Project.is_verified == True,  # noqa: E712
+            ProjectAudit.v4_output.isnot(None),
+        )
+        .order_by(desc(ProjectAudit.v4_audited_at))
+        .first()
+    )
+    etag = make_etag("score", repo_url, tuple(entry_version), v4_version and tuple(v4_version))
+    not_modified = conditional_response(request, response, etag, "projects.score")
+    if not_modified is not None:
+        return not_modified
+
+    entry = db.get(AuditCache, entry_version.id)
+
     report = entry.audit_report or {}
     breakdown = report.get("score_breakdown", {})
 
-    response = {
+    payload = {
         "owner": owner,
         "repo": repo,
         "repo_url": repo_url,
@@ -522,22 +550,9 @@ async def get_public_score(
         "scored_at": entry.created_at.isoformat() if entry.created_at else None,
     }
 
-    # V4 augmentation — find the most recent verified project with V4 data
-    # for this repo. Applicant-specific scores, so "first verified" wins on
-    # the public page (essentially whoever claimed it).
-    v4_row = (
-        db.query(ProjectAudit)
-        .join(Project, ProjectAudit.project_id == Project.id)
-        .filter(
-            Project.repo_url == repo_url,
-            Project.is_verified == True,  # noqa: E712
-            ProjectAudit.v4_output.isnot(None),
-        )
-        .order_by(desc(ProjectAudit.v4_audited_at))
-        .first()
-    )
+    v4_row = db.get(ProjectAudit, v4_version.id) if v4_version is not None else None
     if v4_row is not None:
-        response["v4"] = {
+        payload["v4"] = {
             "score": v4_row.v4_score,
             "tier": v4_row.v4_tier,
             "output": v4_row.v4_output,
@@ -547,15 +562,27 @@ async def get_public_score(
             ),
         }
 
-    return response
+    return payload
 
 
 @router.get("/recent-scores")
 async def get_recent_scores(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     limit: int = 6,
 ):
-    """Latest scored repos from cache. Powers 'Recently Scored' landing section."""
+    """Latest scored repos from cache. Powers 'Recently Scored' landing section.
+
+    Re-audits rewrite rows in place and bump ``updated_at`` (inserts set it
+    too), so the newest ``updated_at`` versions the list.
+    """
+    latest = db.query(func.max(AuditCache.updated_at)).scalar()
+    etag = make_etag("recent-scores", latest, min(limit, 12))
+    not_modified = conditional_response(request, response, etag, "projects.recent_scores")
+    if not_modified is not None:
+        return not_modified
+
     entries = (
         db.query(AuditCache)
         .order_by(desc(AuditCache.created_at))
@@ -1,12 +1,23 @@
 """Search API routes."""
 
 from functools import lru_cache
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
 from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+import json
 import logging
+import time
 
-from app.models.query import SearchQuery, SearchResult, ParsedQuery, RecentResponse
+from app.middleware.http_cache import conditional_response, make_etag
+from app.models.query import (
+    SearchQuery, SearchResult, ParsedQuery, RecentResponse, RecentBatchRequest, RecentBatchResponse
+)
+from app.services.candidates import Candidate
+from app.services.metadata_columns import FILTER_FIELDS
+from app.services.request_timing import stage
 from app.services.search_engine import SearchEngine
+from app.services.search_metrics import search_metrics
+from app.services.search_snapshots import SearchSnapshot
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/search", tags=["search"])
@@ -17,6 +28,123 @@ def get_search_engine() -> SearchEngine:
     return SearchEngine()
 
 
+async def _paginate(
+    search_engine: SearchEngine,
+    candidates: list[Candidate],
+    parsed_query: dict,
+    query: SearchQuery,
+    cursor: str,
+    complete: bool = True
+) -> dict:
+    """Slice one page out of a ranked candidate list and materialize only that page.
+    
+    ``total`` is a lower bound when the list is incomplete; ``has_next`` stays
+    true so the client can ask for the next page.
+    """
+    page_candidates, pagination = _page(candidates, query, cursor, complete)
+    await search_engine.hydrate(page_candidates)
+    include = set(query.fields) if query.fields else None
+    
+    with stage("serialize"):
+        results = [c.to_result().model_dump(include=include) for c in page_candidates if c.full]
+    return {
+        "results": results,
+        "parsed_query": parsed_query,
+        **pagination
+    }
+
+
+def _page(
+    candidates: list[Candidate],
+    query: SearchQuery,
+    cursor: str,
+    complete: bool
+) -> tuple[list[Candidate], dict]:
+    """The requested page's candidates and the pagination fields of the response."""
+    total = len(candidates)
+    total_pages = (total + query.limit - 1) // query.limit if total > 0 else 1
+    page = max(1, min(query.page, total_pages))
+    
+    start_idx = (page - 1) * query.limit
+    end_idx = start_idx + query.limit
+    
+    return candidates[start_idx:end_idx], {
+        "total": total,
+        "page": page,
+        "limit": query.limit,
+        "total_pages": total_pages,
+        "has_next": page < total_pages or not complete,
+        "has_prev": page > 1,
+        "cursor": cursor
+    }
+
+
+async def _extend_snapshot(search_engine: SearchEngine, snapshot: SearchSnapshot, query: SearchQuery) -> None:
+    """Fetch deep enough for ``query.page`` and append to the snapshot without re-ranking served pages."""
+    candidates, _, complete = await search_engine.search_candidates(query)
+    snapshot.extend(candidates, complete)
+
+
+def _ndjson(event: dict) -> bytes:
+    return (json.dumps(event, default=str) + "\n").encode()
+
+
+async def _stream_search(search_engine: SearchEngine, query: SearchQuery):
+    """NDJSON events for ``POST /api/search/stream`` (see there)."""
+    start = time.perf_counter()
+    timing = {}
+    
+    def elapsed_ms() -> float:
+        return round((time.perf_counter() - start) * 1000, 2)
+    
+    try:
+        snapshot = search_engine.snapshots.get(query.cursor, query) if query.cursor else None
+        if snapshot is not None:
+            parsed_query, cursor = snapshot.parsed_query, query.cursor
+            yield _ndjson({"type": "parsed", "parsed_query": parsed_query})
+            timing["parsed"] = elapsed_ms()
+            if not snapshot.covers(query.page, query.limit):
+                await _extend_snapshot(search_engine, snapshot, query)
+            candidates, complete = snapshot.candidates, snapshot.complete
+        else:
+            parsed, speculative = await search_engine.parse_search_query(query)
+            parsed_query = parsed.model_dump()
+            yield _ndjson({"type": "parsed", "parsed_query": parsed_query})
+            timing["parsed"] = elapsed_ms()
+            candidates, complete = await search_engine.retrieve_candidates(query, parsed, speculative)
+            cursor = search_engine.snapshots.create(
+                query, candidates=candidates, parsed_query=parsed_query, complete=complete
+            )
+        search_metrics.observe_ms("stream.parsed", timing["parsed"])
+        
+        page_candidates, pagination = _page(candidates, query, cursor, complete)
+        await search_engine.hydrate(page_candidates)
+        include = set(query.fields) if query.fields else None
+        rank = (pagination["page"] - 1) * query.limit
+        for candidate in page_candidates:
+            if not candidate.full:
+                continue
+            rank += 1
+            with stage("serialize"):
+                result = candidate.to_result().model_dump(mode="json", include=include)
+            yield _ndjson({"type": "result", "rank": rank, "result": result})
+            if "first_result" not in timing:
+                timing["first_result"] = elapsed_ms()
+                search_metrics.observe_ms("stream.first_result", timing["first_result"])
+        
+        timing["total"] = elapsed_ms()
+        search_metrics.observe_ms("stream.total", timing["total"])
+        yield _ndjson({"type": "done", **pagination, "timing_ms": timing})
+        
+    except Exception as e:
+        logger.error(f"Streaming search error: {e}")
+        search_metrics.incr("stream.error")
+        yield _ndjson({
+            "type": "error",
+            "detail": "Search service is temporarily unavailable. Please try again in a moment."
+        })
+
+
 @router.post("")
 async def search(
     query: SearchQuery,
@@ -30,30 +158,33 @@ async def search(
     - Structured filters (language, stars, labels, etc.)
     
     Returns matching issues ranked by combined score (relevance + recency + stars).
+    
+    ``fields`` limits each result to the listed keys (e.g. everything but
+    ``body``).
+    
+    Every response carries a ``cursor``. Sending it back with the same query
+    and a different ``page`` serves that page from a short-lived snapshot
+    of the ranked results, without re-running the search.
     """
     try:
-        all_results, parsed_query = await search_engine.search(query)
-        
-        # Calculate pagination
-        total = len(all_results)
-        total_pages = (total + query.limit - 1) // query.limit if total > 0 else 1
-        page = max(1, min(query.page, total_pages))
+        # Later pages of the same search are served from the snapshot
+        if query.cursor:
+            snapshot = search_engine.snapshots.get(query.cursor, query)
+            if snapshot is not None:
+                if not snapshot.covers(query.page, query.limit):
+                    await _extend_snapshot(search_engine, snapshot, query)
+                return await _paginate(
+                    search_engine, snapshot.candidates, snapshot.parsed_query,
+                    query, query.cursor, snapshot.complete
+                )
         
-        # Slice results for current page
-        start_idx = (page - 1) * query.limit
-        end_idx = start_idx + query.limit
-        page_results = all_results[start_idx:end_idx]
+        candidates, parsed_query, complete = await search_engine.search_candidates(query)
         
-        return {
-            "results": [r.model_dump() for r in page_results],
-            "parsed_query": parsed_query.model_dump(),
-            "total": total,
-            "page": page,
-            "limit": query.limit,
-            "total_pages": total_pages,
-            "has_next": page < total_pages,
-            "has_prev": page > 1
-        }
+        parsed = parsed_query.model_dump()
+        cursor = search_engine.snapshots.create(
+            query, candidates=candidates, parsed_query=parsed, complete=complete
+        )
+        return await _paginate(search_engine, candidates, parsed, query, cursor, complete)
         
     except Exception as e:
         logger.error(f"Search error: {e}")
@@ -63,8 +194,37 @@ async def search(
         )
 
 
+@router.post("/stream")
+async def search_stream(
+    query: SearchQuery,
+    search_engine: SearchEngine = Depends(get_search_engine)
+) -> StreamingResponse:
+    """
+    Streaming variant of ``POST /api/search`` as NDJSON (one JSON object per line).
+    
+    Events, in order:
+    - ``{"type": "parsed", "parsed_query": {...}}`` as soon as the query is
+      parsed, before embedding and retrieval, so filter chips can render
+    - ``{"type": "result", "rank": n, "result": {...}}`` for each row of the
+      requested page, in score order (``fields`` applies as usual)
+    - ``{"type": "done", ...}`` with the pagination fields of
+      ``POST /api/search`` (including ``cursor``, usable with either
+      endpoint) and ``timing_ms`` for parsed / first_result / total
+    
+    A failure after the stream has started ends it with
+    ``{"type": "error", "detail": ...}`` instead of ``done``.
+    """
+    return StreamingResponse(
+        _stream_search(search_engine, query),
+        media_type="application/x-ndjson",
+        headers={"Cache-Control": "no-store", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get("/recent", response_model=RecentResponse)
 async def get_recent_issues(
+    request: Request,
+    response: Response,
     limit: int = 20, 
     sort_by: str = "recently_discussed",
     languages: str | None = None,
@@ -89,8 +249,20 @@ async def get_recent_issues(
         unassigned_only: Only show unassigned issues
     
     Returns issues from the last 30 days (or 24h for "newest" sort).
+    
+    Supports conditional GET: the ETag changes with the ingestion
+    generation and the recent-feed refresh window.
     """
     try:
+        version = await search_engine.recent_issues_version()
+        if version is not None:
+            etag = make_etag(
+                "recent", version, limit, sort_by, languages, labels, days_ago, unassigned_only
+            )
+            not_modified = conditional_response(request, response, etag, "search.recent")
+            if not_modified is not None:
+                return not_modified
+        
         # Parse comma-separated lists
         language_list = [l.strip() for l in languages.split(",")] if languages else None
         label_list = [l.strip() for l in labels.split(",")] if labels else None
@@ -117,6 +289,89 @@ async def get_recent_issues(
         )
 
 
+@router.post("/recent/batch", response_model=RecentBatchResponse)
+async def get_recent_batch(
+    batch: RecentBatchRequest,
+    search_engine: SearchEngine = Depends(get_search_engine)
+) -> RecentBatchResponse:
+    """
+    Several recent feeds (homepage / finder tabs) in one request.
+    
+    Each entry of ``feeds`` takes the same options as ``/recent``; results
+    come back in the same order. Feeds share one embedding and one vector
+    query instead of one each. With ``include_stats`` the response also
+    carries the ``/stats`` and ``/last-updated`` fields.
+    """
+    try:
+        feeds = await search_engine.get_recent_feeds(batch.feeds)
+        stats = None
+        if batch.include_stats:
+            index_stats = await search_engine.get_index_stats()
+            if index_stats is not None:
+                stats = {
+                    "total_issues": index_stats.total_issues,
+                    "total_repos": index_stats.unique_repos,
+                    "last_updated": index_stats.last_updated,
+                    "timestamp": float(index_stats.last_updated_ts) if index_stats.last_updated else None,
+                    "languages": index_stats.language_counts
+                }
+        return RecentBatchResponse(
+            feeds=[RecentResponse(results=results, total=len(results)) for results in feeds],
+            stats=stats
+        )
+    except Exception as e:
+        logger.error(f"Recent batch error: {e}")
+        raise HTTPException(
+            status_code=503,
+            detail="Search service is temporarily unavailable. Please try again in a moment."
+        )
+
+
+@router.get("/facets")
+async def get_facets(
+    fields: str = "language,labels_norm,topics_norm",
+    sort_by: str = "recently_discussed",
+    languages: str | None = None,
+    labels: str | None = None,
+    days_ago: float | None = None,
+    unassigned_only: bool = False,
+    limit: int = 20,
+    search_engine: SearchEngine = Depends(get_search_engine)
+) -> dict:
+    """
+    Facet counts for the homepage filters.
+    
+    Args:
+        fields: Comma-separated facet fields (language, type, labels_norm,
+            topics_norm, is_assigned, is_good_first_issue, is_help_wanted)
+        sort_by, languages, labels, days_ago, unassigned_only: Same filters
+            as /recent, including its default time window
+        limit: Values returned per facet
+    
+    Only available with the local index backend (``SEARCH_BACKEND=local``).
+    """
+    field_list = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in field_list if FILTER_FIELDS.get(f) in (None, "number")]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unsupported facet fields: {', '.join(unknown)}")
+    try:
+        result = await search_engine.facets(
+            field_list,
+            limit,
+            sort_by=sort_by,
+            languages=[l.strip() for l in languages.split(",")] if languages else None,
+            labels=[l.strip() for l in labels.split(",")] if labels else None,
+            days_ago=days_ago,
+            unassigned_only=unassigned_only
+        )
+    except Exception as e:
+        logger.error(f"Facets error: {e}")
+        raise HTTPException(status_code=503, detail="Facets are temporarily unavailable.")
+    if result is None:
+        raise HTTPException(status_code=501, detail="Facets require the local index backend.")
+    return result
+
+
 @router.get("/last-updated")
 async def get_last_updated(
     search_engine: SearchEngine = Depends(get_search_engine)
@@ -125,8 +380,15 @@ async def get_last_updated(
     try:
         from datetime import datetime
         
-        # Use get_recent_issues to find the single newest issue by updated_at
-        # This reuses the correct sorting logic defined in SearchEngine
+        # Maintained by ingestion; one cached read instead of a top_k=200 query
+        index_stats = await search_engine.get_index_stats()
+        if index_stats is not None and index_stats.last_updated:
+            return {
+                "last_updated": index_stats.last_updated,
+                "timestamp": float(index_stats.last_updated_ts)
+            }
+        
+        # No stats record yet: use get_recent_issues to find the single newest issue by updated_at
         results = await search_engine.get_recent_issues(
             limit=1,
             sort_by="recently_discussed"
@@ -168,18 +430,30 @@ async def health_check(
 
 @router.get("/stats")
 async def get_stats(
+    request: Request,
+    response: Response,
     search_engine: SearchEngine = Depends(get_search_engine)
 ) -> dict:
-    """Get index statistics for display on homepage."""
+    """Get index statistics for display on homepage (ETag = stats generation)."""
     try:
-        stats = await run_in_threadpool(search_engine.pinecone.get_index_stats)
-        total_issues = stats.get("total_vector_count", 0)
+        index_stats = await search_engine.get_index_stats()
+        if index_stats is not None:
+            etag = make_etag("stats", index_stats.generation)
+            not_modified = conditional_response(request, response, etag, "search.stats")
+            if not_modified is not None:
+                return not_modified
+            return {
+                "total_issues": index_stats.total_issues,
+                "total_repos": index_stats.unique_repos,
+                "last_updated": index_stats.last_updated,
+                "languages": index_stats.language_counts
+            }
         
-        # Estimate unique repos (we'd need to query for this, but for now use cached/estimated)
-        # A more accurate count would require a separate query or metadata tracking
+        # No stats record yet (ingestion hasn't written one): vector count only
+        stats = await run_in_threadpool(search_engine.pinecone.get_index_stats)
         return {
-            "total_issues": total_issues,
-            "total_repos": None,  # Can be added later with proper tracking
+            "total_issues": stats.get("total_vector_count", 0),
+            "total_repos": None,
             "last_updated": None
         }
     except Exception as e:
@@ -189,3 +463,26 @@ async def get_stats(
             "total_repos": None,
             "error": str(e)
         }
+
+
+@router.get("/metrics")
+async def get_search_metrics(
+    search_engine: SearchEngine = Depends(get_search_engine)
+) -> dict:
+    """In-process search counters, latencies and cache stats for this worker.
+    
+    ``latency_ms`` has count/mean/p50/p95/p99/max per series, including
+    ``route:<METHOD> <path>`` (whole request), ``route:<METHOD> <path>.<stage>``
+    and ``stage.<stage>`` (all routes) for parse, embed, filter,
+    vector_query, rerank, hydrate and serialize.
+    """
+    return {
+        **search_metrics.snapshot(),
+        "parse_cache": search_engine.query_parser.cache.stats(),
+        "query_embedding_cache": search_engine.embedder.query_cache_stats(),
+        "search_snapshots": search_engine.snapshots.stats(),
+        "semantic_cache": search_engine.semantic_cache.stats() if search_engine.semantic_cache else None,
+        "recent_feed": search_engine.recent_feed_stats(),
+        "document_store": search_engine.documents.stats(),
+        "single_flight": search_engine.single_flight_stats(),
+    }
@@ -1,5 +1,5 @@
 """API routes for user data and dashboard stats."""
-from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from typing import Optional, List
@@ -8,6 +8,7 @@ from datetime import datetime
 from pydantic import BaseModel
 
 from app.database import get_db
+from app.middleware.http_cache import conditional_response, make_etag
 from app.models.issues import TrackedIssue, VerifiedContribution, IssueStatus
 
 
@@ -356,6 +357,8 @@ async def update_user_settings(
 @router.get("/profile/{username}")
 async def get_public_profile(
     username: str,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db)
 ):
     """
@@ -363,6 +366,11 @@ async def get_public_profile(
     
     This is a PUBLIC endpoint - no authentication required.
     Returns only verified contributions and public stats.
+    
+    Supports conditional GET: the ETag is built from the user row, the
+    counts/latest timestamps of verified issues and projects, and the tech
+    tags of those projects, so a 304 skips loading contributions, projects
+    and audit reports.
     """
     from sqlalchemy import text
     
@@ -384,11 +392,14 @@ async def get_public_profile(
     user_blog = user.blog
     user_twitter = user.twitterUsername
     
-    # 2. Count verified PRs
-    verified_count = db.query(func.count(TrackedIssue.id)).filter(
+    # 2. Count verified PRs (and the newest verification, for the ETag)
+    verified_count, last_verified_at = db.query(
+        func.count(TrackedIssue.id), func.max(TrackedIssue.verified_at)
+    ).filter(
         TrackedIssue.user_id == user_id,
         TrackedIssue.status == IssueStatus.VERIFIED.value
-    ).scalar() or 0
+    ).one()
+    verified_count = verified_count or 0
     
     # 3. Count unique repositories
     repo_count = db.query(func.count(func.distinct(
@@ -398,13 +409,7 @@ async def get_public_profile(
         TrackedIssue.status == IssueStatus.VERIFIED.value
     ).scalar() or 0
     
-    # 4. Get all verified contributions with details
-    verified_issues = db.query(TrackedIssue).filter(
-        TrackedIssue.user_id == user_id,
-        TrackedIssue.status == IssueStatus.VERIFIED.value
-    ).order_by(TrackedIssue.verified_at.desc()).all()
-    
-    # 5. Calculate total lines of code (from VerifiedContribution if exists)
+    # 4. Calculate total lines of code (from VerifiedContribution if exists)
     total_lines_result = db.execute(
         text("""
             SELECT COALESCE(SUM(lines_added), 0), COALESCE(SUM(lines_removed), 0)
@@ -417,13 +422,46 @@ async def get_public_profile(
     total_lines_added = total_lines_result[0] if total_lines_result else 0
     total_lines_removed = total_lines_result[1] if total_lines_result else 0
     
-    # 6. Get unique languages (from tracked issues - we might need to add this field later)
+    # 5. Version stamps of the verified projects, then answer conditional requests
+    from app.models.project import Project, ProjectAudit, TechTag, TagCategory # Lazy import to avoid circulars if any
+    
+    project_version = db.query(
+        func.count(Project.id),
+        func.max(Project.updated_at),
+        func.max(ProjectAudit.audited_at),
+        func.max(ProjectAudit.v4_audited_at),
+    ).outerjoin(ProjectAudit, ProjectAudit.project_id == Project.id).filter(
+        Project.user_id == user_id,
+        Project.is_verified == True
+    ).one()
+    # Tags have no timestamp and are replaced without touching the project row
+    tag_version = db.query(TechTag.project_id, TechTag.name, TechTag.category).join(
+        Project, TechTag.project_id == Project.id
+    ).filter(
+        Project.user_id == user_id,
+        Project.is_verified == True
+    ).order_by(TechTag.project_id, TechTag.name, TechTag.category).all()
+    user_version = [getattr(user, column.key) for column in UserModel.__table__.columns]
+    etag = make_etag(
+        "profile", user_version, verified_count, last_verified_at, repo_count,
+        total_lines_added, total_lines_removed, tuple(project_version),
+        [tuple(tag) for tag in tag_version]
+    )
+    not_modified = conditional_response(request, response, etag, "users.profile")
+    if not_modified is not None:
+        return not_modified
+    
+    # 6. Get all verified contributions with details
+    verified_issues = db.query(TrackedIssue).filter(
+        TrackedIssue.user_id == user_id,
+        TrackedIssue.status == IssueStatus.VERIFIED.value
+    ).order_by(TrackedIssue.verified_at.desc()).all()
+    
+    # 7. Get unique languages (from tracked issues - we might need to add this field later)
     # For now, return empty list - we can enhance this later
     languages = []
     
-    # 7. Get Verified Projects
-    from app.models.project import Project, ProjectAudit, TechTag, TagCategory # Lazy import to avoid circulars if any
-    
+    # 8. Get Verified Projects
     db_projects = db.query(Project).filter(
         Project.user_id == user_id,
         Project.is_verified == True
@@ -0,0 +1,51 @@
+"""Sizing of Pinecone fetches for post-filtered searches.
+
+A fixed top_k=100 either over-fetches (no post-filter, one page wanted) or
+comes back short when a selective topic filter drops most candidates. The
+engine instead asks for roughly what the requested page needs, scaled by
+how selective the same filter shape has been recently, and widens only
+when the survivors can't fill the page.
+"""
+
+import math
+
+from app.services.memory_cache import LRUCache
+
+# Selectivity assumed for a filter shape we haven't seen yet
+DEFAULT_SELECTIVITY = 0.5
+# Floor so a shape that matched nothing doesn't demand an unbounded fetch
+MIN_SELECTIVITY = 0.01
+
+
+def filter_shape(topics: list[str] | None) -> tuple:
+    """Key for the post-filters applied after retrieval (None when there are none)."""
+    if not topics:
+        return ()
+    return ("topics", tuple(sorted(t.lower() for t in topics)))
+
+
+class SelectivityTracker:
+    """EWMA of survivors / fetched per filter shape, for this worker."""
+
+    def __init__(self, alpha: float = 0.3, max_shapes: int = 512):
+        self.alpha = alpha
+        self._estimates = LRUCache(maxsize=max_shapes)
+
+    def estimate(self, shape: tuple) -> float:
+        if not shape:
+            return 1.0
+        return self._estimates.get(shape, DEFAULT_SELECTIVITY)
+
+    def observe(self, shape: tuple, fetched: int, survived: int) -> None:
+        if not shape or fetched == 0:
+            return
+        observed = survived / fetched
+        previous = self._estimates.get(shape)
+        value = observed if previous is None else self.alpha * observed + (1 - self.alpha) * previous
+        self._estimates.set(shape, value)
+
+
+def plan_top_k(need: int, selectivity: float, *, margin: float, floor: int, ceiling: int) -> int:
+    """top_k expected to yield ``need`` survivors, clamped to ``[floor, ceiling]``."""
+    wanted = math.ceil(need * margin / max(selectivity, MIN_SELECTIVITY))
+    return max(floor, min(ceiling, wanted))
@@ -0,0 +1,71 @@
+"""Process-wide Gemini and HTTP clients with pooled keep-alive connections.
+
+The query parser, the embedder and the V4 runner used to build their own
+``genai.Client`` (three connection pools, three TLS handshakes per cold
+worker). They now share one, and the search path uses its ``aio`` side so
+parsing and embedding run on the event loop instead of holding threadpool
+threads. Pinecone queries go through the shared ``httpx.AsyncClient``.
+
+Pool sizes come from ``HTTP_MAX_CONNECTIONS`` /
+``HTTP_MAX_KEEPALIVE_CONNECTIONS``; ``close_api_clients`` runs on shutdown.
+"""
+
+import logging
+from functools import lru_cache
+
+import httpx
+from google import genai
+from google.genai import types
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+_http_client: httpx.AsyncClient | None = None
+
+
+def _limits() -> httpx.Limits:
+    settings = get_settings()
+    return httpx.Limits(
+        max_connections=settings.http_max_connections,
+        max_keepalive_connections=settings.http_max_keepalive_connections,
+        keepalive_expiry=settings.http_keepalive_expiry_seconds,
+    )
+
+
+@lru_cache()
+def get_genai_client() -> genai.Client:
+    """The shared Gemini client (sync calls on ``client``, async on ``client.aio``)."""
+    settings = get_settings()
+    return genai.Client(
+        api_key=settings.gemini_api_key,
+        http_options=types.HttpOptions(
+            client_args={"limits": _limits()},
+            async_client_args={"limits": _limits()},
+        ),
+    )
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """The shared async HTTP client for REST calls made from the event loop."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        settings = get_settings()
+        _http_client = httpx.AsyncClient(
+            limits=_limits(),
+            timeout=httpx.Timeout(settings.http_timeout_seconds),
+        )
+    return _http_client
+
+
+async def close_api_clients() -> None:
+    """Close pooled connections (application shutdown)."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+    if get_genai_client.cache_info().currsize:
+        try:
+            await get_genai_client().aio.aclose()
+        except Exception as e:
+            logger.warning(f"Failed to close Gemini client: {e}")
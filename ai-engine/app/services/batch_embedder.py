@@ -0,0 +1,209 @@
+"""Concurrent, retrying batch embedding for ingestion and backfills.
+
+``EmbeddingService.generate_embeddings_batch`` used to send fixed
+100-text batches one after another without retries, so a large backfill
+ran at one request's latency at a time and a single 429 aborted it.
+
+- Batches are cut by an estimated token and byte budget as well as a
+  maximum count, so a few long bodies cannot push a request over the
+  provider's limits.
+- Batches run on a thread pool. An adaptive limiter caps how many are in
+  flight: it halves the limit on a 429 and adds one back after a run of
+  successes (AIMD), so throughput settles just under the quota.
+- Each batch retries transient failures (429, 5xx, network) with jittered
+  exponential backoff. Results are written back by input position, so
+  order is preserved however the batches finish.
+"""
+
+import logging
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+from google.genai import errors
+from tenacity import Retrying, retry_if_exception, stop_after_attempt, wait_random_exponential
+
+logger = logging.getLogger(__name__)
+
+# Rough tokenizer-free estimate; errs high for code-heavy issue bodies
+_CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // _CHARS_PER_TOKEN + 1
+
+
+def plan_batches(
+    texts: list[str],
+    *,
+    max_items: int,
+    max_tokens: int,
+    max_bytes: int,
+) -> list[list[int]]:
+    """Split ``texts`` into consecutive batches (as input positions) within every budget.
+
+    A single text over budget still gets a batch of its own; the provider
+    truncates or rejects it, as it would have before.
+    """
+    batches: list[list[int]] = []
+    current: list[int] = []
+    tokens = size = 0
+    for i, text in enumerate(texts):
+        text_tokens, text_bytes = estimate_tokens(text), len(text.encode())
+        if current and (
+            len(current) >= max_items
+            or tokens + text_tokens > max_tokens
+            or size + text_bytes > max_bytes
+        ):
+            batches.append(current)
+            current, tokens, size = [], 0, 0
+        current.append(i)
+        tokens += text_tokens
+        size += text_bytes
+    if current:
+        batches.append(current)
+    return batches
+
+
+def is_rate_limited(error: BaseException) -> bool:
+    return isinstance(error, errors.APIError) and error.code == 429
+
+
+def is_retryable(error: BaseException) -> bool:
+    """429s, server errors and network failures; other client errors are final."""
+    if isinstance(error, errors.APIError):
+        return error.code == 429 or error.code >= 500
+    return isinstance(error, (httpx.TransportError, TimeoutError, ConnectionError))
+
+
+class AdaptiveLimiter:
+    """Concurrency limit that halves on rate limiting and creeps back up on success."""
+
+    def __init__(
+        self,
+        initial: int,
+        minimum: int = 1,
+        maximum: int | None = None,
+        increase_after: int = 4,
+        decrease_cooldown_seconds: float = 1.0,
+    ):
+        self.minimum = minimum
+        self.maximum = maximum or initial
+        self.limit = max(minimum, min(initial, self.maximum))
+        self.increase_after = increase_after
+        # 429s from batches that were already in flight count as one signal
+        self.decrease_cooldown = decrease_cooldown_seconds
+        self._decreased_at = float("-inf")
+        self._in_flight = 0
+        self._successes = 0
+        self._condition = threading.Condition()
+
+    def __enter__(self) -> "AdaptiveLimiter":
+        with self._condition:
+            while self._in_flight >= self.limit:
+                self._condition.wait()
+            self._in_flight += 1
+        return self
+
+    def __exit__(self, *exc) -> None:
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    def on_success(self) -> None:
+        with self._condition:
+            self._successes += 1
+            if self._successes >= self.increase_after and self.limit < self.maximum:
+                self.limit += 1
+                self._successes = 0
+                self._condition.notify_all()
+
+    def on_rate_limit(self) -> None:
+        with self._condition:
+            self._successes = 0
+            now = time.monotonic()
+            if self.limit > self.minimum and now - self._decreased_at >= self.decrease_cooldown:
+                self._decreased_at = now
+                self.limit = max(self.minimum, self.limit // 2)
+                logger.warning(f"Embedding rate limited, concurrency reduced to {self.limit}")
+
+
+class BatchEmbedder:
+    """Embeds many texts through ``embed_batch`` (one provider request per call)."""
+
+    def __init__(
+        self,
+        embed_batch: Callable[[list[str]], list[list[float]]],
+        *,
+        max_items: int = 100,
+        max_tokens: int = 20_000,
+        max_bytes: int = 200_000,
+        concurrency: int = 4,
+        max_concurrency: int = 16,
+        max_attempts: int = 6,
+        max_backoff_seconds: float = 60.0,
+    ):
+        self.embed_batch = embed_batch
+        self.max_items = max_items
+        self.max_tokens = max_tokens
+        self.max_bytes = max_bytes
+        self.max_attempts = max_attempts
+        self.max_backoff_seconds = max_backoff_seconds
+        self.limiter = AdaptiveLimiter(concurrency, maximum=max_concurrency)
+
+    def embed(self, texts: list[str], max_items: int | None = None) -> list[list[float]]:
+        """Embeddings for ``texts``, in input order. Raises if any batch exhausts its retries.
+
+        ``max_items`` lowers the per-batch item limit for this call.
+        """
+        batches = plan_batches(
+            texts,
+            max_items=min(self.max_items, max_items or self.max_items),
+            max_tokens=self.max_tokens,
+            max_bytes=self.max_bytes,
+        )
+        results: list[list[float] | None] = [None] * len(texts)
+
+        def run(batch: list[int]) -> None:
+            embeddings = self._embed_with_retry([texts[i] for i in batch])
+            if len(embeddings) != len(batch):
+                raise ValueError(f"Expected {len(batch)} embeddings, got {len(embeddings)}")
+            for i, embedding in zip(batch, embeddings):
+                results[i] = embedding
+
+        workers = min(len(batches), self.limiter.maximum) or 1
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            try:
+                for done, _ in enumerate(pool.map(run, batches), start=1):
+                    if done % 10 == 0 or done == len(batches):
+                        logger.info(f"Embedded batch {done}/{len(batches)} (concurrency {self.limiter.limit})")
+            except BaseException:
+                # Don't start the queued batches once one has failed for good
+                pool.shutdown(cancel_futures=True)
+                raise
+        return results
+
+    def _embed_with_retry(self, batch: list[str]) -> list[list[float]]:
+        retrying = Retrying(
+            stop=stop_after_attempt(self.max_attempts),
+            wait=wait_random_exponential(multiplier=1, max=self.max_backoff_seconds),
+            retry=retry_if_exception(is_retryable),
+            before_sleep=self._before_retry,
+            reraise=True,
+        )
+        for attempt in retrying:
+            with attempt:
+                with self.limiter:
+                    embeddings = self.embed_batch(batch)
+                self.limiter.on_success()
+        return embeddings
+
+    def _before_retry(self, retry_state) -> None:
+        error = retry_state.outcome.exception()
+        if is_rate_limited(error):
+            self.limiter.on_rate_limit()
+        logger.warning(
+            f"Embedding batch failed (attempt {retry_state.attempt_number}/{self.max_attempts}), retrying: {error}"
+        )
@@ -0,0 +1,68 @@
+"""Lightweight ranked candidates, materialized into ``SearchResult`` on demand.
+
+A search ranks 100 Pinecone matches but a response only returns one page.
+Validating every match into a pydantic ``SearchResult`` up front (and
+dumping them all into the pagination snapshot) was the bulk of the
+per-request CPU. Candidates hold just the ranking outcome plus a reference
+to the match metadata; only the rows actually returned become models.
+"""
+
+from dataclasses import dataclass
+
+from app.models.query import SearchResult
+
+# SearchResult fields stored as numbers in Pinecone, which hands them back as floats
+_INT_FIELDS = ("issue_id", "issue_number", "repo_stars", "repo_forks", "comments_count")
+
+
+@dataclass(slots=True)
+class Candidate:
+    """One ranked match: Pinecone ID, combined score and the match metadata.
+
+    In slim mode ``metadata`` starts as the ranking fields only
+    (``full=False``) and is swapped for the full document by
+    ``SearchEngine.hydrate`` before the row is returned.
+    """
+
+    id: str
+    score: float
+    metadata: dict
+    full: bool = True
+
+    @classmethod
+    def from_match(cls, match: dict, score: float, full: bool = True) -> "Candidate":
+        return cls(id=match["id"], score=score, metadata=match["metadata"], full=full)
+
+    def to_result(self) -> SearchResult:
+        """Build the response model without re-validating.
+
+        The metadata was validated as ``IssueMetadata`` when ingestion wrote
+        it, so only Pinecone's float-for-int round trip needs undoing.
+        """
+        metadata = self.metadata
+        fields = {key: int(metadata[key]) for key in _INT_FIELDS}
+        return SearchResult.model_construct(
+            **fields,
+            title=metadata["title"],
+            body=metadata.get("body"),
+            repo_name=metadata["repo_name"],
+            repo_full_name=metadata["repo_full_name"],
+            language=metadata.get("language"),
+            labels=metadata.get("labels", []),
+            created_at=metadata["created_at"],
+            updated_at=metadata["updated_at"],
+            issue_url=metadata["issue_url"],
+            repo_url=metadata["repo_url"],
+            score=self.score,
+            is_assigned=metadata.get("is_assigned", False),
+            assignees_count=int(metadata.get("assignees_count", 0)),
+            has_claimer=metadata.get("has_claimer", False),
+            repo_description=metadata.get("repo_description"),
+            repo_topics=metadata.get("repo_topics", []),
+            repo_license=metadata.get("repo_license"),
+        )
+
+
+def materialize(candidates: list[Candidate]) -> list[SearchResult]:
+    """``SearchResult`` models for a slice of candidates."""
+    return [c.to_result() for c in candidates]
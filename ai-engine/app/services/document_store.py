@@ -0,0 +1,101 @@
+"""Per-worker store of issue metadata for two-phase (slim) retrieval.
+
+In slim mode the Pinecone query returns only IDs and scores. Ranking then
+needs a handful of small fields per match, and only the returned page
+needs the full document (2000-char body, description, topics). This
+store keeps both in memory and fetches only what it's missing:
+
+- ranking fields for many issues (~200 bytes each)
+- full metadata for recently shown issues
+
+Misses go to ``afetch_by_ids`` on Pinecone (read units only, over the
+shared async HTTP pool) or on the local replica.
+
+Pinecone's fetch has no metadata-only mode, so each Pinecone miss also
+carries the vector: 768 float32 values, about 3 KB raw and roughly 8 KB
+as JSON, against ~3 KB of metadata. A cold slim search can therefore
+move more bytes than one query with metadata. The win comes from the
+ranking tier staying warm. ``document_store.fetched`` counts misses and
+``pinecone.fetch_bytes`` the bytes they pulled, so compare them with the
+ranking-tier hit rate in ``/metrics`` before turning
+``SEARCH_SLIM_METADATA`` on.
+"""
+
+import logging
+
+from app.services.memory_cache import LRUCache
+from app.services.search_metrics import search_metrics
+
+logger = logging.getLogger(__name__)
+
+# Metadata the reranker and post-filters read (see reranker.rank)
+RANKING_FIELDS = (
+    "updated_at_ts", "created_at_ts", "updated_at", "created_at",
+    "repo_stars", "repo_topics", "labels",
+)
+
+
+def ranking_projection(metadata: dict) -> dict:
+    """The subset of ``metadata`` needed to rank a match."""
+    return {key: metadata[key] for key in RANKING_FIELDS if key in metadata}
+
+
+class DocumentStore:
+    """Two LRU tiers (ranking fields, full documents) in front of a fetch source."""
+
+    def __init__(
+        self,
+        source,  # PineconeClient or LocalIndex (anything with afetch_by_ids)
+        ranking_size: int = 200_000,
+        document_size: int = 5_000,
+        ttl_seconds: int = 3600,
+    ):
+        self.source = source
+        self._ranking = LRUCache(maxsize=ranking_size, ttl_seconds=ttl_seconds)
+        self._documents = LRUCache(maxsize=document_size, ttl_seconds=ttl_seconds)
+
+    async def _fetch(self, ids: list[str]) -> dict[str, dict]:
+        """Full metadata from Pinecone; fills both tiers."""
+        fetched = await self.source.afetch_by_ids(ids)
+        for vector_id, metadata in fetched.items():
+            self._documents.set(vector_id, metadata)
+            self._ranking.set(vector_id, ranking_projection(metadata))
+        search_metrics.incr("document_store.fetched", len(fetched))
+        return fetched
+
+    async def ranking_metadata(self, ids: list[str]) -> dict[str, dict]:
+        """Ranking fields for each ID that exists."""
+        found, missing = {}, []
+        for vector_id in ids:
+            metadata = self._ranking.get(vector_id)
+            if metadata is None:
+                missing.append(vector_id)
+            else:
+                found[vector_id] = metadata
+        if missing:
+            found.update(
+                (vector_id, ranking_projection(metadata))
+                for vector_id, metadata in (await self._fetch(missing)).items()
+            )
+        return found
+
+    async def documents(self, ids: list[str]) -> dict[str, dict]:
+        """Full metadata for each ID that exists."""
+        found, missing = {}, []
+        for vector_id in ids:
+            metadata = self._documents.get(vector_id)
+            if metadata is None:
+                missing.append(vector_id)
+            else:
+                found[vector_id] = metadata
+        if missing:
+            found.update(await self._fetch(missing))
+        return found
+
+    def invalidate(self) -> None:
+        """Drop everything (after ingestion rewrote metadata)."""
+        self._ranking.clear()
+        self._documents.clear()
+
+    def stats(self) -> dict:
+        return {"ranking": self._ranking.stats(), "documents": self._documents.stats()}
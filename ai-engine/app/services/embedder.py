@@ -1,12 +1,16 @@
 """Embedding service using Google GenAI text-embedding-004."""
 
 import logging
-from google import genai
 from google.genai import types
 from tenacity import retry, stop_after_attempt, wait_exponential, before_sleep_log
 
 from app.config import get_settings
 from app.models.issue import IssueMetadata
+from app.services.api_clients import get_genai_client
+from app.services.batch_embedder import BatchEmbedder
+from app.services.memory_cache import LRUCache
+from app.services.search_metrics import search_metrics
+from app.services.single_flight import SingleFlight
 
 logger = logging.getLogger(__name__)
 
@@ -16,9 +20,28 @@ class EmbeddingService:
     
     def __init__(self):
         settings = get_settings()
-        self.client = genai.Client(api_key=settings.gemini_api_key)
+        self.client = get_genai_client()
         self.model = settings.embedding_model
         self.dimension = settings.embedding_dimension
+        # Query embeddings are deterministic for (model, dimension, task, text),
+        # so repeat queries never need another Gemini call.
+        self._query_cache = LRUCache(maxsize=settings.query_embedding_cache_size)
+        # Constant queries (e.g. the homepage feed) live outside the LRU so
+        # bursts of unique searches can't evict them.
+        self._pinned_query_embeddings: dict[tuple, list[float]] = {}
+        # Concurrent misses for the same text (e.g. different raw queries parsed
+        # to one semantic query) share a single Gemini call
+        self.embed_flight = SingleFlight("embed")
+        # Document embedding for ingestion: budgeted batches, concurrent, retried
+        self.batch_embedder = BatchEmbedder(
+            self._embed_documents,
+            max_items=settings.embed_batch_max_items,
+            max_tokens=settings.embed_batch_max_tokens,
+            max_bytes=settings.embed_batch_max_bytes,
+            concurrency=settings.embed_concurrency,
+            max_concurrency=settings.embed_max_concurrency,
+            max_attempts=settings.embed_max_attempts
+        )
         
     @retry(
         stop=stop_after_attempt(3),
@@ -37,45 +60,106 @@ class EmbeddingService:
         )
         return result.embeddings[0].values
     
+    def _query_cache_key(self, query: str) -> tuple:
+        return (self.model, self.dimension, "RETRIEVAL_QUERY", query)
+    
+    def generate_query_embedding(self, query: str) -> list[float]:
+        """Generate embedding for a search query, served from cache when possible."""
+        key = self._query_cache_key(query)
+        cached = self._pinned_query_embeddings.get(key) or self._query_cache.get(key)
+        if cached is not None:
+            search_metrics.incr("embed_cache.hit")
+            return list(cached)
+        
+        search_metrics.incr("embed_cache.miss")
+        values = self._embed_query(query)
+        self._query_cache.set(key, values)
+        return list(values)
+    
+    async def agenerate_query_embedding(self, query: str) -> list[float]:
+        """``generate_query_embedding`` on the event loop (async Gemini client)."""
+        key = self._query_cache_key(query)
+        cached = self._pinned_query_embeddings.get(key) or self._query_cache.get(key)
+        if cached is not None:
+            search_metrics.incr("embed_cache.hit")
+            return list(cached)
+        
+        search_metrics.incr("embed_cache.miss")
+        values = await self.embed_flight.do(key, lambda: self._aembed_query(query))
+        self._query_cache.set(key, values)
+        return list(values)
+    
+    def precompute_query_embeddings(self, queries: list[str]) -> None:
+        """Embed constant queries once and pin them for the life of the process."""
+        for query in queries:
+            key = self._query_cache_key(query)
+            if key not in self._pinned_query_embeddings:
+                self._pinned_query_embeddings[key] = self._embed_query(query)
+        logger.info(f"Precomputed {len(queries)} constant query embeddings")
+    
+    def query_cache_stats(self) -> dict:
+        """Size and hit rate of the query-embedding cache."""
+        return {**self._query_cache.stats(), "pinned": len(self._pinned_query_embeddings)}
+    
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=30),
         before_sleep=before_sleep_log(logger, logging.WARNING)
     )
-    def generate_query_embedding(self, query: str) -> list[float]:
-        """Generate embedding for a search query."""
+    def _embed_query(self, query: str) -> list[float]:
+        """Call Gemini for a RETRIEVAL_QUERY embedding."""
         result = self.client.models.embed_content(
             model=self.model,
             contents=query,
-            config=types.EmbedContentConfig(
-                task_type="RETRIEVAL_QUERY",
-                output_dimensionality=self.dimension
-            )
+            config=self._query_config()
         )
         return result.embeddings[0].values
     
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=30),
+        before_sleep=before_sleep_log(logger, logging.WARNING)
+    )
+    async def _aembed_query(self, query: str) -> list[float]:
+        result = await self.client.aio.models.embed_content(
+            model=self.model,
+            contents=query,
+            config=self._query_config()
+        )
+        return result.embeddings[0].values
+    
+    def _query_config(self) -> types.EmbedContentConfig:
+        return types.EmbedContentConfig(
+            task_type="RETRIEVAL_QUERY",
+            output_dimensionality=self.dimension
+        )
+    
     def generate_embeddings_batch(
-        self, 
-        texts: list[str], 
-        batch_size: int = 100
+        self,
+        texts: list[str],
+        batch_size: int | None = None
     ) -> list[list[float]]:
-        """Generate embeddings for multiple texts in batches."""
-        all_embeddings = []
+        """Generate embeddings for multiple texts, in order.
         
-        for i in range(0, len(texts), batch_size):
-            batch = texts[i:i + batch_size]
-            result = self.client.models.embed_content(
-                model=self.model,
-                contents=batch,
-                config=types.EmbedContentConfig(
-                    task_type="RETRIEVAL_DOCUMENT",
-                    output_dimensionality=self.dimension
-                )
+        Batches are sized by the EMBED_BATCH_* budgets and sent concurrently
+        with per-batch retries (see ``BatchEmbedder``). ``batch_size`` is
+        kept for existing callers and now only caps the texts per request.
+        """
+        if not texts:
+            return []
+        return self.batch_embedder.embed(texts, max_items=batch_size)
+    
+    def _embed_documents(self, batch: list[str]) -> list[list[float]]:
+        """One Gemini request for a batch of RETRIEVAL_DOCUMENT embeddings."""
+        result = self.client.models.embed_content(
+            model=self.model,
+            contents=batch,
+            config=types.EmbedContentConfig(
+                task_type="RETRIEVAL_DOCUMENT",
+                output_dimensionality=self.dimension
             )
-            all_embeddings.extend([e.values for e in result.embeddings])
-            logger.info(f"Generated embeddings for batch {i//batch_size + 1}")
-            
-        return all_embeddings
+        )
+        return [e.values for e in result.embeddings]
     
     def create_issue_text(self, metadata: IssueMetadata) -> str:
         """Create text representation of an issue for embedding."""
@@ -0,0 +1,131 @@
+"""Embedding Store — content-addressed cache of issue (document) embeddings.
+
+Ingestion re-embeds an issue whenever GitHub bumps its ``updated_at``,
+which also happens for comments, reactions and label edits that leave
+``EmbeddingService.create_issue_text`` unchanged. The store keys vectors by
+sha256(model, dimension, task, text) in Postgres (``issue_embedding_cache``)
+so unchanged text costs no Gemini call, on any machine or run.
+
+Skipped entirely when ``DATABASE_URL`` is unset; database trouble is
+treated as a miss, so ingestion never depends on it.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+from datetime import datetime, timezone
+
+import numpy as np
+
+from app import database
+from app.models.issue_embedding_cache import IssueEmbeddingCache
+from app.services.embedder import EmbeddingService
+
+log = logging.getLogger(__name__)
+
+# Keeps IN (...) lists and bulk writes to a reasonable statement size
+_CHUNK_SIZE = 500
+
+
+class IssueEmbeddingStore:
+    """Embeds issue texts, reusing any vector already computed for the same text."""
+
+    def __init__(self, embedder: EmbeddingService, use_shared_tier: bool = True):
+        self.embedder = embedder
+        self.use_shared_tier = use_shared_tier
+        self.hits = 0
+        self.misses = 0
+
+    def content_hash(self, text: str) -> str:
+        """Key for ``text`` under the current embedding model and dimension."""
+        return hashlib.sha256(
+            f"{self.embedder.model}\0{self.embedder.dimension}\0RETRIEVAL_DOCUMENT\0{text}".encode()
+        ).hexdigest()
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        """Embeddings for ``texts`` in order; only unseen texts go to Gemini."""
+        hashes = [self.content_hash(text) for text in texts]
+        found = self._get_shared(list(set(hashes)))
+
+        missing: dict[str, str] = {}
+        for key, text in zip(hashes, texts):
+            if key not in found:
+                missing.setdefault(key, text)
+        self.hits += sum(1 for key in hashes if key in found)
+        self.misses += len(missing)
+
+        if missing:
+            embeddings = self.embedder.generate_embeddings_batch(list(missing.values()))
+            computed = dict(zip(missing.keys(), embeddings))
+            self._put_shared(computed)
+            found.update(computed)
+
+        return [list(found[key]) for key in hashes]
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "shared_enabled": self.shared_enabled}
+
+    # ─── Shared tier ──────────────────────────────────────────────────────────
+
+    @property
+    def shared_enabled(self) -> bool:
+        return self.use_shared_tier and database.SessionLocal is not None
+
+    def _get_shared(self, hashes: list[str]) -> dict[str, list[float]]:
+        if not self.shared_enabled or not hashes:
+            return {}
+        found: dict[str, list[float]] = {}
+        db = database.SessionLocal()
+        try:
+            for start in range(0, len(hashes), _CHUNK_SIZE):
+                chunk = hashes[start:start + _CHUNK_SIZE]
+                rows = db.query(IssueEmbeddingCache).filter(
+                    IssueEmbeddingCache.content_hash.in_(chunk)
+                ).all()
+                for row in rows:
+                    vector = np.frombuffer(row.embedding, dtype="<f4")
+                    if len(vector) == self.embedder.dimension:
+                        found[row.content_hash] = vector.tolist()
+            if found:
+                # Keep reused rows from being pruned as stale
+                db.query(IssueEmbeddingCache).filter(
+                    IssueEmbeddingCache.content_hash.in_(list(found))
+                ).update({"last_used_at": datetime.now(timezone.utc)}, synchronize_session=False)
+                db.commit()
+            return found
+        except Exception as e:  # noqa: BLE001
+            # Caching is never critical — treat DB trouble as a miss
+            log.warning("[embedding-store] shared read failed: %s", e)
+            db.rollback()
+            return found
+        finally:
+            db.close()
+
+    def _put_shared(self, embeddings: dict[str, list[float]]) -> None:
+        if not self.shared_enabled or not embeddings:
+            return
+        db = database.SessionLocal()
+        try:
+            items = list(embeddings.items())
+            for start in range(0, len(items), _CHUNK_SIZE):
+                chunk = items[start:start + _CHUNK_SIZE]
+                try:
+                    db.add_all(
+                        IssueEmbeddingCache(
+                            content_hash=key,
+                            model=self.embedder.model,
+                            dimension=self.embedder.dimension,
+                            embedding=np.asarray(values, dtype="<f4").tobytes(),
+                        )
+                        for key, values in chunk
+                    )
+                    db.commit()
+                except Exception as e:  # noqa: BLE001
+                    # e.g. another run stored one of these texts concurrently;
+                    # the other chunks are still worth keeping
+                    log.warning(
+                        "[embedding-store] shared write of %d rows failed: %s", len(chunk), e
+                    )
+                    db.rollback()
+        finally:
+            db.close()
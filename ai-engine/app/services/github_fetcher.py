@@ -265,6 +265,8 @@ class GitHubFetcher:
             # Convenience flags
             is_good_first_issue="good first issue" in labels_lower,
             is_help_wanted="help wanted" in labels_lower,
+            labels_norm=labels_lower,
+            topics_norm=[t.lower() for t in repo_info["topics"]],
         )
     
     def get_rate_limit_status(self) -> dict:
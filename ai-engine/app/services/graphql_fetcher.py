@@ -509,6 +509,8 @@ class GraphQLFetcher:
             repo_open_issues_count=repo["openIssues"]["totalCount"],
             is_good_first_issue="good first issue" in labels_lower,
             is_help_wanted="help wanted" in labels_lower,
+            labels_norm=labels_lower,
+            topics_norm=[t.lower() for t in topics],
             has_claimer=has_claimer,
         )
     
@@ -0,0 +1,135 @@
+"""Index Stats Service — maintains the stats record in Pinecone.
+
+Written by the ingestion and cleanup scripts, read by ``/api/search/stats``
+and ``/api/search/last-updated``. Ingestion updates the record
+incrementally: new issues add to the totals and to their language.
+Cleanup recounts totals and unique repos exactly from the full ID list and
+subtracts deleted issues from their languages. ``rebuild`` recomputes
+everything from full metadata for the first run or after drift.
+"""
+from __future__ import annotations
+
+import logging
+import time
+from collections import Counter
+from typing import Iterable
+
+from app.models.index_stats import IndexStats, STATS_RECORD_ID
+from app.models.issue import IssueMetadata
+from app.services.pinecone_client import PineconeClient
+
+log = logging.getLogger(__name__)
+
+
+def _repo_of(issue_id: str) -> str:
+    """``owner/repo#123`` -> ``owner/repo``."""
+    return issue_id.rsplit("#", 1)[0]
+
+
+def _newer(stats: IndexStats, updated_at: str | None, updated_at_ts: int) -> None:
+    if updated_at and updated_at_ts > stats.last_updated_ts:
+        stats.last_updated = updated_at
+        stats.last_updated_ts = updated_at_ts
+
+
+class IndexStatsService:
+    """Read-modify-write access to the stats record."""
+
+    def __init__(self, pinecone: PineconeClient):
+        self.pinecone = pinecone
+
+    def load(self) -> IndexStats:
+        """Current stats, or an empty record if none has been written yet."""
+        try:
+            metadata = self.pinecone.get_stats_record()
+        except Exception as e:  # noqa: BLE001
+            log.warning("[index-stats] read failed, starting from empty: %s", e)
+            metadata = None
+        return IndexStats.from_metadata(metadata) if metadata else IndexStats()
+
+    def save(self, stats: IndexStats) -> IndexStats:
+        """Bump the generation and write the record."""
+        stats.generation += 1
+        stats.computed_at = int(time.time())
+        self.pinecone.upsert_stats_record(stats.to_metadata())
+        log.info(
+            "[index-stats] gen=%s total=%s repos=%s last_updated=%s",
+            stats.generation, stats.total_issues, stats.unique_repos, stats.last_updated,
+        )
+        return stats
+
+    def record_ingestion(
+        self,
+        new_issues: list[IssueMetadata],
+        touched_issues: list[IssueMetadata],
+    ) -> IndexStats:
+        """Account for an ingestion run.
+
+        ``new_issues`` were not in the index before; ``touched_issues`` is
+        everything written (new + changed) and only moves ``last_updated``.
+        """
+        stats = self.load()
+        stats.total_issues += len(new_issues)
+        languages = Counter(issue.language or "Unknown" for issue in new_issues)
+        for lang, count in languages.items():
+            stats.language_counts[lang] = stats.language_counts.get(lang, 0) + count
+        for issue in touched_issues:
+            _newer(stats, issue.updated_at, issue.updated_at_ts)
+        return self.save(stats)
+
+    def record_cleanup(
+        self,
+        remaining_ids: Iterable[str],
+        deleted_metadata: dict[str, dict],
+        *,
+        complete: bool,
+    ) -> IndexStats:
+        """Account for a cleanup run.
+
+        ``complete`` means ``remaining_ids`` is the whole index, so totals
+        and unique repos can be recounted exactly. Otherwise (``--limit``
+        runs) totals are only decremented.
+        """
+        stats = self.load()
+        remaining = [i for i in remaining_ids if i != STATS_RECORD_ID]
+        if complete:
+            stats.total_issues = len(remaining)
+            stats.unique_repos = len({_repo_of(i) for i in remaining})
+        else:
+            stats.total_issues = max(0, stats.total_issues - len(deleted_metadata))
+
+        languages = Counter(
+            (meta or {}).get("language") or "Unknown" for meta in deleted_metadata.values()
+        )
+        for lang, count in languages.items():
+            left = stats.language_counts.get(lang, 0) - count
+            if left > 0:
+                stats.language_counts[lang] = left
+            else:
+                stats.language_counts.pop(lang, None)
+        return self.save(stats)
+
+    def rebuild(self, batches: Iterable[dict[str, dict]]) -> IndexStats:
+        """Recompute every field from full metadata of the whole index.
+
+        ``batches`` yields ``fetch_by_ids``-style dicts; each is folded into
+        the counts before the next is fetched, so the index's metadata is
+        never held in memory at once.
+        """
+        stats = self.load()
+        stats.total_issues = 0
+        stats.last_updated, stats.last_updated_ts = None, 0
+        repos: set[str] = set()
+        languages: Counter[str] = Counter()
+        for batch in batches:
+            for issue_id, meta in batch.items():
+                if issue_id == STATS_RECORD_ID:
+                    continue
+                meta = meta or {}
+                stats.total_issues += 1
+                repos.add(_repo_of(issue_id))
+                languages[meta.get("language") or "Unknown"] += 1
+                _newer(stats, meta.get("updated_at"), int(meta.get("updated_at_ts") or 0))
+        stats.unique_repos = len(repos)
+        stats.language_counts = dict(languages)
+        return self.save(stats)
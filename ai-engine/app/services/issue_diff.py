@@ -0,0 +1,70 @@
+"""Classify how a fetched issue differs from its indexed record.
+
+GitHub bumps ``updated_at`` for comments, assignments and reactions, none
+of which change the text we embed. Ingestion uses this to send only text
+changes through embedding and upsert; everything else becomes a
+metadata-only patch (``PineconeClient.update_metadata_batch``) that sends
+no vector values.
+"""
+
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Literal
+
+from pydantic import ValidationError
+
+from app.models.issue import IssueMetadata
+
+# Pinecone stores vector values as float32
+_FLOAT32_BYTES = 4
+
+
+@dataclass(slots=True)
+class IssueChange:
+    """``new``/``full`` need embedding + upsert; ``metadata`` carries the fields to set."""
+
+    kind: Literal["new", "full", "metadata", "unchanged"]
+    fields: dict = field(default_factory=dict)
+
+
+def classify_change(
+    fetched: IssueMetadata,
+    stored: dict | None,
+    issue_text: Callable[[IssueMetadata], str],
+) -> IssueChange:
+    """Compare a fetched issue with the metadata ``fetch_by_ids`` returned for it.
+
+    ``issue_text`` is ``EmbeddingService.create_issue_text``. Star count is
+    part of that text but drifts constantly and barely moves the vector, so
+    a star-only difference is patched as metadata rather than re-embedded.
+    """
+    if stored is None:
+        return IssueChange("new")
+    try:
+        previous = IssueMetadata.model_validate(stored)
+    except ValidationError:
+        return IssueChange("full")  # legacy record missing required fields
+    if issue_text(fetched) != issue_text(previous.model_copy(update={"repo_stars": fetched.repo_stars})):
+        return IssueChange("full")
+
+    current = fetched.model_dump(exclude_none=True)
+    # A metadata update can set fields but never remove them
+    if any(key in stored and key not in current for key in IssueMetadata.model_fields):
+        return IssueChange("full")
+
+    fields = {
+        key: value for key, value in current.items()
+        if key != "ingested_at" and stored.get(key) != value
+    }
+    if not fields:
+        return IssueChange("unchanged")
+    return IssueChange("metadata", fields)
+
+
+def upsert_bytes_avoided(dimension: int, count: int) -> int:
+    """Vector values not sent by ``count`` metadata-only updates, as float32 bytes.
+
+    A lower bound on the request bytes saved (the wire encoding is larger).
+    Write units aren't derived from it: updates are billed too, by record size.
+    """
+    return dimension * _FLOAT32_BYTES * count
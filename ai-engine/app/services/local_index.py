@@ -0,0 +1,516 @@
+"""In-process replica of the Pinecone issue index.
+
+Serves ``PineconeClient.search``-compatible queries from local files so hot
+searches never leave the process and search can be benchmarked offline.
+Enabled with ``SEARCH_BACKEND=local``; the ingestion and cleanup scripts
+keep it in sync when ``LOCAL_INDEX_SYNC`` is set, and
+``scripts/build_local_index.py`` seeds it from Pinecone.
+
+Layout of ``LOCAL_INDEX_PATH``:
+
+- ``manifest.json``: dimension, row count, version, vocabularies. Written
+  last, atomically, so readers always see a consistent state.
+- ``vectors-<epoch>.f16``: unit-normalized float16 rows, memory-mapped.
+- ``documents-<epoch>.jsonl``: one metadata JSON per row.
+- ``state-<version>.npz``: IDs, tombstones, document offsets, the filter
+  columns (``MetadataColumns``) and the IVF lists.
+
+Vector and document files are append-only between compactions, so a reader
+on an older manifest is unaffected by a concurrent writer. Updates
+tombstone the old row and append a new one; compaction rewrites under a
+new epoch once a quarter of the rows are dead. The previous epoch's files
+are removed on the publish after that, like the previous state file.
+
+Writers in different processes (ingestion and cleanup) serialize on an
+exclusive ``flock`` of ``write.lock``.
+"""
+
+import contextlib
+import fcntl
+import json
+import logging
+import mmap
+import os
+import threading
+import time
+from dataclasses import dataclass
+
+import numpy as np
+from fastapi.concurrency import run_in_threadpool
+
+from app.services.metadata_columns import MetadataColumns, popcount
+
+logger = logging.getLogger(__name__)
+
+_SCORE_CHUNK = 65536  # rows scored per matmul, bounds the float32 working set
+_COMPACT_RATIO = 0.25
+
+
+def _normalize(vector) -> np.ndarray:
+    v = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(v)
+    return v / norm if norm else v
+
+
+@dataclass
+class _State:
+    """One consistent, read-only view of the index files."""
+
+    version: int
+    epoch: int
+    dimension: int
+    ids: list[str]
+    row_of: dict[str, int]
+    vectors: np.ndarray  # (rows, dimension) float16, memory-mapped
+    deleted: np.ndarray  # bool per row
+    live: np.ndarray  # packed bitmap of rows not deleted
+    doc_offsets: np.ndarray  # rows + 1 byte offsets into the documents file
+    documents: mmap.mmap | bytes
+    columns: MetadataColumns
+    ivf_centroids: np.ndarray | None = None
+    ivf_assignments: np.ndarray | None = None
+    ivf_order: np.ndarray | None = None  # rows grouped by list
+    ivf_offsets: np.ndarray | None = None  # nlist + 1 offsets into ivf_order
+
+    @property
+    def rows(self) -> int:
+        return len(self.ids)
+
+
+class LocalIndex:
+    """Exact or IVF vector search with Pinecone filter semantics over local files."""
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        mode: str = "exact",
+        nprobe: int = 16,
+        reload_interval_seconds: float = 30.0,
+    ):
+        self.path = path
+        self.mode = mode
+        self.nprobe = nprobe
+        self.reload_interval = reload_interval_seconds
+        self._state = self._load()
+        self._checked_at = time.monotonic()
+        self._lock = threading.Lock()
+        self._pending_upserts: dict[str, tuple[np.ndarray, dict]] = {}
+        self._pending_deletes: set[str] = set()
+
+    # ─── Files ─────────────────────────────────────────────────────────────
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, name)
+
+    @contextlib.contextmanager
+    def _write_lock(self):
+        """Exclusive across processes; held from reading the latest state to publishing."""
+        with open(self._file("write.lock"), "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    @classmethod
+    def create(cls, path: str, dimension: int, **kwargs) -> "LocalIndex":
+        """Initialise an empty index directory (no-op if one exists)."""
+        os.makedirs(path, exist_ok=True)
+        if not os.path.exists(os.path.join(path, "manifest.json")):
+            columns = MetadataColumns.empty()
+            np.savez(
+                os.path.join(path, "state-0.npz"),
+                ids=np.frombuffer(b"", dtype=np.uint8),
+                deleted=np.zeros(0, dtype=bool),
+                doc_offsets=np.zeros(1, dtype=np.int64),
+                **{f"col:{k}": v for k, v in columns.arrays.items()},
+            )
+            open(os.path.join(path, "vectors-0.f16"), "wb").close()
+            open(os.path.join(path, "documents-0.jsonl"), "wb").close()
+            _write_json_atomic(os.path.join(path, "manifest.json"), {
+                "dimension": dimension, "version": 0, "epoch": 0, "rows": 0, "vocab": {},
+            })
+        return cls(path, **kwargs)
+
+    def _load(self) -> _State:
+        with open(self._file("manifest.json")) as f:
+            manifest = json.load(f)
+        rows, dim, epoch = manifest["rows"], manifest["dimension"], manifest["epoch"]
+        with np.load(self._file(f"state-{manifest['version']}.npz")) as npz:
+            arrays = {k: npz[k] for k in npz.files}
+        raw_ids = arrays["ids"].tobytes().decode()
+        ids = raw_ids.split("\n") if raw_ids else []
+
+        vectors_path = self._file(f"vectors-{epoch}.f16")
+        vectors = (
+            np.memmap(vectors_path, dtype=np.float16, mode="r", shape=(rows, dim))
+            if rows else np.zeros((0, dim), dtype=np.float16)
+        )
+        documents: mmap.mmap | bytes = b""
+        if rows:
+            with open(self._file(f"documents-{epoch}.jsonl"), "rb") as f:
+                documents = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        state = _State(
+            version=manifest["version"],
+            epoch=epoch,
+            dimension=dim,
+            ids=ids,
+            row_of={ids[row]: int(row) for row in np.flatnonzero(~arrays["deleted"])},
+            vectors=vectors,
+            deleted=arrays["deleted"],
+            live=np.packbits(~arrays["deleted"]),
+            doc_offsets=arrays["doc_offsets"],
+            documents=documents,
+            columns=MetadataColumns(
+                {k[4:]: v for k, v in arrays.items() if k.startswith("col:")},
+                manifest["vocab"],
+            ),
+        )
+        if "ivf_centroids" in arrays:
+            state.ivf_centroids = arrays["ivf_centroids"]
+            state.ivf_assignments = arrays["ivf_assignments"]
+            state.ivf_order, state.ivf_offsets = _group_lists(
+                state.ivf_assignments, state.deleted, len(state.ivf_centroids)
+            )
+        return state
+
+    def _maybe_reload(self) -> None:
+        """Pick up a newer manifest written by another process (checked every few seconds)."""
+        now = time.monotonic()
+        if now - self._checked_at < self.reload_interval:
+            return
+        self._checked_at = now
+        try:
+            with open(self._file("manifest.json")) as f:
+                version = json.load(f)["version"]
+            if version != self._state.version:
+                self._state = self._load()
+                logger.info(f"Local index reloaded at version {version} ({self._state.rows} rows)")
+        except Exception as e:
+            logger.warning(f"Local index reload failed, keeping version {self._state.version}: {e}")
+
+    # ─── Reads ─────────────────────────────────────────────────────────────
+
+    def __len__(self) -> int:
+        state = self._state
+        return int(state.rows - state.deleted.sum())
+
+    def _document(self, state: _State, row: int) -> dict:
+        start, end = state.doc_offsets[row], state.doc_offsets[row + 1]
+        return json.loads(state.documents[start:end])
+
+    def _score(self, state: _State, rows: np.ndarray, query: np.ndarray) -> np.ndarray:
+        scores = np.empty(len(rows), dtype=np.float32)
+        for start in range(0, len(rows), _SCORE_CHUNK):
+            chunk = rows[start:start + _SCORE_CHUNK]
+            scores[start:start + len(chunk)] = state.vectors[chunk].astype(np.float32) @ query
+        return scores
+
+    def _candidate_rows(self, state: _State, mask: np.ndarray, query: np.ndarray, top_k: int) -> np.ndarray:
+        """Rows to score: the filtered rows of the probed IVF lists, or all of them."""
+        if self.mode == "ivf" and state.ivf_centroids is not None:
+            probe = np.argsort(-(state.ivf_centroids @ query))[:self.nprobe]
+            rows = np.concatenate(
+                [state.ivf_order[state.ivf_offsets[c]:state.ivf_offsets[c + 1]] for c in probe]
+            )
+            rows = rows[mask[rows]]
+            if len(rows) >= top_k:
+                return rows
+            # Selective filter: the probed lists can't fill the page, fall back to exact
+        return np.flatnonzero(mask)
+
+    def search(
+        self,
+        query_embedding: list[float],
+        top_k: int = 20,
+        filter_dict: dict | None = None,
+        include_metadata: bool = True,
+    ) -> list[dict]:
+        """Same contract as ``PineconeClient.search`` (cosine scores)."""
+        self._maybe_reload()
+        state = self._state
+        if not state.rows:
+            return []
+        query = _normalize(query_embedding)
+        columns = state.columns
+        mask = columns.unpack(columns.evaluate_bitmap(filter_dict) & state.live)
+        rows = self._candidate_rows(state, mask, query, top_k)
+        if not len(rows):
+            return []
+        scores = self._score(state, rows, query)
+        if len(rows) > top_k:
+            top = np.argpartition(-scores, top_k - 1)[:top_k]
+        else:
+            top = np.arange(len(rows))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [
+            {
+                "id": state.ids[rows[i]],
+                "score": float(scores[i]),
+                "metadata": self._document(state, rows[i]) if include_metadata else {},
+            }
+            for i in top
+        ]
+
+    async def asearch(
+        self,
+        query_embedding: list[float],
+        top_k: int = 20,
+        filter_dict: dict | None = None,
+        include_metadata: bool = True,
+    ) -> list[dict]:
+        """``search`` for async callers. Scoring is CPU-bound, so it runs in the threadpool."""
+        return await run_in_threadpool(
+            self.search,
+            query_embedding=query_embedding,
+            top_k=top_k,
+            filter_dict=filter_dict,
+            include_metadata=include_metadata,
+        )
+
+    def facets(self, filter_dict: dict | None, fields: list[str], limit: int | None = None) -> dict:
+        """Matching row count and per-value counts of ``fields`` for a filter.
+
+        Evaluated on the filter bitmaps alone, no vectors are touched.
+        """
+        self._maybe_reload()
+        state = self._state
+        columns = state.columns
+        bitmap = columns.evaluate_bitmap(filter_dict) & state.live
+        return {
+            "total": popcount(bitmap),
+            "facets": {field: columns.facet_counts(field, bitmap, limit) for field in fields},
+        }
+
+    def fetch_by_ids(self, ids: list[str]) -> dict[str, dict]:
+        """Same contract as ``PineconeClient.fetch_by_ids``."""
+        self._maybe_reload()
+        state = self._state
+        return {
+            vector_id: self._document(state, state.row_of[vector_id])
+            for vector_id in ids
+            if vector_id in state.row_of
+        }
+
+    async def afetch_by_ids(self, ids: list[str]) -> dict[str, dict]:
+        """``fetch_by_ids`` for async callers (in memory, but may reload from disk)."""
+        return await run_in_threadpool(self.fetch_by_ids, ids)
+
+    # ─── Writes (ingestion scripts) ────────────────────────────────────────
+
+    def upsert(self, vector_id: str, values: list[float], metadata: dict) -> None:
+        """Stage a vector; written by ``save``."""
+        with self._lock:
+            self._pending_deletes.discard(vector_id)
+            self._pending_upserts[vector_id] = (_normalize(values), metadata)
+
+    def upsert_issues(self, issues: list) -> None:
+        """Stage ``Issue`` objects, with the metadata ``PineconeClient.upsert_issues`` writes."""
+        for issue in issues:
+            self.upsert(issue.id, issue.embedding, issue.metadata.model_dump(exclude_none=True))
+
+    def update_metadata(self, vector_id: str, fields: dict) -> None:
+        """Stage a metadata patch that keeps the stored vector; written by ``save``."""
+        with self._lock:
+            pending = self._pending_upserts.get(vector_id)
+            if pending is not None:
+                values, metadata = pending
+            else:
+                state = self._state
+                row = state.row_of.get(vector_id)
+                if row is None:
+                    return
+                values, metadata = state.vectors[row].astype(np.float32), self._document(state, row)
+            self._pending_upserts[vector_id] = (values, {**metadata, **fields})
+
+    def delete(self, ids: list[str]) -> None:
+        """Stage deletions; written by ``save``."""
+        with self._lock:
+            for vector_id in ids:
+                self._pending_upserts.pop(vector_id, None)
+                self._pending_deletes.add(vector_id)
+
+    def save(self) -> None:
+        """Append staged rows, record tombstones and publish a new manifest."""
+        with self._lock:
+            upserts, deletes = self._pending_upserts, self._pending_deletes
+            self._pending_upserts, self._pending_deletes = {}, set()
+        with self._write_lock():
+            self._save(upserts, deletes)
+
+    def _save(self, upserts: dict[str, tuple[np.ndarray, dict]], deletes: set[str]) -> None:
+        state = self._load()  # always write on top of the latest published version
+        deleted = state.deleted.copy()
+        for vector_id in [*deletes, *upserts]:
+            row = state.row_of.get(vector_id)
+            if row is not None:
+                deleted[row] = True
+
+        new_ids = list(upserts)
+        doc_offsets = state.doc_offsets
+        columns = state.columns
+        assignments = state.ivf_assignments
+        if new_ids:
+            vectors = np.stack([upserts[i][0] for i in new_ids]).astype(np.float16)
+            with open(self._file(f"vectors-{state.epoch}.f16"), "ab") as f:
+                f.write(vectors.tobytes())
+            encoded = [json.dumps(upserts[i][1], separators=(",", ":")).encode() for i in new_ids]
+            with open(self._file(f"documents-{state.epoch}.jsonl"), "ab") as f:
+                f.write(b"".join(encoded))
+            doc_offsets = np.concatenate([
+                doc_offsets, doc_offsets[-1] + np.cumsum([len(e) for e in encoded]),
+            ]).astype(np.int64)
+            columns = columns.append([upserts[i][1] for i in new_ids])
+            deleted = np.concatenate([deleted, np.zeros(len(new_ids), dtype=bool)])
+            if state.ivf_centroids is not None:
+                new_lists = np.argmax(vectors.astype(np.float32) @ state.ivf_centroids.T, axis=1)
+                assignments = np.concatenate([assignments, new_lists.astype(np.int32)])
+
+        self._publish(
+            state,
+            ids=state.ids + new_ids,
+            deleted=deleted,
+            doc_offsets=doc_offsets,
+            columns=columns,
+            ivf_centroids=state.ivf_centroids,
+            ivf_assignments=assignments,
+        )
+        logger.info(f"Local index saved: +{len(new_ids)} rows, {len(deletes)} deletes ({len(self)} live)")
+        if self._state.rows and deleted.sum() / self._state.rows > _COMPACT_RATIO:
+            self._compact()
+
+    def _publish(self, previous: _State, *, epoch: int | None = None, **arrays) -> None:
+        version = previous.version + 1
+        epoch = previous.epoch if epoch is None else epoch
+        columns: MetadataColumns = arrays.pop("columns")
+        ids: list[str] = arrays.pop("ids")
+        payload = {
+            "ids": np.frombuffer("\n".join(ids).encode(), dtype=np.uint8),
+            **{k: v for k, v in arrays.items() if v is not None},
+            **{f"col:{k}": v for k, v in columns.arrays.items()},
+        }
+        with open(self._file(f"state-{version}.npz"), "wb") as f:
+            np.savez(f, **payload)
+        _write_json_atomic(self._file("manifest.json"), {
+            "dimension": previous.dimension,
+            "version": version,
+            "epoch": epoch,
+            "rows": len(ids),
+            "vocab": columns.vocab,
+        })
+        # Keep the previous state and epoch files for readers that loaded the old
+        # manifest a moment ago; only the ones before them are unreachable now
+        stale = [f"state-{previous.version - 1}.npz"]
+        if previous.epoch:
+            stale += [f"vectors-{previous.epoch - 1}.f16", f"documents-{previous.epoch - 1}.jsonl"]
+        for name in stale:
+            if os.path.exists(self._file(name)):
+                os.remove(self._file(name))
+        self._state = self._load()
+
+    def compact(self) -> None:
+        """Rewrite live rows under a new epoch, dropping tombstones."""
+        with self._write_lock():
+            self._compact()
+
+    def _compact(self) -> None:
+        state = self._load()
+        live = np.flatnonzero(~state.deleted)
+        epoch = state.epoch + 1
+        with open(self._file(f"vectors-{epoch}.f16"), "wb") as f:
+            for start in range(0, len(live), _SCORE_CHUNK):
+                f.write(np.ascontiguousarray(state.vectors[live[start:start + _SCORE_CHUNK]]).tobytes())
+        lengths = []
+        with open(self._file(f"documents-{epoch}.jsonl"), "wb") as f:
+            for row in live:
+                chunk = state.documents[state.doc_offsets[row]:state.doc_offsets[row + 1]]
+                f.write(chunk)
+                lengths.append(len(chunk))
+        doc_offsets = np.zeros(len(live) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=doc_offsets[1:])
+        self._publish(
+            state,
+            epoch=epoch,
+            ids=[state.ids[row] for row in live],
+            deleted=np.zeros(len(live), dtype=bool),
+            doc_offsets=doc_offsets,
+            columns=state.columns.take(live),
+            ivf_centroids=state.ivf_centroids,
+            ivf_assignments=state.ivf_assignments[live] if state.ivf_assignments is not None else None,
+        )
+        logger.info(f"Local index compacted to {len(live)} rows (epoch {epoch})")
+
+    def train_ivf(self, nlist: int | None = None, sample_size: int = 20000, iterations: int = 10) -> None:
+        """k-means the live vectors into ``nlist`` lists (default ~sqrt(rows)) and publish."""
+        with self._write_lock():
+            self._train_ivf(nlist, sample_size, iterations)
+
+    def _train_ivf(self, nlist: int | None, sample_size: int, iterations: int) -> None:
+        state = self._load()
+        live = np.flatnonzero(~state.deleted)
+        if not len(live):
+            return
+        nlist = min(nlist or max(1, int(np.sqrt(len(live)))), len(live))
+        rng = np.random.default_rng(0)
+        sample = np.sort(rng.choice(live, size=min(sample_size, len(live)), replace=False))
+        points = state.vectors[sample].astype(np.float32)
+        centroids = points[rng.choice(len(points), size=nlist, replace=False)]
+        for _ in range(iterations):
+            labels = np.argmax(points @ centroids.T, axis=1)
+            for c in range(nlist):
+                members = points[labels == c]
+                if len(members):
+                    centroids[c] = _normalize(members.mean(axis=0))
+
+        assignments = np.empty(state.rows, dtype=np.int32)
+        for start in range(0, state.rows, _SCORE_CHUNK):
+            block = state.vectors[start:start + _SCORE_CHUNK].astype(np.float32)
+            assignments[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+        self._publish(
+            state,
+            ids=state.ids,
+            deleted=state.deleted,
+            doc_offsets=state.doc_offsets,
+            columns=state.columns,
+            ivf_centroids=centroids,
+            ivf_assignments=assignments,
+        )
+        logger.info(f"Local index IVF trained: {nlist} lists over {len(live)} rows")
+
+
+def _group_lists(assignments: np.ndarray, deleted: np.ndarray, nlist: int) -> tuple[np.ndarray, np.ndarray]:
+    """Live rows grouped by IVF list, plus per-list offsets."""
+    live = np.flatnonzero(~deleted)
+    order = live[np.argsort(assignments[live], kind="stable")]
+    counts = np.bincount(assignments[live], minlength=nlist)
+    offsets = np.zeros(nlist + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    return order, offsets
+
+
+def _write_json_atomic(path: str, data: dict) -> None:
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+def open_local_index(writable: bool = False) -> "LocalIndex | None":
+    """The configured replica, or None when it isn't enabled.
+
+    ``writable`` is for the ingestion scripts (``LOCAL_INDEX_SYNC``); the
+    search engine opens it read-only when ``SEARCH_BACKEND=local``.
+    """
+    from app.config import get_settings
+
+    settings = get_settings()
+    if writable and not settings.local_index_sync:
+        return None
+    if not writable and settings.search_backend != "local":
+        return None
+    kwargs = {"mode": settings.local_index_mode, "nprobe": settings.local_index_nprobe}
+    if writable:
+        return LocalIndex.create(settings.local_index_path, settings.embedding_dimension, **kwargs)
+    return LocalIndex(settings.local_index_path, **kwargs)
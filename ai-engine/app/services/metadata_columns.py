@@ -0,0 +1,302 @@
+"""Columnar copy of the filterable issue metadata, with Pinecone filter evaluation.
+
+The local replica (``app.services.local_index``) answers the same filter
+dicts ``SearchEngine._build_filter`` sends to Pinecone. Only the fields
+those filters touch are kept as columns; everything else stays in the
+document file.
+
+Semantics follow Pinecone: ``$eq/$in/$gt/$gte/$lt/$lte`` never match a
+record that lacks the field, ``$ne/$nin`` do. On list fields ``$eq/$in``
+match when any element matches.
+
+Filters are evaluated on packed bitmaps (one bit per row, 54KB for 430K
+issues): equality on category, bool and list fields reads a cached
+per-value bitmap, ranges on numbers binary-search a pre-sorted copy of the
+column, and ``$and/$or/$ne`` are bytewise AND/OR/NOT. Facet counts use the
+same columns.
+"""
+
+import numpy as np
+
+from app.services.memory_cache import LRUCache
+
+# field -> column kind
+FILTER_FIELDS = {
+    "type": "category",
+    "language": "category",
+    "repo_stars": "number",
+    "created_at_ts": "number",
+    "updated_at_ts": "number",
+    "is_assigned": "bool",
+    "is_good_first_issue": "bool",
+    "is_help_wanted": "bool",
+    "labels_norm": "list",
+    "topics_norm": "list",
+}
+
+_MISSING = -1  # code for absent category/bool values
+
+# Per-value bitmaps kept per column set (labels can have thousands of values)
+_BITMAP_CACHE_SIZE = 1024
+
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def popcount(bitmap: np.ndarray) -> int:
+    """Number of set bits in a packed bitmap."""
+    return int(_POPCOUNT[bitmap].sum(dtype=np.int64))
+
+
+class MetadataColumns:
+    """Filter columns for ``n`` rows.
+
+    - number: float64, NaN when missing
+    - bool: int8 (1/0, -1 missing)
+    - category: int32 codes into ``vocab[field]`` (-1 missing)
+    - list: CSR layout, ``offsets[field]`` (n + 1) into int32 ``codes``
+    """
+
+    def __init__(self, arrays: dict[str, np.ndarray], vocab: dict[str, list[str]]):
+        self.arrays = arrays
+        self.vocab = vocab
+        self._codes = {field: {v: i for i, v in enumerate(values)} for field, values in vocab.items()}
+        self._row_of_element: dict[str, np.ndarray] = {}
+        self._bitmaps = LRUCache(maxsize=_BITMAP_CACHE_SIZE)
+        self._sorted: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+        self._full: np.ndarray | None = None
+
+    # ─── Construction ───────────────────────────────────────────────────────
+
+    @classmethod
+    def empty(cls) -> "MetadataColumns":
+        return cls.from_metadata([])
+
+    @classmethod
+    def from_metadata(cls, rows: list[dict], vocab: dict[str, list[str]] | None = None) -> "MetadataColumns":
+        """Build columns from metadata dicts, extending ``vocab`` as needed."""
+        vocab = {field: list(values) for field, values in (vocab or {}).items()}
+        codes = {field: {v: i for i, v in enumerate(values)} for field, values in vocab.items()}
+
+        def code(field: str, value: str) -> int:
+            table = codes.setdefault(field, {})
+            if value not in table:
+                table[value] = len(table)
+                vocab.setdefault(field, []).append(value)
+            return table[value]
+
+        arrays: dict[str, np.ndarray] = {}
+        for field, kind in FILTER_FIELDS.items():
+            if kind == "number":
+                arrays[field] = np.array(
+                    [row[field] if row.get(field) is not None else np.nan for row in rows],
+                    dtype=np.float64,
+                )
+            elif kind == "bool":
+                arrays[field] = np.array(
+                    [_MISSING if row.get(field) is None else int(bool(row[field])) for row in rows],
+                    dtype=np.int8,
+                )
+            elif kind == "category":
+                arrays[field] = np.array(
+                    [code(field, row[field]) if row.get(field) is not None else _MISSING for row in rows],
+                    dtype=np.int32,
+                )
+            else:
+                lengths = [len(row.get(field) or ()) for row in rows]
+                offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+                np.cumsum(lengths, out=offsets[1:])
+                arrays[f"{field}.offsets"] = offsets
+                arrays[f"{field}.codes"] = np.array(
+                    [code(field, v) for row in rows for v in (row.get(field) or ())],
+                    dtype=np.int32,
+                )
+        return cls(arrays, vocab)
+
+    def __len__(self) -> int:
+        return len(self.arrays["repo_stars"])
+
+    def append(self, rows: list[dict]) -> "MetadataColumns":
+        """New columns with ``rows`` appended (vocabularies are extended, never renumbered)."""
+        tail = MetadataColumns.from_metadata(rows, self.vocab)
+        arrays = {}
+        for field, kind in FILTER_FIELDS.items():
+            if kind == "list":
+                head_offsets = self.arrays[f"{field}.offsets"]
+                arrays[f"{field}.offsets"] = np.concatenate(
+                    [head_offsets[:-1], tail.arrays[f"{field}.offsets"] + head_offsets[-1]]
+                )
+                arrays[f"{field}.codes"] = np.concatenate(
+                    [self.arrays[f"{field}.codes"], tail.arrays[f"{field}.codes"]]
+                )
+            else:
+                arrays[field] = np.concatenate([self.arrays[field], tail.arrays[field]])
+        return MetadataColumns(arrays, tail.vocab)
+
+    def take(self, rows: np.ndarray) -> "MetadataColumns":
+        """New columns holding only ``rows`` (in that order), for compaction."""
+        arrays = {}
+        for field, kind in FILTER_FIELDS.items():
+            if kind == "list":
+                offsets = self.arrays[f"{field}.offsets"]
+                codes = self.arrays[f"{field}.codes"]
+                lengths = offsets[rows + 1] - offsets[rows]
+                new_offsets = np.zeros(len(rows) + 1, dtype=np.int64)
+                np.cumsum(lengths, out=new_offsets[1:])
+                arrays[f"{field}.offsets"] = new_offsets
+                arrays[f"{field}.codes"] = (
+                    np.concatenate([codes[offsets[r]:offsets[r + 1]] for r in rows])
+                    if len(rows) else np.empty(0, dtype=np.int32)
+                ).astype(np.int32)
+            else:
+                arrays[field] = self.arrays[field][rows]
+        return MetadataColumns(arrays, self.vocab)
+
+    # ─── Bitmaps ───────────────────────────────────────────────────────────
+
+    def pack(self, mask: np.ndarray) -> np.ndarray:
+        return np.packbits(mask)
+
+    def unpack(self, bitmap: np.ndarray) -> np.ndarray:
+        return np.unpackbits(bitmap, count=len(self)).astype(bool)
+
+    def full(self) -> np.ndarray:
+        """Bitmap with every row set (padding bits clear, so NOT stays exact)."""
+        if self._full is None:
+            self._full = self.pack(np.ones(len(self), dtype=bool))
+        return self._full
+
+    def _cached(self, key: tuple, build) -> np.ndarray:
+        bitmap = self._bitmaps.get(key)
+        if bitmap is None:
+            bitmap = self.pack(build())
+            self._bitmaps.set(key, bitmap)
+        return bitmap
+
+    def value_bitmap(self, field: str, value) -> np.ndarray:
+        """Rows whose ``field`` equals (or, for lists, contains) ``value``."""
+        kind = FILTER_FIELDS[field]
+        if kind == "bool":
+            code = int(bool(value))
+        else:
+            code = self._codes.get(field, {}).get(value)
+            if code is None:
+                return np.zeros_like(self.full())
+        if kind == "list":
+            def build():
+                mask = np.zeros(len(self), dtype=bool)
+                mask[self._rows_of_elements(field)[self.arrays[f"{field}.codes"] == code]] = True
+                return mask
+        else:
+            def build():
+                return self.arrays[field] == code
+        return self._cached((field, code), build)
+
+    def _sorted_column(self, field: str) -> tuple[np.ndarray, np.ndarray]:
+        """(row order, sorted values) of a number column, missing values excluded."""
+        entry = self._sorted.get(field)
+        if entry is None:
+            column = self.arrays[field]
+            order = np.argsort(column, kind="stable")
+            order = order[:int((~np.isnan(column)).sum())]  # NaNs sort last
+            entry = (order, column[order])
+            self._sorted[field] = entry
+        return entry
+
+    def range_bitmap(self, field: str, low: float | None, high: float | None,
+                     low_inclusive: bool = True, high_inclusive: bool = True) -> np.ndarray:
+        """Rows with ``low <(=) field <(=) high`` via binary search on the sorted column."""
+        order, values = self._sorted_column(field)
+        start = 0 if low is None else np.searchsorted(values, low, "left" if low_inclusive else "right")
+        end = len(values) if high is None else np.searchsorted(values, high, "right" if high_inclusive else "left")
+        mask = np.zeros(len(self), dtype=bool)
+        mask[order[start:end]] = True
+        return self.pack(mask)
+
+    # ─── Filter evaluation ─────────────────────────────────────────────────
+
+    def evaluate(self, filter_dict: dict | None) -> np.ndarray:
+        """Boolean row mask for a Pinecone-style filter."""
+        return self.unpack(self.evaluate_bitmap(filter_dict))
+
+    def evaluate_bitmap(self, filter_dict: dict | None) -> np.ndarray:
+        """Packed bitmap of rows matching a Pinecone-style filter."""
+        bitmap = self.full().copy()
+        if not filter_dict:
+            return bitmap
+        for key, condition in filter_dict.items():
+            if key == "$and":
+                for clause in condition:
+                    bitmap &= self.evaluate_bitmap(clause)
+            elif key == "$or":
+                any_bitmap = np.zeros_like(bitmap)
+                for clause in condition:
+                    any_bitmap |= self.evaluate_bitmap(clause)
+                bitmap &= any_bitmap
+            else:
+                if not isinstance(condition, dict):
+                    condition = {"$eq": condition}
+                for op, value in condition.items():
+                    bitmap &= self._compare(key, op, value)
+        return bitmap
+
+    def _compare(self, field: str, op: str, value) -> np.ndarray:
+        kind = FILTER_FIELDS.get(field)
+        if kind is None:
+            raise ValueError(f"Field {field!r} is not available for local filtering")
+
+        if op in ("$gt", "$gte", "$lt", "$lte"):
+            if kind != "number":
+                raise ValueError(f"Operator {op!r} is not supported on {field!r}")
+            if op in ("$gt", "$gte"):
+                return self.range_bitmap(field, value, None, low_inclusive=op == "$gte")
+            return self.range_bitmap(field, None, value, high_inclusive=op == "$lte")
+
+        if op not in ("$eq", "$ne", "$in", "$nin"):
+            raise ValueError(f"Operator {op!r} is not supported on {field!r}")
+        values = value if op in ("$in", "$nin") else [value]
+        hit = np.zeros_like(self.full())
+        for v in values:
+            if kind == "number":
+                hit |= self.range_bitmap(field, v, v)
+            else:
+                hit |= self.value_bitmap(field, v)
+        if op in ("$eq", "$in"):
+            return hit
+        # $ne/$nin also match rows without the field
+        return ~hit & self.full()
+
+    def _rows_of_elements(self, field: str) -> np.ndarray:
+        """Row index of every element in a list column (cached)."""
+        rows = self._row_of_element.get(field)
+        if rows is None:
+            offsets = self.arrays[f"{field}.offsets"]
+            rows = np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
+            self._row_of_element[field] = rows
+        return rows
+
+    # ─── Facets ────────────────────────────────────────────────────────────
+
+    def facet_counts(self, field: str, within: np.ndarray | None = None, limit: int | None = None) -> dict:
+        """``{value: rows}`` for a category, bool or list field, optionally within a row bitmap."""
+        kind = FILTER_FIELDS[field]
+        if kind == "number":
+            raise ValueError(f"Facets are not supported on number field {field!r}")
+        mask = None if within is None else self.unpack(within)
+        if kind == "list":
+            codes = self.arrays[f"{field}.codes"]
+            if mask is not None:
+                codes = codes[mask[self._rows_of_elements(field)]]
+        else:
+            codes = self.arrays[field] if mask is None else self.arrays[field][mask]
+            codes = codes[codes != _MISSING]
+        counts = np.bincount(codes, minlength=len(self.vocab.get(field, ())) if kind != "bool" else 2)
+        if kind == "bool":
+            labels = [False, True]
+        else:
+            labels = self.vocab.get(field, [])
+        ranked = sorted(
+            ((labels[code], int(n)) for code, n in enumerate(counts) if n),
+            key=lambda item: item[1],
+            reverse=True,
+        )
+        return dict(ranked[:limit] if limit else ranked)
@@ -0,0 +1,149 @@
+"""Parse Cache Service — two-tier cache for LLM-parsed search queries.
+
+**Memory tier** — per-worker LRU with TTL. Serves the homepage and shared
+    links, which send the same handful of queries over and over.
+
+**Shared tier (``query_parse_cache``)** — Postgres via ``app.database``.
+    Lets every worker (and every new revision) reuse a parse that any other
+    worker already paid for. Skipped entirely when ``DATABASE_URL`` is unset.
+
+Keys combine a prompt version with the normalized query text, so editing
+``SYSTEM_PROMPT`` or switching the parser model invalidates everything.
+Only successful LLM parses are stored; fallbacks are never cached.
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+from datetime import datetime, timedelta, timezone
+
+from app import database
+from app.models.query import ParsedQuery
+from app.models.query_parse_cache import QueryParseCache
+from app.services.memory_cache import LRUCache
+from app.services.search_metrics import search_metrics
+
+log = logging.getLogger(__name__)
+
+
+def normalize_query(query: str) -> str:
+    """Case- and whitespace-insensitive form of a query used for cache keys."""
+    return " ".join(query.lower().split())
+
+
+def prompt_version(system_prompt: str, model: str) -> str:
+    """Short stable fingerprint of the prompt + model that produced a parse."""
+    return hashlib.sha256(f"{model}\0{system_prompt}".encode()).hexdigest()[:16]
+
+
+class ParseCacheService:
+    """Memory + Postgres cache of ``ParsedQuery`` results."""
+
+    def __init__(
+        self,
+        version: str,
+        *,
+        maxsize: int = 2048,
+        ttl_seconds: int = 86400,
+        use_shared_tier: bool = True,
+    ):
+        self.version = version
+        self.ttl_seconds = ttl_seconds
+        self.use_shared_tier = use_shared_tier
+        self._memory = LRUCache(maxsize=maxsize, ttl_seconds=ttl_seconds)
+
+    def cache_key(self, query: str) -> str:
+        """Versioned key for a query."""
+        return hashlib.sha256(
+            f"{self.version}\0{normalize_query(query)}".encode()
+        ).hexdigest()
+
+    def get_local(self, query: str) -> ParsedQuery | None:
+        """Memory-tier lookup only. Cheap enough to call on the event loop.
+
+        The only read of the memory tier, so each request counts one LRU hit
+        or miss; on a miss callers go on to ``get_shared``.
+        """
+        return self._get_memory(self.cache_key(query))
+
+    def get_shared(self, query: str) -> ParsedQuery | None:
+        """Shared-tier lookup, promoting hits into memory. May hit Postgres.
+
+        Does not read the memory tier, which ``get_local`` already missed.
+        """
+        key = self.cache_key(query)
+        data = self._get_shared(key)
+        if data is None:
+            search_metrics.incr("parse_cache.miss")
+            return None
+
+        search_metrics.incr("parse_cache.hit.shared")
+        self._memory.set(key, data)
+        return ParsedQuery.model_validate(data)
+
+    def put(self, query: str, parsed: ParsedQuery) -> None:
+        """Store a successful parse in both tiers."""
+        key = self.cache_key(query)
+        data = parsed.model_dump()
+        self._memory.set(key, data)
+        self._put_shared(key, normalize_query(query), data)
+
+    def stats(self) -> dict:
+        """Memory-tier size and hit rate."""
+        return {"version": self.version, **self._memory.stats()}
+
+    def _get_memory(self, key: str) -> ParsedQuery | None:
+        data = self._memory.get(key)
+        if data is None:
+            return None
+        search_metrics.incr("parse_cache.hit.memory")
+        # Fresh model each time: callers mutate the result with manual overrides
+        return ParsedQuery.model_validate(data)
+
+    # ─── Shared tier ──────────────────────────────────────────────────────────
+
+    @property
+    def shared_enabled(self) -> bool:
+        return self.use_shared_tier and database.SessionLocal is not None
+
+    def _get_shared(self, key: str) -> dict | None:
+        if not self.shared_enabled:
+            return None
+        db = database.SessionLocal()
+        try:
+            entry = db.query(QueryParseCache).filter(
+                QueryParseCache.cache_key == key,
+                QueryParseCache.expires_at > datetime.now(timezone.utc),
+            ).first()
+            return entry.parsed_query if entry is not None else None
+        except Exception as e:  # noqa: BLE001
+            # Caching is never critical — treat DB trouble as a miss
+            log.warning("[parse-cache] shared read failed: %s", e)
+            return None
+        finally:
+            db.close()
+
+    def _put_shared(self, key: str, normalized: str, data: dict) -> None:
+        if not self.shared_enabled:
+            return
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=self.ttl_seconds)
+        db = database.SessionLocal()
+        try:
+            existing = db.query(QueryParseCache).filter(
+                QueryParseCache.cache_key == key,
+            ).first()
+            if existing is not None:
+                existing.parsed_query = data
+                existing.expires_at = expires_at
+            else:
+                db.add(QueryParseCache(
+                    cache_key=key, prompt_version=self.version,
+                    query_text=normalized, parsed_query=data,
+                    expires_at=expires_at,
+                ))
+            db.commit()
+        except Exception as e:  # noqa: BLE001
+            log.warning("[parse-cache] shared write failed: %s", e)
+            db.rollback()
+        finally:
+            db.close()
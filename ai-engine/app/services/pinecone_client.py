@@ -1,23 +1,34 @@
 """Pinecone vector database client."""
 
+import asyncio
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from fastapi.concurrency import run_in_threadpool
 from pinecone import Pinecone, ServerlessSpec
 
 from app.config import get_settings
 from app.models.issue import Issue, IssueMetadata
+from app.models.index_stats import STATS_RECORD_ID
+from app.services.api_clients import get_http_client
+from app.services.search_metrics import search_metrics
 
 logger = logging.getLogger(__name__)
 
+# Data-plane REST API version used by ``asearch`` and ``afetch_by_ids``
+PINECONE_API_VERSION = "2024-07"
+
 
 class PineconeClient:
     """Manages Pinecone index operations."""
     
     def __init__(self):
         settings = get_settings()
+        self.api_key = settings.pinecone_api_key
         self.pc = Pinecone(api_key=settings.pinecone_api_key)
         self.index_name = settings.pinecone_index_name
         self.dimension = settings.embedding_dimension
         self._index = None
+        self._host = settings.pinecone_index_host
         
     def ensure_index_exists(self) -> None:
         """Create index if it doesn't exist."""
@@ -74,13 +85,18 @@ class PineconeClient:
         self,
         query_embedding: list[float],
         top_k: int = 20,
-        filter_dict: dict | None = None
+        filter_dict: dict | None = None,
+        include_metadata: bool = True
     ) -> list[dict]:
-        """Search for similar issues with optional filters."""
+        """Search for similar issues with optional filters.
+        
+        With ``include_metadata=False`` only IDs and scores come back
+        (``metadata`` is an empty dict), which skips transferring bodies.
+        """
         results = self.index.query(
             vector=query_embedding,
             top_k=top_k,
-            include_metadata=True,
+            include_metadata=include_metadata,
             filter=filter_dict
         )
         
@@ -88,15 +104,139 @@ class PineconeClient:
             {
                 "id": match.id,
                 "score": match.score,
-                "metadata": match.metadata
+                "metadata": match.metadata or {}
             }
             for match in results.matches
         ]
     
+    async def asearch(
+        self,
+        query_embedding: list[float],
+        top_k: int = 20,
+        filter_dict: dict | None = None,
+        include_metadata: bool = True
+    ) -> list[dict]:
+        """``search`` on the event loop, over the shared keep-alive HTTP pool.
+        
+        Calls the index's REST query endpoint directly; the SDK's sync
+        client would need a thread per in-flight query.
+        """
+        host = await self._index_host()
+        body = {
+            "vector": query_embedding,
+            "topK": top_k,
+            "includeMetadata": include_metadata,
+            "includeValues": False,
+        }
+        if filter_dict:
+            body["filter"] = filter_dict
+        response = await get_http_client().post(
+            f"https://{host}/query",
+            json=body,
+            headers={"Api-Key": self.api_key, "X-Pinecone-API-Version": PINECONE_API_VERSION}
+        )
+        response.raise_for_status()
+        return [
+            {
+                "id": match["id"],
+                "score": match["score"],
+                "metadata": match.get("metadata") or {}
+            }
+            for match in response.json().get("matches", [])
+        ]
+    
+    async def afetch_by_ids(self, ids: list[str], batch_size: int = 100) -> dict[str, dict]:
+        """``fetch_by_ids`` on the event loop, over the shared keep-alive HTTP pool.
+        
+        IDs go in the query string, so batches are kept small enough for
+        the URL and fetched concurrently. The fetch endpoint always returns
+        vector values too; ``pinecone.fetch_bytes`` counts what came back.
+        """
+        if not ids:
+            return {}
+        host = await self._index_host()
+        
+        async def fetch(batch: list[str]) -> dict[str, dict]:
+            response = await get_http_client().get(
+                f"https://{host}/vectors/fetch",
+                params={"ids": batch},
+                headers={"Api-Key": self.api_key, "X-Pinecone-API-Version": PINECONE_API_VERSION}
+            )
+            response.raise_for_status()
+            search_metrics.incr("pinecone.fetch_bytes", len(response.content))
+            return {
+                vector_id: vector.get("metadata") or {}
+                for vector_id, vector in response.json().get("vectors", {}).items()
+            }
+        
+        result = {}
+        for fetched in await asyncio.gather(*(
+            fetch(ids[i:i + batch_size]) for i in range(0, len(ids), batch_size)
+        )):
+            result.update(fetched)
+        return result
+    
+    async def _index_host(self) -> str:
+        """Data-plane host of the index (``describe_index`` once per process)."""
+        if self._host is None:
+            description = await run_in_threadpool(self.pc.describe_index, self.index_name)
+            self._host = description.host
+        return self._host
+    
     def get_index_stats(self) -> dict:
         """Get index statistics."""
         return self.index.describe_index_stats()
     
+    def get_stats_record(self) -> dict | None:
+        """Fetch the ingestion-maintained stats record's metadata, if present."""
+        response = self.index.fetch(ids=[STATS_RECORD_ID])
+        record = response.vectors.get(STATS_RECORD_ID)
+        if record is None:
+            return None
+        return record.metadata or {}
+    
+    def upsert_stats_record(self, metadata: dict) -> None:
+        """Write the stats record.
+        
+        Cosine indexes reject all-zero vectors, so the record carries a unit
+        vector. It never shows up in results: every search filters out
+        ``type: stats``.
+        """
+        placeholder = [1.0] + [0.0] * (self.dimension - 1)
+        self.index.upsert(vectors=[{
+            "id": STATS_RECORD_ID,
+            "values": placeholder,
+            "metadata": metadata
+        }])
+    
+    def update_metadata(self, vector_id: str, fields: dict) -> None:
+        """Set metadata fields on an existing vector without re-sending its values."""
+        self.index.update(id=vector_id, set_metadata=fields)
+    
+    def update_metadata_batch(self, updates: dict[str, dict], max_workers: int = 8) -> list[str]:
+        """Apply many metadata-only updates concurrently.
+        
+        Pinecone updates one ID per request (no vector values are sent), so
+        the batch fans out over a small thread pool. Returns the IDs that
+        failed; the next ingestion run will see them as changed again.
+        """
+        if not updates:
+            return []
+        
+        def apply(item: tuple[str, dict]) -> str | None:
+            vector_id, fields = item
+            try:
+                self.update_metadata(vector_id, fields)
+                return None
+            except Exception as e:
+                logger.warning(f"Metadata update failed for {vector_id}: {e}")
+                return vector_id
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            failed = [vector_id for vector_id in pool.map(apply, updates.items()) if vector_id]
+        logger.info(f"Updated metadata of {len(updates) - len(failed)} vectors ({len(failed)} failed)")
+        return failed
+    
     def delete_all(self) -> None:
         """Delete all vectors from the index."""
         self.index.delete(delete_all=True)
@@ -188,6 +328,15 @@ class PineconeClient:
         logger.info(f"Fetched {len(result)} existing issues from Pinecone")
         return result
     
+    def fetch_vectors(self, ids: list[str], batch_size: int = 1000) -> dict[str, tuple[list[float], dict]]:
+        """Fetch values and metadata by ID (for building the local replica)."""
+        result = {}
+        for i in range(0, len(ids), batch_size):
+            response = self.index.fetch(ids=ids[i:i + batch_size])
+            for vector_id, vector_data in response.vectors.items():
+                result[vector_id] = (list(vector_data.values), vector_data.metadata or {})
+        return result
+    
     def delete_by_ids(self, ids: list[str], batch_size: int = 100) -> int:
         """
         Delete vectors by their IDs.
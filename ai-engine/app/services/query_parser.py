@@ -2,12 +2,17 @@
 
 import json
 import logging
-from google import genai
+import time
+from fastapi.concurrency import run_in_threadpool
 from google.genai import types
 from tenacity import retry, stop_after_attempt, wait_exponential
 
 from app.config import get_settings
 from app.models.query import ParsedQuery
+from app.services.api_clients import get_genai_client
+from app.services.parse_cache_service import ParseCacheService, prompt_version
+from app.services.rule_parser import RuleBasedParser
+from app.services.search_metrics import search_metrics
 
 logger = logging.getLogger(__name__)
 
@@ -64,54 +69,164 @@ class QueryParser:
     
     def __init__(self):
         settings = get_settings()
-        self.client = genai.Client(api_key=settings.gemini_api_key)
+        self.client = get_genai_client()
         self.model = "gemini-3-flash-preview"
+        self.cache = ParseCacheService(
+            prompt_version(SYSTEM_PROMPT, self.model),
+            maxsize=settings.parse_cache_size,
+            ttl_seconds=settings.parse_cache_ttl_seconds,
+            use_shared_tier=settings.parse_cache_shared,
+        )
+        self.rules = RuleBasedParser(min_confidence=settings.rule_parser_min_confidence)
+        
+    def parse_local(self, query: str) -> ParsedQuery | None:
+        """Answer from the memory cache or the keyword rules, without any I/O.
+        
+        Returns None when the query needs the shared cache or the LLM.
+        """
+        cached = self.cache.get_local(query)
+        if cached is not None:
+            return cached
+        
+        start = time.perf_counter()
+        result = self.rules.try_parse(query)
+        if result is None:
+            return None
+        
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        search_metrics.incr("parse.fast_path")
+        search_metrics.observe_ms("parse.fast_path", elapsed_ms)
+        saved_ms = search_metrics.mean_ms("parse.llm")
+        if saved_ms is not None:
+            search_metrics.incr("parse.fast_path.saved_ms", int(saved_ms - elapsed_ms))
+        logger.info(
+            f"Rule parser answered locally (confidence={result.confidence}, "
+            f"{elapsed_ms:.2f}ms, ~{saved_ms or 0:.0f}ms LLM time saved): {query}"
+        )
+        return result.parsed
+        
+    def parse(self, query: str) -> ParsedQuery:
+        """Parse a natural language query into structured filters.
+        
+        Tries the memory cache and keyword rules first, then the shared cache,
+        then Gemini. Only successful LLM parses are cached, so a transient
+        Gemini failure is retried next time.
+        """
+        parsed = self.parse_local(query)
+        if parsed is not None:
+            return parsed
+        return self.parse_remote(query)
+        
+    def parse_remote(self, query: str) -> ParsedQuery:
+        """Shared cache, then Gemini. Blocking; callers run this off the event loop."""
+        cached = self.cache.get_shared(query)
+        if cached is not None:
+            return cached
+        
+        start = time.perf_counter()
+        parsed = self._parse_with_llm(query)
+        search_metrics.incr("parse.llm_calls")
+        search_metrics.observe_ms("parse.llm", (time.perf_counter() - start) * 1000)
+        if parsed is None:
+            search_metrics.incr("parse.fallback")
+            return ParsedQuery(semantic_query=query)
+        
+        self.cache.put(query, parsed)
+        return parsed
+        
+    async def aparse_remote(self, query: str) -> ParsedQuery:
+        """``parse_remote`` on the event loop, with Gemini called through the async client.
+        
+        Only the Postgres shared tier, when configured, still runs in the threadpool.
+        """
+        shared = self.cache.shared_enabled
+        cached = await run_in_threadpool(self.cache.get_shared, query) if shared else None
+        if cached is not None:
+            return cached
+        
+        start = time.perf_counter()
+        parsed = await self._aparse_with_llm(query)
+        search_metrics.incr("parse.llm_calls")
+        search_metrics.observe_ms("parse.llm", (time.perf_counter() - start) * 1000)
+        if parsed is None:
+            search_metrics.incr("parse.fallback")
+            return ParsedQuery(semantic_query=query)
+        
+        if shared:
+            await run_in_threadpool(self.cache.put, query, parsed)
+        else:
+            self.cache.put(query, parsed)
+        return parsed
+        
+    def _generate_config(self) -> types.GenerateContentConfig:
+        return types.GenerateContentConfig(
+            temperature=0,
+            max_output_tokens=500,
+            response_mime_type="application/json"
+        )
         
     @retry(
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=2, max=30)
     )
-    def parse(self, query: str) -> ParsedQuery:
-        """Parse a natural language query into structured filters."""
+    def _parse_with_llm(self, query: str) -> ParsedQuery | None:
+        """Ask Gemini for structured filters. Returns None if the response is unusable."""
         try:
             response = self.client.models.generate_content(
                 model=self.model,
                 contents=f"{SYSTEM_PROMPT}\n\nUser query: {query}",
-                config=types.GenerateContentConfig(
-                    temperature=0,
-                    max_output_tokens=500,
-                    response_mime_type="application/json"
-                )
+                config=self._generate_config()
             )
-            
-            # Clean response text
-            response_text = response.text.strip()
-            # Handle potential markdown wrappers even with JSON mode
-            if response_text.startswith("```json"):
-                response_text = response_text[7:]
-            elif response_text.startswith("```"):
-                response_text = response_text[3:]
-            if response_text.endswith("```"):
-                response_text = response_text[:-3]
-            
-            parsed = json.loads(response_text)
-            
-            return ParsedQuery(
-                semantic_query=parsed.get("semantic_query", query),
-                language=parsed.get("language"),
-                min_stars=parsed.get("min_stars"),
-                max_stars=parsed.get("max_stars"),
-                labels=parsed.get("labels"),
-                difficulty=parsed.get("difficulty"),
-                sort_by=parsed.get("sort_by", "relevance"),
-                days_ago=parsed.get("days_ago"),
-                unassigned_only=parsed.get("unassigned_only", False),
-                topics=parsed.get("topics")
+            return self._to_parsed_query(response.text, query)
+        except json.JSONDecodeError as e:
+            logger.warning(f"Failed to parse LLM response: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Query parsing error: {e}")
+            return None
+        
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=2, max=30)
+    )
+    async def _aparse_with_llm(self, query: str) -> ParsedQuery | None:
+        try:
+            response = await self.client.aio.models.generate_content(
+                model=self.model,
+                contents=f"{SYSTEM_PROMPT}\n\nUser query: {query}",
+                config=self._generate_config()
             )
-            
+            return self._to_parsed_query(response.text, query)
         except json.JSONDecodeError as e:
             logger.warning(f"Failed to parse LLM response: {e}")
-            return ParsedQuery(semantic_query=query)
+            return None
         except Exception as e:
             logger.error(f"Query parsing error: {e}")
-            return ParsedQuery(semantic_query=query)
+            return None
+        
+    @staticmethod
+    def _to_parsed_query(response_text: str, query: str) -> ParsedQuery:
+        # Clean response text
+        response_text = response_text.strip()
+        # Handle potential markdown wrappers even with JSON mode
+        if response_text.startswith("```json"):
+            response_text = response_text[7:]
+        elif response_text.startswith("```"):
+            response_text = response_text[3:]
+        if response_text.endswith("```"):
+            response_text = response_text[:-3]
+        
+        parsed = json.loads(response_text)
+        
+        return ParsedQuery(
+            semantic_query=parsed.get("semantic_query", query),
+            language=parsed.get("language"),
+            min_stars=parsed.get("min_stars"),
+            max_stars=parsed.get("max_stars"),
+            labels=parsed.get("labels"),
+            difficulty=parsed.get("difficulty"),
+            sort_by=parsed.get("sort_by", "relevance"),
+            days_ago=parsed.get("days_ago"),
+            unassigned_only=parsed.get("unassigned_only", False),
+            topics=parsed.get("topics")
+        )
@@ -0,0 +1,178 @@
+"""Materialized "recent issues" feed for the homepage.
+
+``/api/search/recent`` used to run a top_k=200 Pinecone query on every view
+and then filter labels in Python. The feed instead holds one snapshot of
+the recent windows (issues created in the last 24h and updated in the last
+30 days), pre-sorted for every sort order and indexed by language, label
+and assignment. Any filter combination is then a few set lookups and a
+walk down a sorted list.
+
+The feed is rebuilt from Pinecone when it goes stale, when ingestion runs
+in-process, or when an out-of-process ingestion run is detected.
+
+Answers match the per-request query. That query re-sorts the first
+``fetch_k`` matches (in semantic order) that pass its filter, so the feed
+sorts exactly that prefix. When a window was truncated at refresh time and
+the feed holds fewer than ``fetch_k`` such matches, it defers to Pinecone.
+"""
+
+import math
+import time
+from dataclasses import dataclass, field
+
+NEWEST_WINDOW_SECONDS = 24 * 3600
+UPDATED_WINDOW_SECONDS = 30 * 86400
+
+# sort_by -> metadata key used for ordering (relevance uses the combined score)
+_SORT_KEYS = {
+    "newest": "created_at",
+    "recently_discussed": "updated_at",
+    "stars": "repo_stars",
+}
+
+
+@dataclass
+class RecentFeed:
+    """Immutable, pre-indexed snapshot of recent issues.
+
+    ``matches`` are Pinecone matches in semantic order; everything else
+    holds positions into that list.
+    """
+
+    matches: list[dict]
+    combined_scores: list[float]
+    created_ts: list[float]
+    updated_ts: list[float]
+    orders: dict[str, list[int]]
+    by_language: dict[str, set[int]]
+    by_label: dict[str, set[int]]
+    unassigned: set[int]
+    # False when a window's refresh query hit top_k, i.e. older issues were cut off
+    newest_complete: bool
+    updated_complete: bool
+    # Lowest score a truncated window returned; matches below it may be missing
+    newest_floor: float = -math.inf
+    updated_floor: float = -math.inf
+    fetch_k: int = 200  # top_k of the per-request query the feed stands in for
+    labels_in_filter: bool = False  # labels are part of that query's filter, not a post-filter
+    built_at: float = field(default_factory=time.monotonic)
+
+    @classmethod
+    def build(
+        cls,
+        matches: list[dict],
+        combined_scores: list[float],
+        *,
+        newest_complete: bool,
+        updated_complete: bool,
+        newest_floor: float = -math.inf,
+        updated_floor: float = -math.inf,
+        fetch_k: int = 200,
+        labels_in_filter: bool = False,
+    ) -> "RecentFeed":
+        """Index a list of matches (already de-duplicated, in semantic order)."""
+        metadata = [m["metadata"] for m in matches]
+        positions = range(len(matches))
+
+        orders = {
+            sort_by: sorted(positions, key=lambda i: metadata[i][key], reverse=True)
+            for sort_by, key in _SORT_KEYS.items()
+        }
+        orders["relevance"] = sorted(positions, key=lambda i: combined_scores[i], reverse=True)
+
+        by_language: dict[str, set[int]] = {}
+        by_label: dict[str, set[int]] = {}
+        unassigned: set[int] = set()
+        for i, meta in enumerate(metadata):
+            if meta.get("language"):
+                by_language.setdefault(meta["language"], set()).add(i)
+            for label in meta.get("labels", []):
+                by_label.setdefault(label.lower(), set()).add(i)
+            if not meta.get("is_assigned", False):
+                unassigned.add(i)
+
+        return cls(
+            matches=matches,
+            combined_scores=combined_scores,
+            created_ts=[meta.get("created_at_ts", 0) for meta in metadata],
+            updated_ts=[meta.get("updated_at_ts", 0) for meta in metadata],
+            orders=orders,
+            by_language=by_language,
+            by_label=by_label,
+            unassigned=unassigned,
+            newest_complete=newest_complete,
+            updated_complete=updated_complete,
+            newest_floor=newest_floor,
+            updated_floor=updated_floor,
+            fetch_k=fetch_k,
+            labels_in_filter=labels_in_filter,
+        )
+
+    def age_seconds(self) -> float:
+        return time.monotonic() - self.built_at
+
+    def query(
+        self,
+        *,
+        limit: int,
+        sort_by: str,
+        languages: list[str] | None,
+        labels: list[str] | None,
+        days_ago: float | None,
+        unassigned_only: bool,
+        now_ts: float,
+    ) -> list[tuple[dict, float]] | None:
+        """Answer a recent-issues request from memory.
+
+        Uses the same time windows as ``SearchEngine.get_recent_issues``.
+        Returns ``(match, combined_score)`` pairs, or ``None`` when the feed
+        cannot answer faithfully (window not covered, or fewer than
+        ``fetch_k`` filtered hits in a window that was truncated at refresh
+        time).
+        """
+        if days_ago:
+            if days_ago * 86400 > UPDATED_WINDOW_SECONDS:
+                return None
+            timestamps, cutoff = self.updated_ts, now_ts - days_ago * 86400
+            complete, floor = self.updated_complete, self.updated_floor
+        elif sort_by == "newest":
+            timestamps, cutoff = self.created_ts, now_ts - NEWEST_WINDOW_SECONDS
+            complete, floor = self.newest_complete, self.newest_floor
+        else:
+            timestamps, cutoff = self.updated_ts, now_ts - UPDATED_WINDOW_SECONDS
+            complete, floor = self.updated_complete, self.updated_floor
+
+        candidates: set[int] | None = None
+        if languages:
+            candidates = set().union(*(self.by_language.get(lang, set()) for lang in languages))
+        labelled: set[int] | None = None
+        if labels:
+            labelled = set().union(*(self.by_label.get(lbl.lower(), set()) for lbl in labels))
+            if self.labels_in_filter:
+                candidates = labelled if candidates is None else candidates & labelled
+                labelled = None
+        if unassigned_only:
+            candidates = set(self.unassigned) if candidates is None else candidates & self.unassigned
+
+        # The per-request query's result set: its first fetch_k filtered matches
+        fetched: set[int] = set()
+        for i, match in enumerate(self.matches):
+            if match["score"] < floor or len(fetched) == self.fetch_k:
+                break
+            if candidates is not None and i not in candidates:
+                continue
+            if timestamps[i] < cutoff:
+                continue
+            fetched.add(i)
+        if len(fetched) < self.fetch_k and not complete:
+            return None
+        if labelled is not None:
+            fetched &= labelled  # post-filtered after retrieval, as the query path does
+
+        picked = []
+        for i in self.orders.get(sort_by, self.orders["relevance"]):
+            if i in fetched:
+                picked.append(i)
+                if len(picked) == limit:
+                    break
+        return [(self.matches[i], self.combined_scores[i]) for i in picked]
@@ -0,0 +1,47 @@
+"""Per-request stage timers.
+
+``ServerTimingMiddleware`` opens a timing record for each request in a
+context variable; code on the request path wraps its stages in
+``stage("embed")`` etc. The middleware then reports the stages in a
+``Server-Timing`` header and records them as per-route latency series.
+Outside a request (warm-up, scripts) ``stage`` only times nothing.
+
+Tasks spawned by a request (speculative embedding, single-flight leaders)
+inherit the record, so their stages count towards the request that
+started them. Repeated stages (e.g. several vector-query rounds) add up.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_timings: ContextVar[dict[str, float] | None] = ContextVar("request_timings", default=None)
+
+
+def start_request() -> dict[str, float]:
+    """Begin collecting stage timings for the current request."""
+    timings: dict[str, float] = {}
+    _timings.set(timings)
+    return timings
+
+
+@contextmanager
+def stage(name: str):
+    """Time a block as stage ``name`` of the current request."""
+    timings = _timings.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = timings.get(name, 0.0) + (time.perf_counter() - start) * 1000
+
+
+def server_timing_header(timings: dict[str, float], total_ms: float | None = None) -> str:
+    """``Server-Timing`` value, e.g. ``parse;dur=12.3, embed;dur=40.1, total;dur=80.0``."""
+    parts = [f"{name};dur={ms:.1f}" for name, ms in timings.items()]
+    if total_ms is not None:
+        parts.append(f"total;dur={total_ms:.1f}")
+    return ", ".join(parts)
@@ -0,0 +1,156 @@
+"""Columnar re-ranking of Pinecone matches.
+
+The old per-match loop parsed ``updated_at`` with ``datetime.fromisoformat``,
+lower-cased topic/label lists in nested loops and built a full
+``SearchResult`` for every candidate before sorting. Here the ranking inputs
+are pulled into NumPy columns once and the combined score, masks and sort
+run as array operations. Only the ordering is returned, so callers build
+result objects for the rows they actually keep.
+
+Ranking is identical to the loop it replaces: same weights, same whole-day
+recency, scores rounded to 4 places, and ties keep Pinecone's order.
+"""
+
+from datetime import datetime
+
+import numpy as np
+
+# Constants for combined scoring
+MAX_STARS = 500000  # Normalize stars (e.g., max expected ~500k)
+MAX_AGE_DAYS = 365  # Issues older than this get 0 recency score
+
+# Weights (stars excluded from default ranking to remove popularity bias)
+SEMANTIC_WEIGHT = 0.70
+RECENCY_WEIGHT = 0.30
+STARS_WEIGHT = 0.00
+
+DEFAULT_RECENCY = 0.5  # used when a timestamp can't be determined
+
+
+def _parse_timestamp(value: str | None) -> float:
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except Exception:
+        return np.nan
+
+
+class _Columns:
+    """Ranking inputs of a batch of matches, extracted in a single pass."""
+
+    __slots__ = ("semantic", "updated_ts", "created_ts", "stars")
+
+    def __init__(self, matches: list[dict]):
+        semantic, updated, created, stars = [], [], [], []
+        for match in matches:
+            metadata = match["metadata"]
+            semantic.append(match["score"])
+            # Ingestion writes *_ts; older records may only have the ISO string
+            updated.append(metadata.get("updated_at_ts") or _parse_timestamp(metadata.get("updated_at")))
+            created.append(metadata.get("created_at_ts") or _parse_timestamp(metadata.get("created_at")))
+            stars.append(metadata.get("repo_stars", 0))
+        self.semantic = np.array(semantic, dtype=np.float64)
+        self.updated_ts = np.array(updated, dtype=np.float64)
+        self.created_ts = np.array(created, dtype=np.float64)
+        self.stars = np.array(stars, dtype=np.float64)
+
+
+def _membership_mask(matches: list[dict], key: str, wanted: list[str]) -> np.ndarray:
+    """True where the match's ``key`` list shares a value with ``wanted`` (case-insensitive)."""
+    wanted_lower = {w.lower() for w in wanted}
+    return np.fromiter(
+        (
+            not wanted_lower.isdisjoint(v.lower() for v in m["metadata"].get(key, []))
+            for m in matches
+        ),
+        dtype=bool,
+        count=len(matches),
+    )
+
+
+def combined_scores(matches: list[dict], now_ts: float) -> np.ndarray:
+    """Combined relevance/recency/popularity score for every match."""
+    return _combined(_Columns(matches), now_ts)
+
+
+def _combined(columns: _Columns, now_ts: float) -> np.ndarray:
+    """Weighted score over pre-extracted columns.
+
+    - 70% semantic relevance (Pinecone score)
+    - 30% recency (linear decay over MAX_AGE_DAYS, in whole days)
+    - 0% popularity
+    """
+    age_days = np.floor((now_ts - columns.updated_ts) / 86400)
+    recency = np.where(np.isnan(age_days), DEFAULT_RECENCY, np.maximum(0.0, 1 - age_days / MAX_AGE_DAYS))
+    stars_score = np.minimum(columns.stars / MAX_STARS, 1.0)
+
+    combined = SEMANTIC_WEIGHT * columns.semantic + RECENCY_WEIGHT * recency + STARS_WEIGHT * stars_score
+    return np.round(combined, 4)
+
+
+def top_k_desc(keys: np.ndarray, k: int | None = None) -> np.ndarray:
+    """Indices of the ``k`` largest keys, descending, ties in original order.
+
+    Uses ``argpartition`` when only a prefix is needed. Every element tied
+    with the k-th key is kept before the final stable sort, so the result
+    matches a full stable sort truncated to ``k``.
+    """
+    neg = -keys
+    n = len(keys)
+    if k is None or k >= n:
+        return np.argsort(neg, kind="stable")
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    kth = neg[np.argpartition(neg, k - 1)[k - 1]]
+    picked = np.flatnonzero(neg <= kth)
+    return picked[np.argsort(neg[picked], kind="stable")][:k]
+
+
+def rank(
+    matches: list[dict],
+    *,
+    now_ts: float,
+    sort_by: str | None = None,
+    topics: list[str] | None = None,
+    labels: list[str] | None = None,
+    limit: int | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Filter and order matches.
+
+    Args:
+        matches: Pinecone matches (``score`` + ``metadata``)
+        now_ts: Current Unix time, for recency
+        sort_by: "stars", "newest" (created_at), "recently_discussed"/"recency"
+            (updated_at); anything else sorts by combined score
+        topics: Keep matches whose repo has any of these topics
+        labels: Keep matches with any of these labels
+        limit: Only order the top ``limit`` rows
+
+    Returns:
+        ``(order, scores)``: indices into ``matches`` in rank order, and the
+        combined score of every match (indexed like ``matches``).
+    """
+    if not matches:
+        return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.float64)
+
+    columns = _Columns(matches)
+    scores = _combined(columns, now_ts)
+
+    if sort_by == "stars":
+        keys = columns.stars
+    elif sort_by == "newest":
+        keys = np.nan_to_num(columns.created_ts, nan=-np.inf)
+    elif sort_by in ("recency", "recently_discussed"):
+        keys = np.nan_to_num(columns.updated_ts, nan=-np.inf)
+    else:
+        keys = scores
+
+    keep = np.ones(len(matches), dtype=bool)
+    if topics:
+        keep &= _membership_mask(matches, "repo_topics", topics)
+    if labels:
+        keep &= _membership_mask(matches, "labels", labels)
+
+    if keep.all():
+        return top_k_desc(keys, limit), scores
+    kept = np.flatnonzero(keep)
+    return kept[top_k_desc(keys[kept], limit)], scores
@@ -0,0 +1,179 @@
+"""Deterministic keyword parser that answers simple queries without the LLM.
+
+Most homepage traffic is plain keyword queries such as
+"python good first issue unassigned". Every term in those maps directly
+onto the intent table in ``SYSTEM_PROMPT``, so the structured filters can
+be built locally in microseconds. Anything the tables don't explain is
+treated as ambiguous and left to Gemini.
+"""
+
+import re
+from dataclasses import dataclass, field
+
+from app.models.query import ParsedQuery
+
+# Query term -> canonical GitHub language name (matches Pinecone `language`)
+LANGUAGES = {
+    "python": "Python",
+    "javascript": "JavaScript",
+    "js": "JavaScript",
+    "typescript": "TypeScript",
+    "ts": "TypeScript",
+    "go": "Go",
+    "golang": "Go",
+    "rust": "Rust",
+    "java": "Java",
+    "c++": "C++",
+    "cpp": "C++",
+    "c#": "C#",
+    "csharp": "C#",
+    "php": "PHP",
+    "ruby": "Ruby",
+    "dart": "Dart",
+    "kotlin": "Kotlin",
+    "swift": "Swift",
+}
+
+# Phrase -> filter fields, mirroring the "User intent keywords" in SYSTEM_PROMPT
+INTENTS: dict[tuple[str, ...], dict] = {
+    ("good", "first", "issue"): {"labels": ["good first issue"], "difficulty": "beginner"},
+    ("good", "first", "issues"): {"labels": ["good first issue"], "difficulty": "beginner"},
+    ("first", "contribution"): {"labels": ["good first issue"], "difficulty": "beginner"},
+    ("first", "timers"): {"labels": ["good first issue"], "difficulty": "beginner"},
+    ("beginner", "friendly"): {"labels": ["good first issue"], "difficulty": "beginner"},
+    ("beginner-friendly",): {"labels": ["good first issue"], "difficulty": "beginner"},
+    ("beginner",): {"labels": ["good first issue"], "difficulty": "beginner"},
+    ("beginners",): {"labels": ["good first issue"], "difficulty": "beginner"},
+    ("easy",): {"labels": ["good first issue"], "difficulty": "beginner"},
+    ("starter",): {"labels": ["good first issue"], "difficulty": "beginner"},
+    ("help", "wanted"): {"labels": ["help wanted"]},
+    ("needs", "help"): {"labels": ["help wanted"]},
+    ("nobody", "working", "on"): {"unassigned_only": True},
+    ("not", "assigned"): {"unassigned_only": True},
+    ("unassigned",): {"unassigned_only": True},
+    ("unclaimed",): {"unassigned_only": True},
+    ("very", "popular"): {"min_stars": 5000},
+    ("popular",): {"min_stars": 1000},
+    ("famous",): {"min_stars": 1000},
+    ("trending",): {"min_stars": 500, "sort_by": "stars"},
+    ("this", "week"): {"days_ago": 7},
+    ("this", "month"): {"days_ago": 30},
+    ("today",): {"days_ago": 1},
+    ("recent",): {"days_ago": 7, "sort_by": "recently_discussed"},
+    ("latest",): {"days_ago": 7, "sort_by": "recently_discussed"},
+    ("new",): {"days_ago": 7, "sort_by": "recently_discussed"},
+    ("fresh",): {"days_ago": 7, "sort_by": "recently_discussed"},
+}
+
+# Phrase -> (repo topics, semantic query), from the SYSTEM_PROMPT examples
+TOPICS: dict[tuple[str, ...], tuple[list[str], str]] = {
+    ("machine", "learning"): (["machine-learning", "deep-learning", "ai"], "machine learning AI"),
+    ("ml",): (["machine-learning", "deep-learning", "ai"], "machine learning AI"),
+    ("cli",): (["cli", "command-line", "terminal"], "CLI command line tool"),
+    ("command", "line"): (["cli", "command-line", "terminal"], "CLI command line tool"),
+    ("blockchain",): (["blockchain"], "blockchain"),
+}
+
+# Words that carry no filter or semantic signal on their own
+FILLER = frozenset({
+    "a", "an", "the", "in", "on", "for", "with", "to", "of", "and", "or",
+    "that", "are", "is", "me", "i", "some", "any", "find", "show", "want",
+    "looking", "github", "open", "source", "open-source", "opensource",
+    "issue", "issues", "repo", "repos", "repository", "repositories",
+    "project", "projects", "contribution", "contributions", "contribute",
+    "contributors", "needing", "need", "task", "tasks", "opportunities",
+    "friendly", "language", "lang",
+})
+
+_TOKEN_RE = re.compile(r"[a-z0-9#+][a-z0-9#+\-]*")
+
+_MAX_PHRASE = max(len(p) for p in [*INTENTS, *TOPICS])
+
+
+@dataclass
+class RuleParseResult:
+    """Outcome of the rule-based pass."""
+
+    parsed: ParsedQuery
+    confidence: float  # share of query tokens the tables explained
+    matched: int = 0  # number of signal phrases found (fillers excluded)
+    leftover: list[str] = field(default_factory=list)
+
+
+class RuleBasedParser:
+    """Maps keyword queries onto ``ParsedQuery`` using fixed tables."""
+
+    def __init__(self, min_confidence: float = 1.0):
+        self.min_confidence = min_confidence
+
+    def parse(self, query: str) -> RuleParseResult:
+        """Extract filters from every token the tables recognise."""
+        tokens = _TOKEN_RE.findall(query.lower())
+        fields: dict = {}
+        labels: list[str] = []
+        topics: list[str] = []
+        topic_queries: list[str] = []
+        leftover: list[str] = []
+        matched = 0
+
+        i = 0
+        while i < len(tokens):
+            consumed = 0
+            for size in range(min(_MAX_PHRASE, len(tokens) - i), 0, -1):
+                phrase = tuple(tokens[i:i + size])
+                if phrase in INTENTS:
+                    for key, value in INTENTS[phrase].items():
+                        if key == "labels":
+                            labels.extend(v for v in value if v not in labels)
+                        else:
+                            fields[key] = value
+                    consumed = size
+                    break
+                if phrase in TOPICS:
+                    phrase_topics, phrase_query = TOPICS[phrase]
+                    topics.extend(t for t in phrase_topics if t not in topics)
+                    topic_queries.append(phrase_query)
+                    consumed = size
+                    break
+            if consumed:
+                matched += 1
+                i += consumed
+                continue
+
+            token = tokens[i]
+            if token in LANGUAGES:
+                fields["language"] = LANGUAGES[token]
+                matched += 1
+            elif token not in FILLER:
+                leftover.append(token)
+            i += 1
+
+        confidence = 1 - len(leftover) / len(tokens) if tokens else 0.0
+
+        semantic_parts = topic_queries + leftover
+        if not semantic_parts:
+            semantic_parts = [
+                "beginner friendly contributions"
+                if fields.get("difficulty") == "beginner"
+                else "open source contributions"
+            ]
+
+        parsed = ParsedQuery(
+            semantic_query=" ".join(semantic_parts),
+            labels=labels or None,
+            topics=topics or None,
+            **fields,
+        )
+        return RuleParseResult(
+            parsed=parsed,
+            confidence=round(confidence, 4),
+            matched=matched,
+            leftover=leftover,
+        )
+
+    def try_parse(self, query: str) -> RuleParseResult | None:
+        """Return a result only when it is confident enough to skip the LLM."""
+        result = self.parse(query)
+        if result.matched == 0 or result.confidence < self.min_confidence:
+            return None
+        return result
@@ -1,29 +1,96 @@
 """Search engine orchestrating query parsing, embedding, and Pinecone search."""
 
+import asyncio
 import logging
+import time
 from datetime import datetime, timedelta, timezone
 from fastapi.concurrency import run_in_threadpool
 
-from app.models.query import SearchQuery, SearchResult, ParsedQuery
+from app.config import get_settings
+from app.models.index_stats import IndexStats
+from app.models.query import SearchQuery, SearchResult, ParsedQuery, RecentFeedSpec
 from app.services.query_parser import QueryParser
 from app.services.embedder import EmbeddingService
 from app.services.pinecone_client import PineconeClient
+from app.services.search_metrics import search_metrics
+from app.services.search_snapshots import SearchSnapshotStore, query_fingerprint
+from app.services.semantic_cache import SemanticResultCache, ranking_key
+from app.services.single_flight import SingleFlight
+from app.services.request_timing import stage
+from app.services.recent_feed import RecentFeed, NEWEST_WINDOW_SECONDS, UPDATED_WINDOW_SECONDS
+from app.services import reranker
+from app.services.adaptive_fetch import SelectivityTracker, filter_shape, plan_top_k
+from app.services.candidates import Candidate, materialize
+from app.services.document_store import DocumentStore
+from app.services.local_index import LocalIndex, open_local_index
 
 logger = logging.getLogger(__name__)
 
-# Constants for combined scoring
-MAX_STARS = 500000  # Normalize stars (e.g., max expected ~500k)
-MAX_AGE_DAYS = 365  # Issues older than this get 0 recency score
+# Fixed semantic query behind the homepage / recent-issues feed
+RECENT_ISSUES_QUERY = "beginner friendly open source contributions help wanted"
+# top_k of the per-request recent-issues query (the feed reproduces its result set)
+RECENT_FETCH_K = 200
+
+
+def _token_overlap(a: str, b: str) -> float:
+    """Jaccard overlap of the lower-cased word sets of two queries."""
+    tokens_a = set(a.lower().split())
+    tokens_b = set(b.lower().split())
+    if not tokens_a or not tokens_b:
+        return 0.0
+    return len(tokens_a & tokens_b) / len(tokens_a | tokens_b)
 
 
 class SearchEngine:
     """Orchestrates the full search flow."""
     
     def __init__(self):
+        settings = get_settings()
         self.query_parser = QueryParser()
         self.embedder = EmbeddingService()
         self.pinecone = PineconeClient()
+        # Optional in-process replica that serves vector queries instead of Pinecone
+        self.local_index: LocalIndex | None = open_local_index()
+        self.parse_timeout = settings.query_parse_timeout_seconds
+        self.speculation_min_overlap = settings.speculative_embedding_min_overlap
+        self.snapshots = SearchSnapshotStore(
+            max_entries=settings.search_snapshot_max_entries,
+            ttl_seconds=settings.search_snapshot_ttl_seconds
+        )
+        self.semantic_cache = SemanticResultCache(
+            max_entries=settings.semantic_cache_size,
+            ttl_seconds=settings.semantic_cache_ttl_seconds,
+            threshold=settings.semantic_cache_threshold
+        ) if settings.enable_semantic_cache else None
+        self.recent_feed_enabled = settings.enable_recent_feed
+        self.recent_feed_ttl = settings.recent_feed_ttl_seconds
+        self.recent_feed_top_k = settings.recent_feed_top_k
+        self._recent_feed: RecentFeed | None = None
+        self._recent_feed_invalidated = False
+        self._recent_feed_task: asyncio.Task | None = None
+        self.index_stats_ttl = settings.index_stats_ttl_seconds
+        self.normalized_filters = settings.enable_normalized_filters
+        self.adaptive_fetch = settings.enable_adaptive_fetch
+        self.fetch_min_top_k = settings.search_fetch_min_top_k
+        self.fetch_max_top_k = settings.search_fetch_max_top_k
+        self.fetch_margin = settings.search_fetch_margin
+        self.selectivity = SelectivityTracker()
+        self._search_flight = SingleFlight("search")
+        self._recent_flight = SingleFlight("recent")
+        self.slim_metadata = settings.search_slim_metadata
+        self.documents = DocumentStore(
+            self.vector_index,
+            ranking_size=settings.document_store_ranking_size,
+            document_size=settings.document_store_size
+        )
+        self._index_stats: IndexStats | None = None
+        self._index_stats_read_at = 0.0
         
+    @property
+    def vector_index(self) -> PineconeClient | LocalIndex:
+        """Where vector queries go: the local replica when configured, else Pinecone."""
+        return self.local_index if self.local_index is not None else self.pinecone
+    
     async def search(self, query: SearchQuery) -> tuple[list[SearchResult], ParsedQuery]:
         """
         Execute a search query.
@@ -31,9 +98,51 @@ class SearchEngine:
         Returns:
             Tuple of (results, parsed_query) for transparency
         """
-        # 1. Parse natural language query
+        candidates, parsed, _ = await self.search_candidates(query)
+        await self.hydrate(candidates)
+        with stage("serialize"):
+            return materialize([c for c in candidates if c.full]), parsed
+    
+    async def search_candidates(self, query: SearchQuery) -> tuple[list[Candidate], ParsedQuery, bool]:
+        """
+        Execute a search query, returning ranked candidates.
+        
+        Callers hydrate and materialize only the rows they return (see ``Candidate``).
+        Identical concurrent searches (same fingerprint and fetch depth) share
+        one parse, embedding and vector query, and receive the same objects.
+        
+        Returns:
+            Tuple of (candidates, parsed_query, complete). ``complete`` is
+            False when the fetch stopped once ``query.page`` could be filled
+            and a deeper page would need a wider one.
+        """
+        key = (query_fingerprint(query), query.page * query.limit)
+        return await self._search_flight.do(key, lambda: self._search_candidates(query))
+    
+    async def _search_candidates(self, query: SearchQuery) -> tuple[list[Candidate], ParsedQuery, bool]:
+        parsed, speculative = await self.parse_search_query(query)
+        candidates, complete = await self.retrieve_candidates(query, parsed, speculative)
+        return candidates, parsed, complete
+    
+    async def parse_search_query(self, query: SearchQuery) -> tuple[ParsedQuery, asyncio.Task | None]:
+        """Parse ``query`` and apply its manual filters.
+        
+        Returns the parsed query and, when the LLM was consulted, the
+        speculative raw-text embedding task for ``retrieve_candidates``.
+        """
+        with stage("parse"):
+            return await self._parse_search_query(query)
+    
+    async def _parse_search_query(self, query: SearchQuery) -> tuple[ParsedQuery, asyncio.Task | None]:
+        # 1. Parse natural language query. Cache hits and keyword-only queries
+        # resolve locally; otherwise the LLM parse runs off the event loop with
+        # a deadline while the raw text is embedded speculatively in parallel.
         logger.info(f"Parsing query: {query.query}")
-        parsed = self.query_parser.parse(query.query)
+        speculative = None
+        parsed = self._parse_local(query.query)
+        if parsed is None:
+            speculative = asyncio.create_task(self._embed_speculatively(query.query))
+            parsed = await self._parse_remote(query.query)
         logger.info(f"Parsed query: {parsed}")
         
         # Override with manual filters if provided
@@ -54,29 +163,365 @@ class SearchEngine:
             parsed.unassigned_only = query.unassigned_only
             
         logger.info(f"Final query config (after manual overrides): {parsed}")
-        
-        # 2. Generate query embedding
-        query_embedding = await run_in_threadpool(
-            self.embedder.generate_query_embedding,
-            parsed.semantic_query
-        )
+        return parsed, speculative
+    
+    async def retrieve_candidates(
+        self,
+        query: SearchQuery,
+        parsed: ParsedQuery,
+        speculative: asyncio.Task | None = None
+    ) -> tuple[list[Candidate], bool]:
+        """Embed, filter, fetch and rank for an already parsed query."""
+        # 2. Generate query embedding (reusing the speculative one if it still fits)
+        with stage("embed"):
+            query_embedding = await self._resolve_query_embedding(
+                parsed.semantic_query, query.query, speculative
+            )
         
         # 3. Build Pinecone filter
-        pinecone_filter = self._build_filter(parsed)
+        with stage("filter"):
+            pinecone_filter = self._build_filter(parsed)
         logger.info(f"Pinecone filter: {pinecone_filter}")
+        pinecone_filter = pinecone_filter if pinecone_filter else None
+        need = query.page * query.limit
         
-        # 4. Search Pinecone - get more results for re-reranking
-        raw_results = await run_in_threadpool(
-            self.pinecone.search,
-            query_embedding=query_embedding,
-            top_k=100,  # Get more for combined scoring
-            filter_dict=pinecone_filter if pinecone_filter else None
+        # A near-identical query with the same filters was ranked recently
+        if self.semantic_cache is not None:
+            key = ranking_key({
+                **parsed.model_dump(exclude={"semantic_query"}),
+                "normalized_filters": self.normalized_filters,
+            })
+            cached = self.semantic_cache.get(query_embedding, key, need)
+            if cached is not None:
+                return cached
+            generation = self.semantic_cache.generation
+        
+        # 4-5. Search Pinecone (sized to the requested page) and rank with combined scoring
+        candidates, complete = await self._fetch_candidates(
+            query_embedding,
+            pinecone_filter,
+            parsed,
+            need=need
         )
         
-        # 5. Convert to SearchResult with combined scoring
-        results = self._process_results(raw_results, parsed)
+        if self.semantic_cache is not None:
+            self.semantic_cache.set(query_embedding, key, candidates, complete, generation)
+        return candidates, complete
+    
+    async def _fetch_candidates(
+        self,
+        query_embedding: list[float],
+        pinecone_filter: dict | None,
+        parsed: ParsedQuery,
+        need: int
+    ) -> tuple[list[Candidate], bool]:
+        """Fetch and rank until ``need`` candidates survive post-filtering.
+        
+        The first top_k comes from the page size and the recent selectivity
+        of this filter shape. Later rounds widen it (at least doubling) up to
+        ``fetch_max_top_k``. Pinecone has no offset, so each round re-fetches
+        the earlier matches; those count as wasted.
+        """
+        ceiling = self.fetch_max_top_k
+        shape = filter_shape(None if self.normalized_filters else parsed.topics)
+        if self.adaptive_fetch:
+            top_k = plan_top_k(
+                need, self.selectivity.estimate(shape),
+                margin=self.fetch_margin, floor=self.fetch_min_top_k, ceiling=ceiling
+            )
+        else:
+            top_k = ceiling
+        
+        rounds = 0
+        fetched = 0
+        while True:
+            with stage("vector_query"):
+                raw_results = await self.vector_index.asearch(
+                    query_embedding=query_embedding,
+                    top_k=top_k,
+                    filter_dict=pinecone_filter,
+                    include_metadata=not self.slim_metadata
+                )
+            # Counted before slim mode drops matches whose metadata is gone
+            matched = len(raw_results)
+            exhausted = matched < top_k  # nothing more matches the filter
+            if self.slim_metadata:
+                with stage("ranking_metadata"):
+                    raw_results = await self._attach_ranking_metadata(raw_results)
+            rounds += 1
+            fetched += matched
+            with stage("rerank"):
+                candidates = self._rank_candidates(raw_results, parsed)
+            
+            if len(candidates) >= need or exhausted or top_k >= ceiling:
+                break
+            observed = len(candidates) / matched
+            top_k = plan_top_k(
+                need, observed,
+                margin=self.fetch_margin, floor=min(top_k * 2, ceiling), ceiling=ceiling
+            )
+        
+        self.selectivity.observe(shape, matched, len(candidates))
+        search_metrics.incr("fetch.searches")
+        search_metrics.incr("fetch.rounds", rounds)
+        search_metrics.incr("fetch.fetched", fetched)
+        search_metrics.incr("fetch.wasted", fetched - min(len(candidates), need))
+        if rounds > 1:
+            search_metrics.incr("fetch.widened")
+        if top_k >= ceiling and len(candidates) < need and not exhausted:
+            search_metrics.incr("fetch.ceiling_hit")
+        
+        return candidates, exhausted or top_k >= ceiling
+    
+    async def _attach_ranking_metadata(self, raw_results: list[dict]) -> list[dict]:
+        """Fill ID/score-only matches with ranking fields from the document store.
+        
+        Matches whose metadata can't be found (deleted since the query) are dropped.
+        """
+        metadata = await self.documents.ranking_metadata([m["id"] for m in raw_results])
+        return [
+            {"id": m["id"], "score": m["score"], "metadata": metadata[m["id"]]}
+            for m in raw_results
+            if m["id"] in metadata
+        ]
+    
+    async def hydrate(self, candidates: list[Candidate]) -> None:
+        """Swap slim candidates' ranking fields for full documents, in place.
+        
+        Candidates whose document is gone stay ``full=False`` and should be skipped.
+        """
+        slim = [c for c in candidates if not c.full]
+        if not slim:
+            return
+        with stage("hydrate"):
+            documents = await self.documents.documents([c.id for c in slim])
+        for candidate in slim:
+            document = documents.get(candidate.id)
+            if document is not None:
+                candidate.metadata = document
+                candidate.full = True
+    
+    async def warm_up(self) -> None:
+        """Precompute constant embeddings and build the recent feed. Safe to run in the background."""
+        try:
+            await run_in_threadpool(
+                self.embedder.precompute_query_embeddings,
+                [RECENT_ISSUES_QUERY]
+            )
+        except Exception as e:
+            logger.warning(f"Search warm-up failed, embeddings will be computed on demand: {e}")
+        # A request may already have built the feed, or be building it
+        if self._fresh_recent_feed() is None and self._recent_feed_task is not None:
+            await self._recent_feed_task
+    
+    def invalidate_index_caches(self) -> None:
+        """Drop per-worker copies of index data after the index changed."""
+        self.invalidate_recent_feed()
+        self.documents.invalidate()
+        if self.semantic_cache is not None:
+            self.semantic_cache.invalidate()
+    
+    def invalidate_recent_feed(self) -> None:
+        """Mark the recent feed stale (e.g. after ingestion). Rebuilt on next request."""
+        self._recent_feed_invalidated = True
+    
+    async def get_index_stats(self) -> IndexStats | None:
+        """Stats record written by ingestion/cleanup, cached for ``index_stats_ttl``.
+        
+        A new generation means the index changed out-of-process, so the
+        per-worker index caches are invalidated. Returns None if no record
+        exists yet.
+        """
+        if self._index_stats is not None and time.monotonic() - self._index_stats_read_at < self.index_stats_ttl:
+            return self._index_stats
+        try:
+            metadata = await run_in_threadpool(self.pinecone.get_stats_record)
+        except Exception as e:
+            logger.warning(f"Failed to read index stats record: {e}")
+            return self._index_stats
+        self._index_stats_read_at = time.monotonic()
+        if not metadata:
+            return self._index_stats
+        stats = IndexStats.from_metadata(metadata)
+        previous = self._index_stats
+        if previous is not None and stats.generation != previous.generation:
+            logger.info(f"Index stats generation {previous.generation} -> {stats.generation}, invalidating index caches")
+            self.invalidate_index_caches()
+        self._index_stats = stats
+        return stats
+    
+    async def recent_issues_version(self) -> tuple | None:
+        """Validator for recent-issues responses: index generation plus feed TTL window.
+        
+        The feed's time windows slide, so a response is only reused within
+        one ``recent_feed_ttl`` period of an unchanged index. None when
+        there is no stats record to version against.
+        """
+        stats = await self.get_index_stats()
+        if stats is None:
+            return None
+        return (stats.generation, int(time.time() // self.recent_feed_ttl))
+    
+    def _fresh_recent_feed(self) -> RecentFeed | None:
+        """Current feed if it can serve requests; schedules a rebuild when it can't."""
+        if not self.recent_feed_enabled:
+            return None
+        feed = self._recent_feed
+        if feed is not None and not self._recent_feed_invalidated and feed.age_seconds() < self.recent_feed_ttl:
+            return feed
+        self._refresh_recent_feed_once()
+        return None
+    
+    def _refresh_recent_feed_once(self) -> asyncio.Task:
+        """The running feed rebuild, or a new one; startup and requests share it."""
+        if self._recent_feed_task is None or self._recent_feed_task.done():
+            self._recent_feed_task = asyncio.create_task(self.refresh_recent_feed())
+        return self._recent_feed_task
+    
+    async def refresh_recent_feed(self) -> None:
+        """Rebuild the recent feed from Pinecone (both time windows, one embedding)."""
+        start = time.perf_counter()
+        # Cleared up front so an invalidation during the rebuild triggers another one
+        self._recent_feed_invalidated = False
+        try:
+            query_embedding = await self.embedder.agenerate_query_embedding(RECENT_ISSUES_QUERY)
+            now_ts = datetime.now(timezone.utc).timestamp()
+            newest_matches, updated_matches = await asyncio.gather(
+                self.vector_index.asearch(
+                    query_embedding=query_embedding,
+                    top_k=self.recent_feed_top_k,
+                    filter_dict={
+                        "type": {"$ne": "stats"},
+                        "created_at_ts": {"$gte": int(now_ts - NEWEST_WINDOW_SECONDS)}
+                    }
+                ),
+                self.vector_index.asearch(
+                    query_embedding=query_embedding,
+                    top_k=self.recent_feed_top_k,
+                    filter_dict={
+                        "type": {"$ne": "stats"},
+                        "updated_at_ts": {"$gte": int(now_ts - UPDATED_WINDOW_SECONDS)}
+                    }
+                )
+            )
+        except Exception as e:
+            logger.warning(f"Recent feed refresh failed, serving from Pinecone: {e}")
+            search_metrics.incr("recent_feed.refresh_error")
+            return
+        
+        # Merge both windows back into one semantic ordering
+        merged = {m["id"]: m for m in newest_matches}
+        for m in updated_matches:
+            merged.setdefault(m["id"], m)
+        matches = sorted(merged.values(), key=lambda m: m["score"], reverse=True)
+        combined_scores = reranker.combined_scores(matches, now_ts).tolist()
         
-        return results, parsed
+        self._recent_feed = RecentFeed.build(
+            matches,
+            combined_scores,
+            newest_complete=len(newest_matches) < self.recent_feed_top_k,
+            updated_complete=len(updated_matches) < self.recent_feed_top_k,
+            newest_floor=self._window_floor(newest_matches),
+            updated_floor=self._window_floor(updated_matches),
+            fetch_k=RECENT_FETCH_K,
+            labels_in_filter=self.normalized_filters
+        )
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        search_metrics.incr("recent_feed.refresh")
+        search_metrics.observe_ms("recent_feed.refresh", elapsed_ms)
+        logger.info(f"Recent feed rebuilt with {len(matches)} issues in {elapsed_ms:.0f}ms")
+    
+    def _window_floor(self, matches: list[dict]) -> float:
+        """Lowest score of a window query that hit top_k (matches below it were cut off)."""
+        if len(matches) < self.recent_feed_top_k:
+            return float("-inf")
+        return min(m["score"] for m in matches)
+    
+    def single_flight_stats(self) -> dict:
+        """In-flight and coalesced call counts per coalescing point."""
+        return {
+            flight.name: flight.stats()
+            for flight in (self._search_flight, self._recent_flight, self.embedder.embed_flight)
+        }
+    
+    def recent_feed_stats(self) -> dict:
+        """Size and age of the materialized recent feed."""
+        feed = self._recent_feed
+        if feed is None:
+            return {"enabled": self.recent_feed_enabled, "size": 0, "age_seconds": None}
+        return {
+            "enabled": self.recent_feed_enabled,
+            "size": len(feed.matches),
+            "age_seconds": round(feed.age_seconds(), 1),
+            "invalidated": self._recent_feed_invalidated,
+            "newest_complete": feed.newest_complete,
+            "updated_complete": feed.updated_complete,
+        }
+    
+    def _parse_local(self, text: str) -> ParsedQuery | None:
+        """Memory-cache hits and keyword-only queries, answered without any I/O."""
+        start = time.perf_counter()
+        parsed = self.query_parser.parse_local(text)
+        if parsed is not None:
+            search_metrics.observe_ms("parse", (time.perf_counter() - start) * 1000)
+        return parsed
+    
+    async def _parse_remote(self, text: str) -> ParsedQuery:
+        """Parse a query via Gemini, falling back to the raw text on timeout.
+        
+        The fallback keeps the search going: manual filters are still applied
+        by the caller and the raw text becomes the semantic query. A parse
+        that misses the deadline is cancelled, freeing its connection.
+        """
+        start = time.perf_counter()
+        try:
+            parsed = await asyncio.wait_for(
+                self.query_parser.aparse_remote(text),
+                timeout=self.parse_timeout
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"Query parse exceeded {self.parse_timeout}s, using raw query: {text}")
+            search_metrics.incr("parse.timeout")
+            search_metrics.incr("parse.fallback")
+            parsed = ParsedQuery(semantic_query=text)
+        except Exception as e:
+            logger.error(f"Query parse failed, using raw query: {e}")
+            search_metrics.incr("parse.fallback")
+            parsed = ParsedQuery(semantic_query=text)
+        
+        search_metrics.observe_ms("parse", (time.perf_counter() - start) * 1000)
+        return parsed
+    
+    async def _embed_speculatively(self, raw_query: str) -> list[float]:
+        """Embed the raw query text while the LLM parse is still in flight."""
+        return await self.embedder.agenerate_query_embedding(raw_query)
+    
+    async def _resolve_query_embedding(
+        self,
+        semantic_query: str,
+        raw_query: str,
+        speculative: asyncio.Task | None
+    ) -> list[float]:
+        """Use the speculative raw-query embedding when the parse kept the same text.
+        
+        Otherwise the speculation is cancelled and the parsed semantic query
+        is embedded.
+        """
+        if speculative is not None:
+            if _token_overlap(semantic_query, raw_query) >= self.speculation_min_overlap:
+                try:
+                    embedding = await speculative
+                    search_metrics.incr("speculation.hit")
+                    return embedding
+                except Exception as e:
+                    logger.warning(f"Speculative embedding failed, embedding parsed query: {e}")
+            else:
+                speculative.cancel()
+                # Retrieve any exception so asyncio doesn't log it as unhandled
+                speculative.add_done_callback(lambda t: t.cancelled() or t.exception())
+            search_metrics.incr("speculation.miss")
+        
+        return await self.embedder.agenerate_query_embedding(semantic_query)
     
     async def get_recent_issues(
         self, 
@@ -100,19 +545,178 @@ class SearchEngine:
             labels: Filter by issue labels (list)
             days_ago: Filter by issues updated within N days
             unassigned_only: Only show unassigned issues
+        
+        Served from the materialized recent feed when it is fresh; Pinecone is
+        only queried when the feed is stale, cold or can't cover the request.
         """
-        # Use a generic query embedding for "open source contributions"
-        try:
-            query_embedding = await run_in_threadpool(
-                self.embedder.generate_query_embedding,
-                "beginner friendly open source contributions help wanted"
+        feed = self._fresh_recent_feed()
+        if feed is not None:
+            with stage("feed"):
+                served = feed.query(
+                    limit=limit,
+                    sort_by=sort_by,
+                    languages=languages,
+                    labels=labels,
+                    days_ago=days_ago,
+                    unassigned_only=unassigned_only,
+                    now_ts=datetime.now(timezone.utc).timestamp()
+                )
+            if served is not None:
+                search_metrics.incr("recent_feed.hit")
+                with stage("serialize"):
+                    return [Candidate.from_match(match, score).to_result() for match, score in served]
+        search_metrics.incr("recent_feed.miss")
+        
+        # Identical concurrent misses (a homepage burst) share one upstream query
+        key = (
+            limit,
+            sort_by,
+            tuple(sorted(set(languages))) if languages else None,
+            tuple(sorted(set(labels))) if labels else None,
+            days_ago,
+            unassigned_only
+        )
+        results = await self._recent_flight.do(key, lambda: self._query_recent_issues(
+            limit, sort_by, languages, labels, days_ago, unassigned_only
+        ))
+        return list(results)
+    
+    async def _query_recent_issues(
+        self,
+        limit: int,
+        sort_by: str,
+        languages: list[str] | None,
+        labels: list[str] | None,
+        days_ago: float | None,
+        unassigned_only: bool
+    ) -> list[SearchResult]:
+        """Embed the generic query and fetch the recent feed page from the vector index."""
+        query_embedding = await self._recent_query_embedding()
+        
+        with stage("filter"):
+            filter_dict, post_filter_labels = self._build_recent_filter(
+                sort_by, languages, labels, days_ago, unassigned_only
             )
+        
+        # Fetch more to account for re-sorting (and label post-filtering when it runs here)
+        with stage("vector_query"):
+            raw_results = await self.vector_index.asearch(
+                query_embedding=query_embedding,
+                top_k=RECENT_FETCH_K,
+                filter_dict=filter_dict
+            )
+        
+        # Combined scoring, remaining post-filter and sort in one columnar pass
+        with stage("rerank"):
+            order, scores = reranker.rank(
+                raw_results,
+                now_ts=datetime.now(timezone.utc).timestamp(),
+                sort_by=sort_by,
+                labels=post_filter_labels,
+                limit=limit
+            )
+        
+        with stage("serialize"):
+            return [Candidate.from_match(raw_results[i], float(scores[i])).to_result() for i in order]
+    
+    async def _recent_query_embedding(self) -> list[float]:
+        """Embedding of the generic "open source contributions" query."""
+        try:
+            with stage("embed"):
+                return await self.embedder.agenerate_query_embedding(RECENT_ISSUES_QUERY)
         except Exception as e:
             logger.warning(f"Failed to generate generic embedding for recent issues: {e}. Falling back to zero-vector.")
             # Fallback to zero vector - this disables semantic search part effectively
             # (dot product will be 0) but allows metadata filtering to work
-            query_embedding = [0.0] * self.embedder.dimension
+            return [0.0] * self.embedder.dimension
+    
+    async def get_recent_feeds(self, specs: list[RecentFeedSpec]) -> list[list[SearchResult]]:
+        """Several recent feeds (homepage tabs) from one shared retrieval.
+        
+        Feeds the materialized recent feed can answer are served from it.
+        The rest share one embedding and one vector query over the union of
+        their filters; the matches are indexed as a throwaway ``RecentFeed``
+        and each feed is filtered and sorted from it locally. A feed the
+        shared window can't answer faithfully (too few hits in a truncated
+        window) falls back to its own ``get_recent_issues`` query.
+        """
+        search_metrics.incr("recent_batch.feeds", len(specs))
+        now_ts = datetime.now(timezone.utc).timestamp()
+        results: list[list[SearchResult] | None] = [None] * len(specs)
+        
+        feed = self._fresh_recent_feed()
+        if feed is not None:
+            with stage("feed"):
+                for i, spec in enumerate(specs):
+                    served = feed.query(**spec.model_dump(), now_ts=now_ts)
+                    if served is not None:
+                        search_metrics.incr("recent_feed.hit")
+                        results[i] = [Candidate.from_match(match, score).to_result() for match, score in served]
+        
+        missing = [i for i, found in enumerate(results) if found is None]
+        if len(missing) > 1:
+            shared = await self._shared_recent_feed([specs[i] for i in missing], now_ts)
+            with stage("feed"):
+                for i in missing:
+                    served = shared.query(**specs[i].model_dump(), now_ts=now_ts)
+                    if served is not None:
+                        results[i] = [Candidate.from_match(match, score).to_result() for match, score in served]
+            missing = [i for i in missing if results[i] is None]
+        
+        if missing:
+            search_metrics.incr("recent_batch.fallback", len(missing))
+            fallback = await asyncio.gather(*(
+                self.get_recent_issues(**specs[i].model_dump()) for i in missing
+            ))
+            for i, found in zip(missing, fallback):
+                results[i] = found
+        return results
+    
+    async def _shared_recent_feed(self, specs: list[RecentFeedSpec], now_ts: float) -> RecentFeed:
+        """One vector query covering every spec's filter, indexed for local fan-out."""
+        search_metrics.incr("recent_batch.shared_query")
+        query_embedding = await self._recent_query_embedding()
+        
+        with stage("filter"):
+            filters = []
+            for spec in specs:
+                filter_dict, _ = self._build_recent_filter(
+                    spec.sort_by, spec.languages, spec.labels, spec.days_ago, spec.unassigned_only
+                )
+                if filter_dict not in filters:
+                    filters.append(filter_dict)
+            filter_dict = filters[0] if len(filters) == 1 else {"$or": filters}
+        
+        with stage("vector_query"):
+            matches = await self.vector_index.asearch(
+                query_embedding=query_embedding,
+                top_k=self.recent_feed_top_k,
+                filter_dict=filter_dict
+            )
         
+        with stage("rerank"):
+            complete = len(matches) < self.recent_feed_top_k
+            floor = self._window_floor(matches)
+            return RecentFeed.build(
+                matches,
+                reranker.combined_scores(matches, now_ts).tolist(),
+                newest_complete=complete,
+                updated_complete=complete,
+                newest_floor=floor,
+                updated_floor=floor,
+                fetch_k=RECENT_FETCH_K,
+                labels_in_filter=self.normalized_filters
+            )
+    
+    def _build_recent_filter(
+        self,
+        sort_by: str,
+        languages: list[str] | None,
+        labels: list[str] | None,
+        days_ago: float | None,
+        unassigned_only: bool
+    ) -> tuple[dict, list[str] | None]:
+        """Pinecone filter for the recent feed, plus the labels left to post-filter."""
         # Build filter dict
         filter_dict = {
             "type": {"$ne": "stats"}  # Exclude administrative records
@@ -142,89 +746,43 @@ class SearchEngine:
             else:
                 filter_dict["language"] = {"$in": languages}
         
-        raw_results = await run_in_threadpool(
-            self.pinecone.search,
-            query_embedding=query_embedding,
-            top_k=200,  # Fetch more to account for filtering
-            filter_dict=filter_dict
-        )
-        
-        # Process results
-        results = []
-        now = datetime.now(timezone.utc)
+        # Label filter: server-side when normalized fields exist, else after retrieval
+        post_filter_labels = labels
+        if labels and self.normalized_filters:
+            filter_dict["labels_norm"] = {"$in": [lbl.lower() for lbl in labels]}
+            post_filter_labels = None
         
-        for match in raw_results:
-            metadata = match["metadata"]
-            
-            # Label filter (done in Python since Pinecone doesn't support array contains)
-            if labels:
-                issue_labels = metadata.get("labels", [])
-                if not any(lbl.lower() in [l.lower() for l in issue_labels] for lbl in labels):
-                    continue
-            
-            result = self._create_result(match)
-            
-            # Calculate combined score for display
-            result.score = self._calculate_combined_score(
-                semantic_score=match["score"],
-                stars=metadata["repo_stars"],
-                updated_at=metadata["updated_at"],
-                now=now
-            )
-            results.append(result)
-        
-        # Sort based on user preference
-        if sort_by == "newest":
-            # Newly created issues first (by created_at timestamp)
-            results.sort(key=lambda x: x.created_at, reverse=True)
-        elif sort_by == "recently_discussed":
-            # Recently updated/commented issues first (by updated_at timestamp)
-            results.sort(key=lambda x: x.updated_at, reverse=True)
-        elif sort_by == "stars":
-            # Sort by stars (popularity)
-            results.sort(key=lambda x: x.repo_stars, reverse=True)
-        else:
-            # Default: combined score (relevance)
-            results.sort(key=lambda x: x.score, reverse=True)
-        
-        return results[:limit]
+        return filter_dict, post_filter_labels
     
-    def _calculate_combined_score(
+    async def facets(
         self,
-        semantic_score: float,
-        stars: int,
-        updated_at: str,
-        now: datetime
-    ) -> float:
-        """Calculate combined score factoring in relevance, recency, and popularity.
-        
-        Weights:
-        - 40% semantic relevance (Pinecone score)
-        - 35% recency (newer is better)
-        - 25% popularity (more stars is better)
-        """
-        # Normalize stars (0-1)
-        stars_score = min(stars / MAX_STARS, 1.0)
+        fields: list[str],
+        limit: int | None = None,
+        sort_by: str = "recently_discussed",
+        languages: list[str] | None = None,
+        labels: list[str] | None = None,
+        days_ago: float | None = None,
+        unassigned_only: bool = False
+    ) -> dict | None:
+        """Match count and per-value counts under the same filter as ``get_recent_issues``.
         
-        # Calculate recency score (0-1, newer is higher)
-        try:
-            updated = datetime.fromisoformat(updated_at.replace('Z', '+00:00'))
-            age_days = (now - updated).days
-            recency_score = max(0, 1 - (age_days / MAX_AGE_DAYS))
-        except:
-            recency_score = 0.5  # Default if parsing fails
-        
-        # Updated weights (User Request: Remove star bias by default)
-        # - 70% semantic relevance 
-        # - 30% recency
-        # - 0% popularity (stars excluded from default ranking)
-        combined = (
-            0.70 * semantic_score +
-            0.30 * recency_score +
-            0.00 * stars_score
+        Computed from the local replica's filter bitmaps without a vector
+        query; None when search is served by Pinecone, which has no facets.
+        There is no post-filter step, so labels always go in as ``labels_norm``.
+        """
+        if self.local_index is None:
+            return None
+        filter_dict, _ = self._build_recent_filter(
+            sort_by, languages, labels, days_ago, unassigned_only
+        )
+        if labels:
+            filter_dict["labels_norm"] = {"$in": [lbl.lower() for lbl in labels]}
+        return await run_in_threadpool(
+            self.local_index.facets,
+            filter_dict,
+            fields,
+            limit
         )
-        
-        return round(combined, 4)
     
     def _build_filter(self, parsed: ParsedQuery) -> dict | None:
         """Build Pinecone filter from parsed query."""
@@ -250,7 +808,7 @@ class SearchEngine:
                 "repo_stars": {"$lte": parsed.max_stars}
             })
             
-        # Label filters
+        # Label filters (other labels are ranking hints only, never a hard filter)
         if parsed.labels:
             for label in parsed.labels:
                 label_lower = label.lower()
@@ -259,6 +817,12 @@ class SearchEngine:
                 elif label_lower == "help wanted":
                     conditions.append({"is_help_wanted": {"$eq": True}})
         
+        # Topic filter (otherwise applied after retrieval by the reranker)
+        if parsed.topics and self.normalized_filters:
+            conditions.append({
+                "topics_norm": {"$in": [t.lower() for t in parsed.topics]}
+            })
+        
         # Unassigned filter
         if parsed.unassigned_only:
             conditions.append({
@@ -289,74 +853,22 @@ class SearchEngine:
             
         return {"$and": conditions}
     
-    def _create_result(self, match: dict) -> SearchResult:
-        """Create a SearchResult from a Pinecone match."""
-        metadata = match["metadata"]
-        return SearchResult(
-            issue_id=metadata["issue_id"],
-            issue_number=metadata["issue_number"],
-            title=metadata["title"],
-            body=metadata.get("body"),
-            repo_name=metadata["repo_name"],
-            repo_full_name=metadata["repo_full_name"],
-            repo_stars=metadata["repo_stars"],
-            repo_forks=metadata["repo_forks"],
-            language=metadata.get("language"),
-            labels=metadata.get("labels", []),
-            created_at=metadata["created_at"],
-            updated_at=metadata["updated_at"],
-            comments_count=metadata["comments_count"],
-            issue_url=metadata["issue_url"],
-            repo_url=metadata["repo_url"],
-            score=match["score"],
-            is_assigned=metadata.get("is_assigned", False),
-            assignees_count=metadata.get("assignees_count", 0),
-            has_claimer=metadata.get("has_claimer", False),
-            repo_description=metadata.get("repo_description"),
-            repo_topics=metadata.get("repo_topics", []),
-            repo_license=metadata.get("repo_license")
-        )
-    
-    def _process_results(
+    def _rank_candidates(
         self, 
         raw_results: list[dict], 
         parsed: ParsedQuery
-    ) -> list[SearchResult]:
+    ) -> list[Candidate]:
         """Process and sort raw Pinecone results with combined scoring."""
-        results = []
-        now = datetime.now(timezone.utc)
-        
-        for match in raw_results:
-            metadata = match["metadata"]
-            
-            # Post-filter by topics if specified
-            if parsed.topics:
-                repo_topics = metadata.get("repo_topics", [])
-                topic_match = any(
-                    topic.lower() in [t.lower() for t in repo_topics]
-                    for topic in parsed.topics
-                )
-                if not topic_match:
-                    continue
-            
-            result = self._create_result(match)
-            
-            # Calculate combined score
-            result.score = self._calculate_combined_score(
-                semantic_score=match["score"],
-                stars=metadata["repo_stars"],
-                updated_at=metadata["updated_at"],
-                now=now
-            )
-            results.append(result)
+        order, scores = reranker.rank(
+            raw_results,
+            now_ts=datetime.now(timezone.utc).timestamp(),
+            # Search has no created_at window, so "newest" ranks by relevance here
+            sort_by=None if parsed.sort_by == "newest" else parsed.sort_by,
+            # Post-filter by repo topics unless Pinecone already did
+            topics=None if self.normalized_filters else parsed.topics
+        )
         
-        # Apply sorting based on parsed preference
-        if parsed.sort_by == "stars":
-            results.sort(key=lambda x: x.repo_stars, reverse=True)
-        elif parsed.sort_by == "recency":
-            results.sort(key=lambda x: x.updated_at, reverse=True)
-        else:
-            # "relevance" now uses combined score
-            results.sort(key=lambda x: x.score, reverse=True)
-            
-        return results
+        return [
+            Candidate.from_match(raw_results[i], float(scores[i]), full=not self.slim_metadata)
+            for i in order
+        ]
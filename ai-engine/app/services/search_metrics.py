@@ -0,0 +1,126 @@
+"""In-process counters and latency aggregates for the search path.
+
+Numbers are per worker process and reset on restart. They exist so we can
+see parse timeouts, fallbacks and cache behaviour without shipping logs
+somewhere first.
+
+Latency series also keep a log-bucketed histogram (buckets 10% apart from
+0.05ms to 2 minutes), so p50/p95/p99 are reported with bounded error and
+constant memory per series.
+"""
+
+import bisect
+import threading
+from collections import defaultdict
+
+# Histogram bucket upper bounds in ms, each 1.1x the previous
+_BUCKET_GROWTH = 1.1
+_BUCKETS_MS: list[float] = []
+_bound = 0.05
+while _bound < 120_000:
+    _BUCKETS_MS.append(_bound)
+    _bound *= _BUCKET_GROWTH
+PERCENTILES = (50, 95, 99)
+
+
+def _percentile(buckets: list[int], count: int, pct: float, max_ms: float) -> float:
+    """Upper bound of the bucket holding the ``pct``-th percentile sample."""
+    rank = pct / 100 * count
+    seen = 0
+    for index, n in enumerate(buckets):
+        seen += n
+        if seen >= rank and n:
+            return min(_BUCKETS_MS[index], max_ms) if index < len(_BUCKETS_MS) else max_ms
+    return max_ms
+
+
+class SearchMetrics:
+    """Thread-safe counters and latency aggregates.
+
+    Parsing and embedding run in worker threads, so every update goes
+    through a lock.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: dict[str, int] = defaultdict(int)
+        # name -> [count, total_ms, max_ms]
+        self._latencies: dict[str, list[float]] = {}
+        # name -> sample count per bucket (last slot: above the largest bound)
+        self._histograms: dict[str, list[int]] = {}
+
+    def incr(self, name: str, value: int = 1) -> None:
+        """Increment a counter."""
+        with self._lock:
+            self._counters[name] += value
+
+    def observe_ms(self, name: str, elapsed_ms: float) -> None:
+        """Record a latency sample in milliseconds."""
+        bucket = bisect.bisect_left(_BUCKETS_MS, elapsed_ms)
+        with self._lock:
+            stats = self._latencies.get(name)
+            if stats is None:
+                self._latencies[name] = [1, elapsed_ms, elapsed_ms]
+                self._histograms[name] = [0] * (len(_BUCKETS_MS) + 1)
+            else:
+                stats[0] += 1
+                stats[1] += elapsed_ms
+                stats[2] = max(stats[2], elapsed_ms)
+            self._histograms[name][bucket] += 1
+
+    def count(self, name: str) -> int:
+        """Current value of a counter."""
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def mean_ms(self, name: str) -> float | None:
+        """Mean of a latency series, or None if nothing was recorded."""
+        with self._lock:
+            stats = self._latencies.get(name)
+            if not stats:
+                return None
+            return stats[1] / stats[0]
+
+    def ratio(self, hits: str, misses: str) -> float | None:
+        """hits / (hits + misses) for a pair of counters, or None if both are zero."""
+        with self._lock:
+            total = self._counters.get(hits, 0) + self._counters.get(misses, 0)
+            return round(self._counters.get(hits, 0) / total, 4) if total else None
+
+    def snapshot(self) -> dict:
+        """JSON-safe copy of all counters and latency aggregates."""
+        speculation_hit_rate = self.ratio("speculation.hit", "speculation.miss")
+        with self._lock:
+            searches = self._counters.get("fetch.searches", 0)
+            return {
+                "counters": dict(self._counters),
+                "rates": {
+                    "speculation_hit_rate": speculation_hit_rate,
+                    "fetch_rounds_per_search": (
+                        round(self._counters.get("fetch.rounds", 0) / searches, 3) if searches else None
+                    ),
+                },
+                "latency_ms": {
+                    name: {
+                        "count": int(count),
+                        "mean": round(total / count, 2),
+                        **{
+                            f"p{pct}": round(_percentile(self._histograms[name], count, pct, max_ms), 2)
+                            for pct in PERCENTILES
+                        },
+                        "max": round(max_ms, 2),
+                    }
+                    for name, (count, total, max_ms) in self._latencies.items()
+                },
+            }
+
+    def reset(self) -> None:
+        """Clear everything (used by tests)."""
+        with self._lock:
+            self._counters.clear()
+            self._latencies.clear()
+            self._histograms.clear()
+
+
+# Process-wide instance shared by the search services and routes
+search_metrics = SearchMetrics()
@@ -0,0 +1,92 @@
+"""Short-lived snapshots of ranked search results for cheap pagination.
+
+The first page of a search pays for parsing, embedding, the Pinecone query
+and re-ranking. The ranked result set is then parked under an opaque
+cursor so later pages are plain list slices with no external calls. Only
+the requested page is ever turned into ``SearchResult`` models.
+"""
+
+import hashlib
+import json
+import secrets
+from dataclasses import dataclass
+
+from app.models.query import SearchQuery
+from app.services.candidates import Candidate
+from app.services.memory_cache import LRUCache
+from app.services.search_metrics import search_metrics
+
+
+@dataclass(slots=True)
+class SearchSnapshot:
+    """Ranked results of one search, as served to the client."""
+
+    fingerprint: str  # query text + manual filters that produced the ranking
+    candidates: list[Candidate]  # ranked; pages are materialized on read
+    parsed_query: dict
+    complete: bool = True  # False if a deeper page needs a wider Pinecone fetch
+
+    def covers(self, page: int, limit: int) -> bool:
+        """Whether ``page`` can be served from this snapshot."""
+        return self.complete or page * limit <= len(self.candidates)
+
+    def extend(self, candidates: list[Candidate], complete: bool) -> None:
+        """Append the rows of a wider fetch that this snapshot doesn't have yet.
+        
+        A wider fetch ranks a different window, so re-slicing it would
+        repeat or skip rows across pages. The pages already served keep
+        their order and only new rows are added after them.
+        """
+        seen = {c.id for c in self.candidates}
+        self.candidates = self.candidates + [c for c in candidates if c.id not in seen]
+        self.complete = complete
+
+    @property
+    def ids(self) -> list[str]:
+        """Ranked Pinecone IDs."""
+        return [c.id for c in self.candidates]
+
+
+def query_fingerprint(query: SearchQuery) -> str:
+    """Hash of everything that affects ranking (not page, limit, cursor or fields)."""
+    relevant = query.model_dump(exclude={"page", "limit", "cursor", "fields"})
+    relevant["query"] = " ".join(relevant["query"].lower().split())
+    return hashlib.sha256(
+        json.dumps(relevant, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+class SearchSnapshotStore:
+    """Bounded, expiring cursor -> ``SearchSnapshot`` map for this worker."""
+
+    def __init__(self, max_entries: int = 128, ttl_seconds: int = 300):
+        self._snapshots = LRUCache(maxsize=max_entries, ttl_seconds=ttl_seconds)
+
+    def create(
+        self,
+        query: SearchQuery,
+        candidates: list[Candidate],
+        parsed_query: dict,
+        complete: bool = True
+    ) -> str:
+        """Store a ranked candidate list and return its cursor."""
+        cursor = secrets.token_urlsafe(16)
+        self._snapshots.set(cursor, SearchSnapshot(
+            fingerprint=query_fingerprint(query),
+            candidates=candidates,
+            parsed_query=parsed_query,
+            complete=complete,
+        ))
+        return cursor
+
+    def get(self, cursor: str, query: SearchQuery) -> SearchSnapshot | None:
+        """Return the snapshot for a cursor if it is live and matches the query."""
+        snapshot = self._snapshots.get(cursor)
+        if snapshot is None or snapshot.fingerprint != query_fingerprint(query):
+            search_metrics.incr("snapshot.miss")
+            return None
+        search_metrics.incr("snapshot.hit")
+        return snapshot
+
+    def stats(self) -> dict:
+        return self._snapshots.stats()
@@ -0,0 +1,129 @@
+"""Ranked results of recent searches, reused for near-duplicate queries.
+
+Paraphrases ("beginner python issues", "easy python issues") parse to the
+same filters and embed to almost the same vector, and then rank almost the
+same Pinecone matches. The cache keeps the last few query vectors in one
+normalized matrix. A new query whose vector is within
+``SEMANTIC_CACHE_THRESHOLD`` cosine similarity of a cached one, and whose
+parsed filter and ranking options are identical, reuses that ranked candidate list
+and skips the vector query.
+
+Entries live in a fixed ring (the oldest slot is overwritten), expire after
+a TTL, and are all dropped when the index changes. Event-loop only.
+"""
+
+import hashlib
+import json
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from app.services.candidates import Candidate
+from app.services.search_metrics import search_metrics
+
+
+@dataclass(slots=True)
+class _Entry:
+    key: str
+    candidates: list[Candidate]
+    complete: bool
+    expires_at: float
+
+
+def ranking_key(options: dict) -> str:
+    """Hash of the parsed options that shape the filter and the ranking.
+
+    Keyed on the options rather than the built Pinecone filter: ``days_ago``
+    becomes a cutoff timestamp that moves every second, so the same query
+    would never match itself. Within the TTL the cutoff drifts by minutes.
+    """
+    return hashlib.sha256(json.dumps(options, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class SemanticResultCache:
+    """Fixed-size ring of (query vector, ranking key) -> ranked candidates."""
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: int = 300, threshold: float = 0.97):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.threshold = threshold
+        self._vectors: np.ndarray | None = None  # (max_entries, dim), rows unit-length
+        self._entries: list[_Entry | None] = [None] * max_entries
+        self._next = 0
+        # Bumped on invalidation so a fetch that started before it isn't stored
+        self.generation = 0
+
+    @staticmethod
+    def _unit(embedding: list[float]) -> np.ndarray | None:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm else None
+
+    def get(self, embedding: list[float], key: str, need: int) -> tuple[list[Candidate], bool] | None:
+        """Cached ``(candidates, complete)`` for a near-identical query covering ``need`` rows."""
+        vector = self._unit(embedding)
+        if self._vectors is None or vector is None or len(vector) != self._vectors.shape[1]:
+            search_metrics.incr("semantic_cache.miss")
+            return None
+
+        now = time.monotonic()
+        similarities = self._vectors @ vector
+        best, best_similarity = None, self.threshold
+        for slot in np.flatnonzero(similarities >= self.threshold):
+            entry = self._entries[slot]
+            if entry is None or entry.key != key or entry.expires_at < now:
+                continue
+            if not entry.complete and len(entry.candidates) < need:
+                continue
+            if similarities[slot] >= best_similarity:
+                best, best_similarity = entry, float(similarities[slot])
+
+        if best is None:
+            search_metrics.incr("semantic_cache.miss")
+            return None
+        search_metrics.incr("semantic_cache.hit")
+        return list(best.candidates), best.complete
+
+    def set(
+        self,
+        embedding: list[float],
+        key: str,
+        candidates: list[Candidate],
+        complete: bool,
+        generation: int,
+    ) -> None:
+        """Store a ranking fetched while ``generation`` was current."""
+        vector = self._unit(embedding)
+        if vector is None or generation != self.generation or not self.max_entries:
+            return
+        if self._vectors is None or self._vectors.shape[1] != len(vector):
+            self._vectors = np.zeros((self.max_entries, len(vector)), dtype=np.float32)
+            self._entries = [None] * self.max_entries
+        slot = self._next
+        self._next = (slot + 1) % self.max_entries
+        self._vectors[slot] = vector
+        self._entries[slot] = _Entry(
+            key=key,
+            candidates=list(candidates),
+            complete=complete,
+            expires_at=time.monotonic() + self.ttl_seconds,
+        )
+
+    def invalidate(self) -> None:
+        """Drop every entry (the index changed)."""
+        self.generation += 1
+        self._entries = [None] * self.max_entries
+        if self._vectors is not None:
+            self._vectors[:] = 0
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        hits = search_metrics.count("semantic_cache.hit")
+        misses = search_metrics.count("semantic_cache.miss")
+        return {
+            "size": sum(1 for e in self._entries if e is not None and e.expires_at >= now),
+            "max_entries": self.max_entries,
+            "threshold": self.threshold,
+            "hit_rate": round(hits / (hits + misses), 3) if hits + misses else None,
+        }
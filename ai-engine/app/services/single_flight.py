@@ -0,0 +1,61 @@
+"""Coalescing of identical concurrent calls ("single flight").
+
+A burst of identical homepage requests would otherwise each run their own
+embedding and Pinecone query. The first caller for a key starts the call;
+callers arriving while it is in flight await the same future and get the
+same result (or exception). Nothing is kept once the call finishes, so
+this never serves stale data. Caching is the job of the layers around it.
+
+Counters: ``singleflight.<name>.leader`` (upstream calls made) and
+``singleflight.<name>.shared`` (upstream calls saved).
+"""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import TypeVar
+
+from app.services.search_metrics import search_metrics
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Per-worker map of in-flight calls by key. Event-loop only, not thread-safe."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._in_flight: dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        """Result of ``call()``, shared with every concurrent caller using ``key``.
+
+        The call runs as its own task, so a caller that is cancelled (client
+        disconnect) doesn't cancel it for the others.
+        """
+        task = self._in_flight.get(key)
+        if task is not None:
+            search_metrics.incr(f"singleflight.{self.name}.shared")
+            return await asyncio.shield(task)
+
+        search_metrics.incr(f"singleflight.{self.name}.leader")
+        task = asyncio.ensure_future(call())
+        self._in_flight[key] = task
+        task.add_done_callback(lambda t: self._finish(key, t))
+        return await asyncio.shield(task)
+
+    def _finish(self, key: Hashable, task: asyncio.Future) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        # Retrieve the exception so a call whose callers all went away isn't logged as unhandled
+        if not task.cancelled():
+            task.exception()
+
+    def __len__(self) -> int:
+        return len(self._in_flight)
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": len(self._in_flight),
+            "upstream_calls": search_metrics.count(f"singleflight.{self.name}.leader"),
+            "saved": search_metrics.count(f"singleflight.{self.name}.shared"),
+        }
@@ -94,13 +94,13 @@ def _graph_stats(graph: Any) -> dict[str, Any]:
 
 
 def _build_gemini_client() -> Any:
-    """Construct a google.genai Client from settings. Returns None on failure.
+    """The shared google.genai Client, if configured. Returns None on failure.
 
     Imports are lazy so unit tests that patch ``run_v4`` never need the real
     ``google.genai`` package installed.
     """
     try:
-        from google import genai  # type: ignore
+        from app.services.api_clients import get_genai_client
     except Exception as e:  # noqa: BLE001
         log.warning("[v4-shadow] google.genai import failed: %s", e)
         return None
@@ -112,7 +112,7 @@ def _build_gemini_client() -> Any:
     if not api_key:
         return None
     try:
-        return genai.Client(api_key=api_key)
+        return get_genai_client()
     except Exception as e:  # noqa: BLE001
         log.warning("[v4-shadow] genai.Client init failed: %s", e)
         return None
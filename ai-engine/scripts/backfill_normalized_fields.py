@@ -0,0 +1,100 @@
+"""Backfill labels_norm / topics_norm on issues indexed before those fields existed.
+
+Ingestion writes both fields for new and changed issues, but unchanged
+issues are skipped and keep their old metadata. Run this once before
+setting ENABLE_NORMALIZED_FILTERS=true, otherwise `$in` filters on the
+normalized fields would silently exclude those older records.
+
+Only metadata is updated (no re-embedding, no vector values sent). With
+LOCAL_INDEX_SYNC set, the local replica is backfilled too, checked against
+its own copy of each record.
+
+Usage:
+    python -m scripts.backfill_normalized_fields
+    python -m scripts.backfill_normalized_fields --dry-run
+"""
+
+import argparse
+import logging
+import sys
+
+from dotenv import load_dotenv
+load_dotenv()
+
+from app.models.index_stats import STATS_RECORD_ID
+from app.services.local_index import open_local_index
+from app.services.pinecone_client import PineconeClient
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def normalized_fields(metadata: dict) -> dict | None:
+    """Fields to set, or None if the record is already up to date."""
+    fields = {
+        "labels_norm": [label.lower() for label in metadata.get("labels", [])],
+        "topics_norm": [topic.lower() for topic in metadata.get("repo_topics", [])],
+    }
+    if all(metadata.get(key) == value for key, value in fields.items()):
+        return None
+    return fields
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill normalized label/topic metadata")
+    parser.add_argument("--dry-run", action="store_true", help="Only count records that need updating")
+    parser.add_argument("--batch-size", type=int, default=1000, help="IDs fetched per batch")
+    args = parser.parse_args()
+
+    pinecone = PineconeClient()
+    local_index = open_local_index(writable=True)
+    all_ids = [i for i in pinecone.list_all_ids() if i != STATS_RECORD_ID]
+    logger.info(f"Checking {len(all_ids):,} issues")
+
+    updated = 0
+    local_updated = 0
+    errors = 0
+    for start in range(0, len(all_ids), args.batch_size):
+        batch_ids = all_ids[start:start + args.batch_size]
+        if local_index is not None:
+            for vector_id, metadata in local_index.fetch_by_ids(batch_ids).items():
+                fields = normalized_fields(metadata)
+                if fields is None:
+                    continue
+                if not args.dry_run:
+                    local_index.update_metadata(vector_id, fields)
+                local_updated += 1
+        batch = pinecone.fetch_by_ids(batch_ids)
+        for vector_id, metadata in batch.items():
+            fields = normalized_fields(metadata)
+            if fields is None:
+                continue
+            if not args.dry_run:
+                try:
+                    pinecone.update_metadata(vector_id, fields)
+                except Exception as e:
+                    logger.warning(f"Failed to update {vector_id}: {e}")
+                    errors += 1
+                    continue
+            updated += 1
+        logger.info(f"Progress: {min(start + args.batch_size, len(all_ids)):,}/{len(all_ids):,}, {updated:,} updated")
+
+    if local_index is not None and not args.dry_run:
+        try:
+            local_index.save()
+        except Exception as e:
+            logger.error(f"Failed to update local index: {e}")
+            errors += 1
+
+    action = "Would update" if args.dry_run else "Updated"
+    logger.info(f"{action} {updated:,} issues ({errors} errors)")
+    if local_index is not None:
+        logger.info(f"{action} {local_updated:,} issues in the local index")
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,61 @@
+"""
+Micro-benchmark: columnar reranker vs. the per-match loop it replaced.
+
+Builds synthetic Pinecone matches (metadata shaped like ingestion writes it)
+and times both implementations on the same input, checking they agree.
+
+Usage:
+    python -m scripts.bench_rerank
+    python -m scripts.bench_rerank --candidates 200 --repeat 2000
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timezone
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services import reranker
+from tests.rerank_cases import legacy_rank, make_matches
+
+
+def columnar_rank(matches: list[dict], topics: list[str] | None, sort_by: str | None, limit: int | None = None):
+    now_ts = datetime.now(timezone.utc).timestamp()
+    order, scores = reranker.rank(matches, now_ts=now_ts, sort_by=sort_by, topics=topics, limit=limit)
+    return [(int(i), float(scores[i])) for i in order]
+
+
+def bench(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the columnar reranker")
+    parser.add_argument("--candidates", type=int, default=100, help="Matches per request (search uses 100, recent 200)")
+    parser.add_argument("--repeat", type=int, default=1000)
+    args = parser.parse_args()
+
+    matches = make_matches(args.candidates)
+    cases = [
+        ("relevance", None, None),
+        ("relevance + topics", ["cli", "AI"], None),
+        ("stars", None, "stars"),
+        ("recently_discussed", None, "recently_discussed"),
+    ]
+
+    print(f"{args.candidates} candidates, {args.repeat} runs each (µs per call)\n")
+    print(f"{'case':<22}{'loop':>10}{'columnar':>10}{'top-20':>10}{'speedup':>9}")
+    for name, topics, sort_by in cases:
+        assert columnar_rank(matches, topics, sort_by) == legacy_rank(matches, topics, sort_by), name
+        loop_us = bench(lambda: legacy_rank(matches, topics, sort_by), args.repeat)
+        columnar_us = bench(lambda: columnar_rank(matches, topics, sort_by), args.repeat)
+        top_us = bench(lambda: columnar_rank(matches, topics, sort_by, limit=20), args.repeat)
+        print(f"{name:<22}{loop_us:>10.1f}{columnar_us:>10.1f}{top_us:>10.1f}{loop_us / columnar_us:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
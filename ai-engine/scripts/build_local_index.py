@@ -0,0 +1,77 @@
+"""
+Seed the local in-process replica (app/services/local_index.py) from Pinecone.
+
+Copies every issue vector and its metadata into LOCAL_INDEX_PATH. After
+this, ingestion/cleanup keep it current when LOCAL_INDEX_SYNC=true, and
+the API serves searches from it when SEARCH_BACKEND=local.
+
+Usage:
+    python -m scripts.build_local_index
+    python -m scripts.build_local_index --ivf --nlist 1024
+    python -m scripts.build_local_index --path /tmp/index --limit 5000
+"""
+import argparse
+import logging
+import os
+import shutil
+import sys
+import time
+
+from dotenv import load_dotenv
+load_dotenv()
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import get_settings
+from app.models.index_stats import STATS_RECORD_ID
+from app.services.local_index import LocalIndex
+from app.services.pinecone_client import PineconeClient
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Build the local index replica from Pinecone")
+    parser.add_argument("--path", default=settings.local_index_path, help="Target directory")
+    parser.add_argument("--limit", type=int, default=None, help="Only copy the first N issues")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Vectors fetched per request")
+    parser.add_argument("--save-every", type=int, default=50000, help="Rows staged between saves")
+    parser.add_argument("--ivf", action="store_true", help="Train IVF lists after copying")
+    parser.add_argument("--nlist", type=int, default=None, help="IVF lists (default ~sqrt(rows))")
+    args = parser.parse_args()
+
+    if os.path.exists(args.path):
+        logger.info(f"Removing existing replica at {args.path}")
+        shutil.rmtree(args.path)
+    local_index = LocalIndex.create(args.path, settings.embedding_dimension)
+
+    pinecone = PineconeClient()
+    ids = [i for i in pinecone.list_all_ids() if i != STATS_RECORD_ID]
+    if args.limit:
+        ids = ids[:args.limit]
+    logger.info(f"Copying {len(ids):,} issues into {args.path}")
+
+    start = time.time()
+    for offset in range(0, len(ids), args.batch_size):
+        fetched = pinecone.fetch_vectors(ids[offset:offset + args.batch_size])
+        for vector_id, (values, metadata) in fetched.items():
+            local_index.upsert(vector_id, values, metadata)
+        copied = min(offset + args.batch_size, len(ids))
+        # Every save rewrites the ID/column state, so stage big chunks between them
+        if copied % args.save_every < args.batch_size or copied == len(ids):
+            local_index.save()
+        logger.info(f"Copied {copied:,}/{len(ids):,}")
+
+    if args.ivf:
+        local_index.train_ivf(nlist=args.nlist)
+
+    logger.info(f"Done: {len(local_index):,} issues in {time.time() - start:.0f}s")
+
+
+if __name__ == "__main__":
+    main()
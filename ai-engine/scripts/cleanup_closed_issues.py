@@ -12,6 +12,7 @@ Usage:
     python -m scripts.cleanup_closed_issues
     python -m scripts.cleanup_closed_issues --dry-run
     python -m scripts.cleanup_closed_issues --limit 1000
+    python -m scripts.cleanup_closed_issues --rebuild-stats
 """
 
 import argparse
@@ -24,6 +25,9 @@ load_dotenv()
 
 from app.services.graphql_fetcher import GraphQLFetcher
 from app.services.pinecone_client import PineconeClient
+from app.services.index_stats_service import IndexStatsService
+from app.models.index_stats import STATS_RECORD_ID
+from app.services.local_index import open_local_index
 
 # Configure logging
 logging.basicConfig(
@@ -54,6 +58,11 @@ def main():
         default=50,  # Reduced from 500 to 50 to avoid rate limits
         help="Number of issues to check per batch before saving progress"
     )
+    parser.add_argument(
+        "--rebuild-stats",
+        action="store_true",
+        help="Recompute the index stats record from full metadata (slow; first run or after drift)"
+    )
     
     args = parser.parse_args()
     
@@ -66,6 +75,7 @@ def main():
     
     # Initialize clients
     pinecone = PineconeClient()
+    local_index = open_local_index(writable=True)
     fetcher = GraphQLFetcher()
     
     # Step 1: Get index stats
@@ -78,8 +88,9 @@ def main():
     logger.info("Step 1: Listing all issue IDs from Pinecone...")
     logger.info("=" * 60)
     
-    all_ids = pinecone.list_all_ids()
+    all_ids = [i for i in pinecone.list_all_ids() if i != STATS_RECORD_ID]
     logger.info(f"Found {len(all_ids):,} issue IDs in Pinecone")
+    full_id_list = list(all_ids)
     
     
     if not all_ids:
@@ -109,6 +120,8 @@ def main():
     total_not_found = 0
     total_open = 0
     total_errors = 0
+    deleted_ids = set()
+    deleted_metadata = {}  # id -> metadata, so the stats record can drop their languages
     
     for batch_num in range(total_batches):
         start_idx = batch_num * batch_size
@@ -149,7 +162,11 @@ def main():
         # Delete this batch's closed/not-found issues immediately
         batch_to_delete = batch_closed + batch_not_found
         if batch_to_delete and not args.dry_run:
+            deleted_metadata.update(pinecone.fetch_by_ids(batch_to_delete))
+            deleted_ids.update(batch_to_delete)
             deleted = pinecone.delete_by_ids(batch_to_delete)
+            if local_index is not None:
+                local_index.delete(batch_to_delete)
             total_deleted += deleted
             logger.info(f"Batch {batch_num + 1}: deleted {deleted} (closed: {len(batch_closed)}, not_found: {len(batch_not_found)})")
         elif batch_to_delete and args.dry_run:
@@ -174,6 +191,32 @@ def main():
         new_total = new_stats.get("total_vector_count", 0)
         logger.info(f"📊 New index size: {new_total:,} (was {total_vectors:,})")
     
+    # Keep the local replica in sync
+    if local_index is not None and not args.dry_run:
+        try:
+            local_index.save()
+        except Exception as e:
+            logger.error(f"Failed to update local index: {e}")
+    
+    # Keep the stats record behind /api/search/stats in sync
+    if not args.dry_run:
+        stats_service = IndexStatsService(pinecone)
+        remaining_ids = [i for i in full_id_list if i not in deleted_ids]
+        try:
+            if args.rebuild_stats:
+                logger.info("Rebuilding index stats from full metadata...")
+                stats = stats_service.rebuild(
+                    pinecone.fetch_by_ids(remaining_ids[start:start + 1000])
+                    for start in range(0, len(remaining_ids), 1000)
+                )
+            else:
+                stats = stats_service.record_cleanup(
+                    remaining_ids, deleted_metadata, complete=not args.limit
+                )
+            logger.info(f"📊 Index stats: {stats.total_issues:,} issues across {stats.unique_repos} repos")
+        except Exception as e:
+            logger.error(f"Failed to update index stats: {e}")
+    
     # Final rate limit check
     logger.info("\n" + "=" * 60)
     try:
@@ -7,6 +7,7 @@ Fetches 100 issues per API call instead of 1.
 import argparse
 import logging
 import sys
+import time
 from dotenv import load_dotenv
 
 # Load env before other imports
@@ -14,7 +15,11 @@ load_dotenv()
 
 from app.services.graphql_fetcher import GraphQLFetcher
 from app.services.embedder import EmbeddingService
+from app.services.embedding_store import IssueEmbeddingStore
 from app.services.pinecone_client import PineconeClient
+from app.services.index_stats_service import IndexStatsService
+from app.services.issue_diff import classify_change, upsert_bytes_avoided
+from app.services.local_index import open_local_index
 from app.config import get_settings
 
 logging.basicConfig(
@@ -24,6 +29,29 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+def update_index_stats(pinecone, new_issues, touched_issues):
+    """Fold this run into the stats record read by /stats and /last-updated.
+
+    Written on every run, even one that changed nothing, so ``computed_at``
+    shows when the index was last checked.
+    """
+    try:
+        stats = IndexStatsService(pinecone).record_ingestion(new_issues, touched_issues)
+        logger.info(f"📊 Index stats: {stats.total_issues} issues, last updated {stats.last_updated}")
+    except Exception as e:
+        logger.error(f"Failed to update index stats: {e}")
+
+
+def save_local_index(local_index):
+    """Publish staged writes to the local replica (LOCAL_INDEX_SYNC)."""
+    if local_index is None:
+        return
+    try:
+        local_index.save()
+    except Exception as e:
+        logger.error(f"Failed to update local index: {e}")
+
+
 def main():
     parser = argparse.ArgumentParser(description="Ingest issues using GraphQL API")
     parser.add_argument(
@@ -101,13 +129,18 @@ def main():
     # Initialize services
     fetcher = GraphQLFetcher()
     embedder = EmbeddingService()
+    embedding_store = IssueEmbeddingStore(embedder)
     pinecone = PineconeClient()
+    local_index = open_local_index(writable=True)
     
     # Check rate limit
     rate_limit = fetcher.get_rate_limit_status()
     logger.info(f"GraphQL rate limit: {rate_limit}")
     
     total_issues = 0
+    metadata_updates = 0  # issues patched without re-embedding or re-upserting
+    new_issues = []  # not in the index before this run (feeds the stats record)
+    touched_issues = []  # everything upserted this run
     
     for lang in languages:
         logger.info(f"\n{'='*50}")
@@ -143,42 +176,66 @@ def main():
                 # Fetch existing issues from Pinecone (uses Read Units, not Write Units)
                 existing = pinecone.fetch_by_ids(issue_ids)
                 
-                # Filter to only new or changed issues
+                # Filter to only new or changed issues; comment/assignment/star
+                # changes are patched as metadata without re-embedding
                 issues_to_process = []
+                patches = {}
+                patched_issues = []
                 skipped_count = 0
+                now_ts = int(time.time())
                 
                 for issue in issues:
                     issue_id = Issue.create_id(issue.repo_full_name, issue.issue_number)
+                    stored = existing.get(issue_id)
+                    
+                    if stored is not None and issue.updated_at == stored.get("updated_at", ""):
+                        # UNCHANGED - skip to save WUs!
+                        skipped_count += 1
+                        continue
                     
-                    if issue_id not in existing:
-                        # NEW issue - not in Pinecone yet
+                    change = classify_change(issue, stored, embedder.create_issue_text)
+                    if change.kind in ("new", "full"):
+                        # NEW, or embedded text changed
                         issues_to_process.append(issue)
+                    elif change.kind == "metadata":
+                        issue.ingested_at = now_ts
+                        patches[issue_id] = {**change.fields, "ingested_at": now_ts}
+                        patched_issues.append(issue)
                     else:
-                        # EXISTS - check if updated
-                        stored_updated_at = existing[issue_id].get("updated_at", "")
-                        if issue.updated_at != stored_updated_at:
-                            # CHANGED - GitHub has newer version
-                            issues_to_process.append(issue)
-                        else:
-                            # UNCHANGED - skip to save WUs!
-                            skipped_count += 1
+                        skipped_count += 1
                 
-                logger.info(f"  Filtered: {len(issues_to_process)} new/changed, {skipped_count} unchanged (skipped)")
+                logger.info(
+                    f"  Filtered: {len(issues_to_process)} new/text-changed, "
+                    f"{len(patches)} metadata-only, {skipped_count} unchanged (skipped)"
+                )
+                
+                if patches:
+                    failed = set(pinecone.update_metadata_batch(patches))
+                    if local_index is not None:
+                        for issue_id, fields in patches.items():
+                            if issue_id not in failed:
+                                local_index.update_metadata(issue_id, fields)
+                    patched = [
+                        m for m in patched_issues
+                        if Issue.create_id(m.repo_full_name, m.issue_number) not in failed
+                    ]
+                    touched_issues.extend(patched)
+                    metadata_updates += len(patched)
+                    total_issues += len(patched)
                 
                 if not issues_to_process:
-                    logger.info(f"  No new or changed issues to ingest")
+                    logger.info(f"  No new or text-changed issues to embed")
                     continue
                 
-                # Generate embeddings only for new/changed issues
+                # Generate embeddings only for new/changed issues whose text changed
                 logger.info("  Generating embeddings...")
                 texts = [embedder.create_issue_text(issue) for issue in issues_to_process]
-                embeddings = embedder.generate_embeddings_batch(texts)
-                logger.info(f"  Generated {len(embeddings)} embeddings")
+                misses_before = embedding_store.misses
+                embeddings = embedding_store.embed_documents(texts)
+                generated = embedding_store.misses - misses_before
+                logger.info(f"  Generated {generated} embeddings ({len(embeddings) - generated} reused, text unchanged)")
                 
                 # Create Issue objects
-                import time
-                now_ts = int(time.time())
-                
                 issue_objects = []
                 for i, metadata in enumerate(issues_to_process):
                     metadata.ingested_at = now_ts
@@ -190,6 +247,13 @@ def main():
                 
                 # Upsert to Pinecone
                 pinecone.upsert_issues(issue_objects)
+                if local_index is not None:
+                    local_index.upsert_issues(issue_objects)
+                touched_issues.extend(issues_to_process)
+                new_issues.extend(
+                    m for m in issues_to_process
+                    if Issue.create_id(m.repo_full_name, m.issue_number) not in existing
+                )
                 
                 total_issues += len(issues_to_process)
                 logger.info(f"  Ingested {len(issues_to_process)} issues (total: {total_issues})")
@@ -198,14 +262,25 @@ def main():
                 if "rate limit" in str(e).lower():
                     logger.warning(f"⛔ Rate limit hit - stopping")
                     logger.info(f"Total issues ingested: {total_issues}")
+                    update_index_stats(pinecone, new_issues, touched_issues)
+                    save_local_index(local_index)
                     sys.exit(0)
                 else:
                     logger.error(f"  Error fetching {lang}/{label}: {e}")
     
     logger.info(f"\n{'='*50}")
     logger.info(f"Ingestion complete! Total issues: {total_issues}")
+    logger.info(f"Embedding store: {embedding_store.stats()}")
+    avoided_kb = upsert_bytes_avoided(embedder.dimension, metadata_updates) // 1024
+    logger.info(
+        f"Metadata-only updates: {metadata_updates} "
+        f"(avoided {metadata_updates} embeddings and {avoided_kb} KB of float32 vector values in upserts)"
+    )
     logger.info(f"{'='*50}")
     
+    update_index_stats(pinecone, new_issues, touched_issues)
+    save_local_index(local_index)
+    
     # Final rate limit check
     rate_limit = fetcher.get_rate_limit_status()
     logger.info(f"Final rate limit: {rate_limit}")
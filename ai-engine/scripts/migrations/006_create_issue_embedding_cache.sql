@@ -0,0 +1,24 @@
+-- Migration: Create content-addressed issue embedding cache
+-- Purpose: Skip Gemini embedding calls for issues whose embedded text is
+-- unchanged. GitHub bumps updated_at for comments, reactions and label
+-- edits, so ingestion re-processes many issues whose text is identical.
+--
+-- Key: content_hash = sha256(model, dimension, task, issue text)
+-- Stores: the embedding as raw float32 bytes (~3KB for 768 dimensions)
+--
+-- last_used_at lets old rows be pruned, e.g.
+--   DELETE FROM issue_embedding_cache WHERE last_used_at < NOW() - INTERVAL '90 days';
+
+CREATE TABLE IF NOT EXISTS issue_embedding_cache (
+    content_hash VARCHAR(64) PRIMARY KEY,
+
+    model VARCHAR NOT NULL,
+    dimension INTEGER NOT NULL,
+    embedding BYTEA NOT NULL,
+
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    last_used_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS ix_issue_embedding_cache_last_used_at
+ON issue_embedding_cache(last_used_at);
@@ -0,0 +1,15 @@
+-- Migration 007: Track in-place rewrites of audit_cache rows
+-- Re-audits of the same (repo_url, commit_sha) update the row rather than
+-- insert, so created_at alone can't version the public score responses.
+-- updated_at is set on insert and bumped on every rewrite; the
+-- /api/projects/score and /api/projects/recent-scores ETags are built from it.
+
+ALTER TABLE audit_cache
+    ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE DEFAULT NULL;
+
+-- Existing rows were last written when they were created
+UPDATE audit_cache SET updated_at = created_at WHERE updated_at IS NULL;
+
+-- max(updated_at) versions the recent-scores list
+CREATE INDEX IF NOT EXISTS ix_audit_cache_updated_at
+    ON audit_cache(updated_at);
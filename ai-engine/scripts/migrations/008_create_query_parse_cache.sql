@@ -0,0 +1,30 @@
+-- Migration: Create query_parse_cache table
+-- Purpose: Shared tier of the search query parse cache, so a Gemini parse
+-- paid for by one worker (or revision) is reused by every other.
+--
+-- Key: cache_key = sha256(prompt version + normalized query text)
+-- A new prompt version simply stops matching old rows. Expired rows are
+-- ignored on read and can be pruned, e.g.
+--   DELETE FROM query_parse_cache WHERE expires_at < NOW();
+
+CREATE TABLE IF NOT EXISTS query_parse_cache (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+
+    -- Cache Key
+    cache_key VARCHAR(64) NOT NULL,
+    prompt_version VARCHAR(16) NOT NULL,
+    query_text VARCHAR NOT NULL,
+
+    -- Cached Result
+    parsed_query JSONB NOT NULL,
+
+    -- Metadata
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    expires_at TIMESTAMP WITH TIME ZONE
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS ix_query_parse_cache_key
+ON query_parse_cache(cache_key);
+
+CREATE INDEX IF NOT EXISTS ix_query_parse_cache_expires_at
+ON query_parse_cache(expires_at);
@@ -0,0 +1,44 @@
+"""Shared fixtures for search-path tests.
+
+The search services talk to Gemini and Pinecone; these fixtures swap them
+for mocks so the orchestration logic can be exercised offline.
+"""
+from __future__ import annotations
+
+import os
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+os.environ.setdefault("GEMINI_API_KEY", "test-gemini-key")
+os.environ.setdefault("PINECONE_API_KEY", "test-pinecone-key")
+
+
+@pytest.fixture
+def search_engine():
+    """SearchEngine with its parser, embedder and Pinecone client mocked out."""
+    from app.services.search_engine import SearchEngine
+    from app.services.search_metrics import search_metrics
+
+    search_metrics.reset()
+    with patch("app.services.search_engine.QueryParser"), \
+         patch("app.services.search_engine.EmbeddingService"), \
+         patch("app.services.search_engine.PineconeClient"):
+        engine = SearchEngine()
+    engine.query_parser.parse_local.return_value = None
+    engine.embedder = MagicMock()
+    engine.embedder.dimension = 4
+    engine.embedder.generate_query_embedding.return_value = [0.1, 0.2, 0.3, 0.4]
+    engine.pinecone = MagicMock()
+    engine.pinecone.search.return_value = []
+    # The engine awaits the async variants; route them through the sync mocks
+    # so tests can configure and assert on either.
+    parser, embedder, pinecone = engine.query_parser, engine.embedder, engine.pinecone
+    parser.aparse_remote = AsyncMock(side_effect=lambda q: parser.parse_remote(q))
+    embedder.agenerate_query_embedding = AsyncMock(
+        side_effect=lambda q: embedder.generate_query_embedding(q)
+    )
+    pinecone.asearch = AsyncMock(side_effect=lambda **kw: pinecone.search(**kw))
+    pinecone.afetch_by_ids = AsyncMock(side_effect=lambda ids: pinecone.fetch_by_ids(ids))
+    yield engine
+    search_metrics.reset()
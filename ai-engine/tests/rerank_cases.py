@@ -0,0 +1,61 @@
+"""Synthetic Pinecone matches and the per-match ranking loop the reranker replaced.
+
+Shared by ``test_reranker`` and ``scripts/bench_rerank.py``.
+"""
+import random
+from datetime import datetime, timedelta, timezone
+
+from app.services import reranker
+
+TOPICS = ["cli", "machine-learning", "web", "database", "ai", "devtools", "testing", "blockchain"]
+LABELS = ["good first issue", "help wanted", "bug", "documentation", "enhancement"]
+
+
+def make_matches(n: int, seed: int = 7) -> list[dict]:
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc)
+    matches = []
+    for i in range(n):
+        created = now - timedelta(seconds=rng.randint(0, 400 * 86400))
+        updated = created + timedelta(seconds=rng.randint(0, int((now - created).total_seconds())))
+        matches.append({
+            "id": f"owner/repo{i}#{i}",
+            "score": rng.random(),
+            "metadata": {
+                "repo_stars": rng.randint(0, 200000),
+                "created_at": created.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "created_at_ts": int(created.timestamp()),
+                "updated_at": updated.strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "updated_at_ts": int(updated.timestamp()),
+                "repo_topics": rng.sample(TOPICS, rng.randint(0, 4)),
+                "labels": [l.title() if rng.random() < 0.3 else l for l in rng.sample(LABELS, rng.randint(0, 3))],
+            },
+        })
+    return matches
+
+
+def legacy_rank(matches: list[dict], topics: list[str] | None, sort_by: str | None) -> list[tuple[int, float]]:
+    """The pre-columnar _process_results loop (minus SearchResult construction)."""
+    now = datetime.now(timezone.utc)
+    rows = []
+    for i, match in enumerate(matches):
+        metadata = match["metadata"]
+        if topics:
+            repo_topics = metadata.get("repo_topics", [])
+            if not any(topic.lower() in [t.lower() for t in repo_topics] for topic in topics):
+                continue
+        stars_score = min(metadata["repo_stars"] / reranker.MAX_STARS, 1.0)
+        try:
+            updated = datetime.fromisoformat(metadata["updated_at"].replace("Z", "+00:00"))
+            recency_score = max(0, 1 - ((now - updated).days / reranker.MAX_AGE_DAYS))
+        except Exception:
+            recency_score = 0.5
+        score = round(0.70 * match["score"] + 0.30 * recency_score + 0.00 * stars_score, 4)
+        rows.append((i, score, metadata))
+    if sort_by == "stars":
+        rows.sort(key=lambda r: r[2]["repo_stars"], reverse=True)
+    elif sort_by == "recently_discussed":
+        rows.sort(key=lambda r: r[2]["updated_at"], reverse=True)
+    else:
+        rows.sort(key=lambda r: r[1], reverse=True)
+    return [(i, score) for i, score, _ in rows]
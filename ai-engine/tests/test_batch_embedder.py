@@ -0,0 +1,96 @@
+"""Tests for the concurrent, retrying batch embedder."""
+from __future__ import annotations
+
+import random
+import threading
+import time
+
+import pytest
+from google.genai import errors
+
+from app.services.batch_embedder import AdaptiveLimiter, BatchEmbedder, plan_batches
+
+
+def api_error(code: int) -> errors.APIError:
+    return errors.ClientError(code, {"error": {"code": code, "message": "nope", "status": "X"}})
+
+
+def fake_embed(batch: list[str]) -> list[list[float]]:
+    time.sleep(random.uniform(0, 0.005))  # finish out of order
+    return [[float(text)] for text in batch]
+
+
+def test_batches_respect_count_token_and_byte_budgets():
+    texts = ["a" * 40] * 5 + ["b" * 400] + ["c" * 40] * 3
+
+    batches = plan_batches(texts, max_items=4, max_tokens=50, max_bytes=10_000)
+
+    assert [i for batch in batches for i in batch] == list(range(9))
+    assert batches[0] == [0, 1, 2, 3]
+    assert [5] in batches  # over the token budget on its own
+    assert plan_batches(texts, max_items=100, max_tokens=10_000, max_bytes=100)[0] == [0, 1]
+
+
+def test_results_keep_input_order_across_concurrent_batches():
+    embedder = BatchEmbedder(fake_embed, max_items=3, concurrency=4)
+    texts = [str(i) for i in range(50)]
+
+    assert embedder.embed(texts) == [[float(i)] for i in range(50)]
+
+
+def test_max_items_override_only_lowers_the_limit():
+    sizes = []
+
+    def record(batch: list[str]) -> list[list[float]]:
+        sizes.append(len(batch))
+        return [[0.0] for _ in batch]
+
+    embedder = BatchEmbedder(record, max_items=10, concurrency=1)
+    embedder.embed(["x"] * 25, max_items=4)
+    embedder.embed(["x"] * 25, max_items=50)
+
+    assert sizes == [4] * 6 + [1] + [10, 10, 5]
+
+
+def test_rate_limited_batch_is_retried_and_shrinks_concurrency():
+    calls = {"n": 0}
+    lock = threading.Lock()
+
+    def flaky(batch):
+        with lock:
+            calls["n"] += 1
+            first = calls["n"] == 1
+        if first:
+            raise api_error(429)
+        return fake_embed(batch)
+
+    embedder = BatchEmbedder(flaky, max_items=2, concurrency=8, max_backoff_seconds=0.01)
+
+    assert embedder.embed([str(i) for i in range(6)]) == [[float(i)] for i in range(6)]
+    assert calls["n"] == 4
+    assert embedder.limiter.limit < 8
+
+
+def test_client_error_is_not_retried():
+    calls = []
+
+    def bad_request(batch):
+        calls.append(batch)
+        raise api_error(400)
+
+    embedder = BatchEmbedder(bad_request, max_backoff_seconds=0.01)
+
+    with pytest.raises(errors.ClientError):
+        embedder.embed(["x"])
+    assert len(calls) == 1
+
+
+def test_limiter_grows_back_after_successes():
+    limiter = AdaptiveLimiter(4, maximum=8, increase_after=2, decrease_cooldown_seconds=0)
+    limiter.on_rate_limit()
+    limiter.on_rate_limit()
+    assert limiter.limit == 1
+
+    for _ in range(4):
+        limiter.on_success()
+    assert limiter.limit == 3
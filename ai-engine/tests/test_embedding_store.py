@@ -0,0 +1,71 @@
+"""Tests for the content-addressed issue embedding store."""
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import database
+from app.models.issue_embedding_cache import IssueEmbeddingCache
+from app.services.embedding_store import IssueEmbeddingStore
+
+
+@pytest.fixture
+def session_factory(monkeypatch):
+    """In-memory SQLite standing in for Postgres."""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    IssueEmbeddingCache.__table__.create(bind=engine)
+    factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(database, "SessionLocal", factory)
+    return factory
+
+
+@pytest.fixture
+def embedder():
+    fake = MagicMock()
+    fake.model = "text-embedding-004"
+    fake.dimension = 2
+    fake.generate_embeddings_batch.side_effect = lambda texts: [[float(len(t)), 0.5] for t in texts]
+    return fake
+
+
+def test_unchanged_text_is_not_re_embedded(session_factory, embedder):
+    IssueEmbeddingStore(embedder).embed_documents(["Title: a", "Title: bb"])
+
+    store = IssueEmbeddingStore(embedder)  # e.g. the next ingestion run
+    embeddings = store.embed_documents(["Title: bb", "Title: ccc", "Title: a"])
+
+    assert embeddings == [[9.0, 0.5], [10.0, 0.5], [8.0, 0.5]]
+    embedder.generate_embeddings_batch.assert_called_with(["Title: ccc"])
+    assert store.stats()["hits"] == 2
+    assert store.stats()["misses"] == 1
+
+
+def test_model_change_misses(session_factory, embedder):
+    IssueEmbeddingStore(embedder).embed_documents(["Title: a"])
+    embedder.dimension = 3
+
+    IssueEmbeddingStore(embedder).embed_documents(["Title: a"])
+
+    assert embedder.generate_embeddings_batch.call_count == 2
+
+
+def test_without_database_embeds_everything(monkeypatch, embedder):
+    monkeypatch.setattr(database, "SessionLocal", None)
+    store = IssueEmbeddingStore(embedder)
+
+    assert store.embed_documents(["x", "x"]) == [[1.0, 0.5], [1.0, 0.5]]
+    embedder.generate_embeddings_batch.assert_called_once_with(["x"])
+
+
+def test_failed_chunk_does_not_skip_the_rest(session_factory, embedder, monkeypatch):
+    monkeypatch.setattr("app.services.embedding_store._CHUNK_SIZE", 2)
+    store = IssueEmbeddingStore(embedder)
+    store._put_shared({"a": [1.0, 0.5]})  # e.g. written by a concurrent run
+
+    store._put_shared({"a": [1.0, 0.5], "b": [2.0, 0.5], "c": [3.0, 0.5]})
+
+    assert set(store._get_shared(["a", "b", "c"])) == {"a", "c"}
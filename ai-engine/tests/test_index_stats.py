@@ -0,0 +1,110 @@
+"""Tests for the ingestion-maintained index stats record."""
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+from app.models.index_stats import IndexStats, STATS_RECORD_ID
+from app.models.issue import IssueMetadata
+from app.services.index_stats_service import IndexStatsService
+
+
+def make_issue(repo: str, number: int, language: str, updated_day: int) -> IssueMetadata:
+    return IssueMetadata(
+        issue_id=number, issue_number=number, title="t", body="b",
+        repo_name=repo.split("/")[1], repo_full_name=repo, repo_stars=1,
+        repo_forks=0, repo_description=None, repo_topics=[], language=language,
+        labels=[], created_at="2026-01-01T00:00:00Z",
+        updated_at=f"2026-01-{updated_day:02d}T00:00:00Z", comments_count=0,
+        is_assigned=False, issue_url="u", repo_url="u",
+    )
+
+
+def service_with(stats: IndexStats | None) -> tuple[IndexStatsService, MagicMock]:
+    pinecone = MagicMock()
+    pinecone.get_stats_record.return_value = stats.to_metadata() if stats else None
+    return IndexStatsService(pinecone), pinecone
+
+
+def test_metadata_round_trip_restores_ints():
+    stats = IndexStats(
+        last_updated="2026-01-02T00:00:00Z", last_updated_ts=1767312000,
+        total_issues=10, unique_repos=3, language_counts={"Python": 7, "Go": 3},
+        generation=4,
+    )
+    metadata = stats.to_metadata()
+    assert metadata["type"] == "stats"
+    # Pinecone hands numbers back as floats
+    as_floats = {k: float(v) if isinstance(v, int) else v for k, v in metadata.items()}
+
+    assert IndexStats.from_metadata(as_floats) == stats
+
+
+def test_record_ingestion_adds_new_issues_and_moves_last_updated():
+    service, pinecone = service_with(IndexStats(total_issues=5, language_counts={"Python": 5}))
+    new = [make_issue("a/x", 1, "Python", 10), make_issue("b/y", 2, "Rust", 20)]
+    changed = make_issue("a/x", 3, "Python", 30)
+
+    stats = service.record_ingestion(new, new + [changed])
+
+    assert stats.total_issues == 7
+    assert stats.language_counts == {"Python": 6, "Rust": 1}
+    assert stats.last_updated == "2026-01-30T00:00:00Z"
+    assert stats.generation == 1
+    pinecone.upsert_stats_record.assert_called_once()
+
+
+def test_record_ingestion_writes_even_when_nothing_changed():
+    service, pinecone = service_with(IndexStats(
+        total_issues=5, last_updated="2026-01-10T00:00:00Z", last_updated_ts=1768003200,
+    ))
+
+    stats = service.record_ingestion([], [])
+
+    assert stats.total_issues == 5
+    assert stats.last_updated == "2026-01-10T00:00:00Z"
+    assert stats.generation == 1
+    pinecone.upsert_stats_record.assert_called_once()
+
+
+def test_record_cleanup_recounts_when_complete():
+    service, _ = service_with(IndexStats(total_issues=99, language_counts={"Python": 3, "Go": 1}))
+
+    stats = service.record_cleanup(
+        ["a/x#1", "a/x#2", "b/y#3", STATS_RECORD_ID],
+        {"c/z#4": {"language": "Go"}},
+        complete=True,
+    )
+
+    assert stats.total_issues == 3
+    assert stats.unique_repos == 2
+    assert stats.language_counts == {"Python": 3}
+
+
+def test_record_cleanup_partial_only_decrements():
+    service, _ = service_with(IndexStats(total_issues=10, unique_repos=4))
+
+    stats = service.record_cleanup(["a/x#1"], {"c/z#4": {"language": "Go"}}, complete=False)
+
+    assert stats.total_issues == 9
+    assert stats.unique_repos == 4
+
+
+def test_rebuild_folds_batches_one_at_a_time():
+    service, _ = service_with(IndexStats(total_issues=99, unique_repos=50))
+    served = []
+
+    def batches():
+        for batch in (
+            {"a/x#1": {"language": "Python", "updated_at": "2026-01-05T00:00:00Z", "updated_at_ts": 1767571200}},
+            {"a/x#2": {"language": "Python"}, "b/y#3": {"language": "Go"}, STATS_RECORD_ID: {"type": "stats"}},
+        ):
+            served.append(batch)
+            yield batch
+
+    stats = service.rebuild(batches())
+
+    assert len(served) == 2
+    assert stats.total_issues == 3
+    assert stats.unique_repos == 2
+    assert stats.language_counts == {"Python": 2, "Go": 1}
+    assert stats.last_updated == "2026-01-05T00:00:00Z"
@@ -0,0 +1,63 @@
+"""Tests for classifying issue changes into re-embed vs metadata-only."""
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+
+from app.models.issue import IssueMetadata
+from app.services.issue_diff import classify_change
+
+
+@pytest.fixture
+def issue_text():
+    from app.services.embedder import EmbeddingService
+
+    with patch("app.services.embedder.get_genai_client"):
+        return EmbeddingService().create_issue_text
+
+
+def make_issue(**overrides) -> IssueMetadata:
+    fields = dict(
+        issue_id=1, issue_number=7, title="Fix typo in docs", body="The README says teh.",
+        labels=["good first issue"], created_at="2026-01-01T00:00:00Z",
+        updated_at="2026-01-02T00:00:00Z", issue_url="https://github.com/o/r/issues/7",
+        repo_name="r", repo_full_name="o/r", repo_stars=100, repo_forks=3,
+        repo_url="https://github.com/o/r", language="Python", repo_license="MIT",
+    )
+    fields.update(overrides)
+    return IssueMetadata(**fields)
+
+
+def stored(issue: IssueMetadata) -> dict:
+    """What ``fetch_by_ids`` hands back (Pinecone returns numbers as floats)."""
+    return {k: float(v) if isinstance(v, int) and not isinstance(v, bool) else v
+            for k, v in issue.model_dump(exclude_none=True).items()}
+
+
+def test_new_issue(issue_text):
+    assert classify_change(make_issue(), None, issue_text).kind == "new"
+
+
+def test_comment_and_assignment_are_metadata_only(issue_text):
+    fetched = make_issue(updated_at="2026-01-03T00:00:00Z", comments_count=4,
+                         is_assigned=True, assignees=["octocat"], repo_stars=120)
+
+    change = classify_change(fetched, stored(make_issue()), issue_text)
+
+    assert change.kind == "metadata"
+    assert set(change.fields) == {
+        "updated_at", "updated_at_ts", "comments_count", "is_assigned", "assignees", "repo_stars"
+    }
+
+
+def test_text_change_needs_embedding(issue_text):
+    fetched = make_issue(updated_at="2026-01-03T00:00:00Z", title="Fix typos in docs")
+
+    assert classify_change(fetched, stored(make_issue()), issue_text).kind == "full"
+
+
+def test_cleared_field_needs_full_upsert(issue_text):
+    fetched = make_issue(updated_at="2026-01-03T00:00:00Z", repo_license=None)
+
+    assert classify_change(fetched, stored(make_issue()), issue_text).kind == "full"
@@ -0,0 +1,234 @@
+"""Tests for the local index replica and its Pinecone-compatible filters."""
+from __future__ import annotations
+
+import fcntl
+import os
+import random
+import threading
+
+import numpy as np
+import pytest
+
+from app.services.local_index import LocalIndex
+from app.services.metadata_columns import MetadataColumns
+
+DIM = 16
+LANGUAGES = ["Python", "Go", "Rust", None]
+LABELS = ["good first issue", "help wanted", "docs", "bug"]
+
+
+def make_metadata(rng: random.Random, i: int) -> dict:
+    labels = rng.sample(LABELS, rng.randint(0, 2))
+    metadata = {
+        "title": f"Issue {i}",
+        "repo_stars": rng.randint(0, 5000),
+        "updated_at_ts": 1_700_000_000 + rng.randint(0, 10**6),
+        "created_at_ts": 1_690_000_000 + rng.randint(0, 10**6),
+        "is_assigned": rng.random() < 0.3,
+        "is_good_first_issue": "good first issue" in labels,
+        "is_help_wanted": "help wanted" in labels,
+        "labels_norm": labels,
+        "topics_norm": rng.sample(["cli", "ai", "web"], rng.randint(0, 2)),
+    }
+    language = rng.choice(LANGUAGES)
+    if language:
+        metadata["language"] = language
+    return metadata
+
+
+def matches(metadata: dict, filter_dict: dict) -> bool:
+    """Reference Pinecone semantics on a single record."""
+    for key, condition in filter_dict.items():
+        if key == "$and":
+            if not all(matches(metadata, c) for c in condition):
+                return False
+            continue
+        if key == "$or":
+            if not any(matches(metadata, c) for c in condition):
+                return False
+            continue
+        for op, value in condition.items():
+            present = key in metadata
+            actual = metadata.get(key)
+            values = actual if isinstance(actual, list) else [actual]
+            ok = {
+                "$eq": lambda: present and value in values,
+                "$ne": lambda: not present or value not in values,
+                "$in": lambda: present and any(v in value for v in values),
+                "$nin": lambda: not present or not any(v in value for v in values),
+                "$gte": lambda: present and actual >= value,
+                "$gt": lambda: present and actual > value,
+                "$lte": lambda: present and actual <= value,
+                "$lt": lambda: present and actual < value,
+            }[op]()
+            if not ok:
+                return False
+    return True
+
+
+FILTERS = [
+    {"type": {"$ne": "stats"}},
+    {"$and": [{"type": {"$ne": "stats"}}, {"language": {"$eq": "Python"}}, {"repo_stars": {"$gte": 1000}}]},
+    {"language": {"$in": ["Go", "Rust"]}, "is_assigned": {"$eq": False}},
+    {"$or": [{"is_good_first_issue": {"$eq": True}}, {"is_help_wanted": {"$eq": True}}]},
+    {"labels_norm": {"$in": ["docs", "bug"]}, "updated_at_ts": {"$gte": 1_700_500_000}},
+    {"topics_norm": {"$nin": ["cli"]}, "language": {"$ne": "Python"}},
+    {"repo_stars": {"$gt": 1000, "$lte": 3000}, "created_at_ts": {"$lt": 1_690_500_000}},
+    {"repo_stars": {"$in": [0, 17, 4096]}, "labels_norm": {"$eq": "missing-label"}},
+]
+
+
+@pytest.fixture
+def corpus():
+    rng = random.Random(3)
+    vectors = np.random.default_rng(3).normal(size=(300, DIM)).astype(np.float32)
+    return [(f"owner/repo#{i}", vectors[i].tolist(), make_metadata(rng, i)) for i in range(300)]
+
+
+@pytest.fixture
+def index(tmp_path, corpus):
+    local = LocalIndex.create(str(tmp_path / "index"), DIM, reload_interval_seconds=0)
+    for vector_id, values, metadata in corpus:
+        local.upsert(vector_id, values, metadata)
+    local.save()
+    return local
+
+
+@pytest.mark.parametrize("filter_dict", FILTERS)
+def test_filter_semantics_match_pinecone(corpus, filter_dict):
+    columns = MetadataColumns.from_metadata([m for _, _, m in corpus])
+
+    expected = [matches(m, filter_dict) for _, _, m in corpus]
+
+    assert columns.evaluate(filter_dict).tolist() == expected
+
+
+def test_bitmap_ranges_respect_boundaries():
+    columns = MetadataColumns.from_metadata([{"repo_stars": s} for s in (5, 10, 10, 20)] + [{}])
+
+    assert columns.evaluate({"repo_stars": {"$gte": 10}}).tolist() == [False, True, True, True, False]
+    assert columns.evaluate({"repo_stars": {"$gt": 10}}).tolist() == [False, False, False, True, False]
+    assert columns.evaluate({"repo_stars": {"$lt": 10}}).tolist() == [True, False, False, False, False]
+    assert columns.evaluate({"repo_stars": {"$ne": 10}}).tolist() == [True, False, False, True, True]
+
+
+def test_facet_counts_match_filtered_rows(index, corpus):
+    filter_dict = FILTERS[2]
+    kept = [m for _, _, m in corpus if matches(m, filter_dict)]
+
+    result = index.facets(filter_dict, ["language", "labels_norm", "is_assigned"])
+
+    assert result["total"] == len(kept)
+    facets = result["facets"]
+    for language in ("Go", "Rust"):
+        assert facets["language"][language] == sum(m.get("language") == language for m in kept)
+    assert facets["labels_norm"] == {
+        label: n for label in LABELS
+        if (n := sum(label in m["labels_norm"] for m in kept))
+    }
+    assert facets["is_assigned"] == {False: len(kept)}
+
+
+def test_facets_skip_deleted_rows(index, corpus):
+    index.delete([vector_id for vector_id, _, _ in corpus[:10]])
+    index.save()
+
+    assert index.facets(None, [])["total"] == 290
+
+
+def test_exact_search_matches_brute_force(index, corpus):
+    query = np.random.default_rng(9).normal(size=DIM)
+    filter_dict = FILTERS[2]
+
+    results = index.search(query.tolist(), top_k=10, filter_dict=filter_dict)
+
+    unit = lambda v: np.asarray(v) / np.linalg.norm(v)
+    scored = sorted(
+        ((float(unit(v) @ unit(query)), i) for i, v, m in corpus if matches(m, filter_dict)),
+        reverse=True,
+    )[:10]
+    assert [r["id"] for r in results] == [i for _, i in scored]
+    assert results[0]["score"] == pytest.approx(scored[0][0], abs=1e-2)
+    assert results[0]["metadata"]["title"]
+
+
+def test_upsert_replaces_and_delete_removes(index, corpus):
+    vector_id, values, metadata = corpus[0]
+    index.upsert(vector_id, values, {**metadata, "title": "Renamed"})
+    index.delete([corpus[1][0]])
+    index.save()
+
+    assert index.fetch_by_ids([vector_id, corpus[1][0]]) == {vector_id: {**metadata, "title": "Renamed"}}
+    assert len(index) == 299
+    top = index.search(values, top_k=1)
+    assert top[0]["id"] == vector_id and top[0]["metadata"]["title"] == "Renamed"
+
+
+def test_metadata_update_keeps_vector(index, corpus):
+    vector_id, values, metadata = corpus[2]
+    index.update_metadata(vector_id, {"is_assigned": True, "repo_stars": 1})
+    index.update_metadata("owner/repo#missing", {"repo_stars": 1})
+    index.save()
+
+    assert index.fetch_by_ids([vector_id])[vector_id] == {**metadata, "is_assigned": True, "repo_stars": 1}
+    assert index.search(values, top_k=1)[0]["id"] == vector_id
+    assert len(index) == 300
+
+
+def test_reader_picks_up_writer_saves(index, tmp_path, corpus):
+    reader = LocalIndex(str(tmp_path / "index"), reload_interval_seconds=0)
+    index.delete([corpus[0][0]])
+    index.save()
+
+    assert reader.fetch_by_ids([corpus[0][0]]) == {}
+
+
+def test_ivf_with_every_list_probed_equals_exact(index):
+    query = np.random.default_rng(5).normal(size=DIM).tolist()
+    exact = index.search(query, top_k=5, filter_dict=FILTERS[0])
+
+    index.train_ivf(nlist=8)
+    index.mode, index.nprobe = "ivf", 8
+
+    assert [r["id"] for r in index.search(query, top_k=5, filter_dict=FILTERS[0])] == [r["id"] for r in exact]
+
+
+def test_compaction_keeps_live_rows(index, corpus):
+    index.delete([vector_id for vector_id, _, _ in corpus[:100]])
+    index.save()  # > 25% dead triggers compaction
+
+    assert len(index) == 200
+    assert index._state.rows == 200
+    vector_id, values, _ = corpus[150]
+    assert index.search(values, top_k=1)[0]["id"] == vector_id
+
+
+def test_compaction_keeps_previous_epoch_until_next_publish(index, tmp_path, corpus):
+    path = tmp_path / "index"
+    index.delete([vector_id for vector_id, _, _ in corpus[:100]])
+    index.save()  # compacts to epoch 1
+
+    # A reader that read the epoch-0 manifest just before can still open its files
+    assert (path / "vectors-0.f16").exists() and (path / "documents-0.jsonl").exists()
+
+    index.delete([corpus[150][0]])
+    index.save()
+
+    assert not (path / "vectors-0.f16").exists()
+    assert (path / "vectors-1.f16").exists()
+
+
+def test_save_waits_for_another_writer(index, tmp_path, corpus):
+    vector_id, values, metadata = corpus[0]
+    index.upsert(vector_id, values, {**metadata, "title": "Renamed"})
+
+    with open(os.path.join(tmp_path / "index", "write.lock"), "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)  # as another process's writer would
+        writer = threading.Thread(target=index.save)
+        writer.start()
+        writer.join(timeout=0.2)
+        assert writer.is_alive()
+        fcntl.flock(lock, fcntl.LOCK_UN)
+    writer.join(timeout=5)
+
+    assert index.fetch_by_ids([vector_id])[vector_id]["title"] == "Renamed"
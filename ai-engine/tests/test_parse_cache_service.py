@@ -0,0 +1,104 @@
+"""Tests for the parsed-query cache and its wiring into QueryParser."""
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.models.query import ParsedQuery
+from app.services.memory_cache import LRUCache
+from app.services.parse_cache_service import ParseCacheService, normalize_query
+
+
+@pytest.fixture
+def parser():
+    """QueryParser with a fake Gemini client and the shared tier disabled."""
+    from app.services.query_parser import QueryParser
+
+    with patch("app.services.query_parser.get_genai_client"):
+        qp = QueryParser()
+    qp.cache.use_shared_tier = False
+    response = MagicMock()
+    response.text = '{"semantic_query": "web frameworks", "language": "Python"}'
+    qp.client.models.generate_content.return_value = response
+    return qp
+
+
+def test_normalize_query_collapses_case_and_whitespace():
+    assert normalize_query("  Python   Good First Issue ") == "python good first issue"
+
+
+def test_lru_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert "a" in cache and "c" in cache
+    assert "b" not in cache
+
+
+def test_lru_respects_ttl(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr("app.services.memory_cache.time.monotonic", lambda: clock[0])
+    cache = LRUCache(maxsize=4, ttl_seconds=10)
+    cache.set("k", "v")
+    assert cache.get("k") == "v"
+    clock[0] += 11
+    assert cache.get("k") is None
+
+
+def test_repeat_query_skips_llm(parser):
+    first = parser.parse("Python web frameworks")
+    second = parser.parse("python   WEB frameworks")
+
+    assert first == second
+    assert parser.client.models.generate_content.call_count == 1
+
+
+def test_cached_result_is_a_fresh_copy(parser):
+    parser.parse("python web frameworks").language = "Rust"
+    assert parser.parse("python web frameworks").language == "Python"
+
+
+def test_failed_parse_is_not_cached(parser):
+    parser.client.models.generate_content.return_value.text = "not json"
+    assert parser.parse("flaky query") == ParsedQuery(semantic_query="flaky query")
+
+    parser.client.models.generate_content.return_value.text = '{"semantic_query": "ok"}'
+    assert parser.parse("flaky query").semantic_query == "ok"
+    assert parser.client.models.generate_content.call_count == 2
+
+
+def test_prompt_version_change_misses():
+    old = ParseCacheService("v1", use_shared_tier=False)
+    old.put("rust cli", ParsedQuery(semantic_query="cli"))
+    assert old.cache_key("rust cli") != ParseCacheService("v2").cache_key("rust cli")
+
+
+def test_shared_tier_skipped_without_database(monkeypatch):
+    monkeypatch.setattr("app.database.SessionLocal", None)
+    cache = ParseCacheService("v1")
+    assert cache.get_shared("anything") is None
+    cache.put("anything", ParsedQuery(semantic_query="x"))
+    assert cache.get_local("anything").semantic_query == "x"
+
+
+def test_each_parse_counts_one_memory_lookup(parser):
+    parser.parse("python web frameworks")
+    parser.parse("python web frameworks")
+
+    stats = parser.cache.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_async_parse_populates_the_same_cache(parser):
+    response = MagicMock(text='{"semantic_query": "async web", "language": "Go"}')
+    parser.client.aio.models.generate_content = AsyncMock(return_value=response)
+
+    parsed = await parser.aparse_remote("go web frameworks")
+
+    assert parsed.language == "Go"
+    assert parser.parse("Go web frameworks").language == "Go"
+    parser.client.models.generate_content.assert_not_called()
@@ -0,0 +1,72 @@
+"""Tests for the async Pinecone query and fetch paths."""
+from __future__ import annotations
+
+import json
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_asearch_posts_query_over_shared_client():
+    from app.services.pinecone_client import PineconeClient
+
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={"matches": [
+            {"id": "a/b#1", "score": 0.9, "metadata": {"title": "One"}},
+            {"id": "a/b#2", "score": 0.8},
+        ]})
+
+    with patch("app.services.pinecone_client.Pinecone"):
+        client = PineconeClient()
+    client._host = "idx.svc.pinecone.io"
+    http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    with patch("app.services.pinecone_client.get_http_client", return_value=http):
+        results = await client.asearch([0.1, 0.2], top_k=2, filter_dict={"type": {"$ne": "stats"}})
+
+    assert results == [
+        {"id": "a/b#1", "score": 0.9, "metadata": {"title": "One"}},
+        {"id": "a/b#2", "score": 0.8, "metadata": {}},
+    ]
+    request = requests[0]
+    assert str(request.url) == "https://idx.svc.pinecone.io/query"
+    assert request.headers["Api-Key"] == "test-pinecone-key"
+    assert json.loads(request.content) == {
+        "vector": [0.1, 0.2],
+        "topK": 2,
+        "includeMetadata": True,
+        "includeValues": False,
+        "filter": {"type": {"$ne": "stats"}},
+    }
+
+
+@pytest.mark.asyncio
+async def test_afetch_by_ids_batches_ids_over_shared_client():
+    from app.services.pinecone_client import PineconeClient
+
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        ids = request.url.params.get_list("ids")
+        return httpx.Response(200, json={"vectors": {
+            vector_id: {"id": vector_id, "values": [0.1, 0.2], "metadata": {"title": vector_id}}
+            for vector_id in ids if vector_id != "a/b#gone"
+        }})
+
+    with patch("app.services.pinecone_client.Pinecone"):
+        client = PineconeClient()
+    client._host = "idx.svc.pinecone.io"
+    http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    with patch("app.services.pinecone_client.get_http_client", return_value=http):
+        results = await client.afetch_by_ids(["a/b#1", "a/b#2", "a/b#gone"], batch_size=2)
+
+    assert results == {"a/b#1": {"title": "a/b#1"}, "a/b#2": {"title": "a/b#2"}}
+    assert len(requests) == 2
+    assert all(r.url.path == "/vectors/fetch" for r in requests)
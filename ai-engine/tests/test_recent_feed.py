@@ -0,0 +1,189 @@
+"""Tests for the materialized recent-issues feed."""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.models.query import RecentFeedSpec
+from app.services.recent_feed import RecentFeed
+from app.services.search_metrics import search_metrics
+
+NOW = datetime.now(timezone.utc)
+
+
+def make_match(n: int, *, hours_ago: float, language="Python", labels=(), assigned=False,
+               stars=100, created_hours_ago: float | None = None, score=0.5) -> dict:
+    updated = NOW - timedelta(hours=hours_ago)
+    created = NOW - timedelta(hours=created_hours_ago if created_hours_ago is not None else hours_ago)
+    return {
+        "id": f"owner/repo#{n}",
+        "score": score,
+        "metadata": {
+            "issue_id": n, "issue_number": n, "title": f"Issue {n}",
+            "repo_name": "repo", "repo_full_name": "owner/repo",
+            "repo_stars": stars, "repo_forks": 0, "language": language,
+            "labels": list(labels), "comments_count": 0,
+            "issue_url": f"https://github.com/owner/repo/issues/{n}",
+            "repo_url": "https://github.com/owner/repo",
+            "is_assigned": assigned,
+            "created_at": created.isoformat(), "updated_at": updated.isoformat(),
+            "created_at_ts": created.timestamp(), "updated_at_ts": updated.timestamp(),
+        },
+    }
+
+
+@pytest.fixture
+def feed():
+    matches = [
+        make_match(1, hours_ago=1, labels=["Good First Issue"], score=0.9),
+        make_match(2, hours_ago=5, language="Rust", assigned=True, stars=5000, score=0.8),
+        make_match(3, hours_ago=48, created_hours_ago=200, labels=["help wanted"], score=0.7),
+        make_match(4, hours_ago=2, created_hours_ago=30, language="Go", score=0.6),
+    ]
+    return RecentFeed.build(
+        matches, [m["score"] for m in matches],
+        newest_complete=True, updated_complete=True,
+    )
+
+
+def ids(served):
+    return [m["metadata"]["issue_number"] for m, _ in served]
+
+
+def query(feed, **kwargs):
+    params = dict(limit=10, sort_by="recently_discussed", languages=None, labels=None,
+                  days_ago=None, unassigned_only=False, now_ts=NOW.timestamp())
+    params.update(kwargs)
+    return feed.query(**params)
+
+
+def test_recently_discussed_orders_by_updated_at(feed):
+    assert ids(query(feed)) == [1, 4, 2, 3]
+
+
+def test_newest_only_covers_last_24h_of_creation(feed):
+    assert ids(query(feed, sort_by="newest")) == [1, 2]
+
+
+def test_filters_combine(feed):
+    assert ids(query(feed, languages=["Python", "Rust"], unassigned_only=True)) == [1, 3]
+    assert ids(query(feed, labels=["good first issue", "HELP WANTED"])) == [1, 3]
+    assert ids(query(feed, sort_by="stars", languages=["Rust"])) == [2]
+
+
+def test_days_ago_window(feed):
+    assert ids(query(feed, days_ago=1)) == [1, 4, 2]
+    assert query(feed, days_ago=90) is None
+
+
+def test_truncated_window_defers_to_pinecone(feed):
+    feed.updated_complete = False
+    feed.fetch_k = 3
+    assert query(feed, languages=["Go"], limit=5) is None
+    # Ranks only what the query would have fetched: the top 3 by score, not #4
+    assert ids(query(feed, limit=2)) == [1, 2]
+
+
+def test_labels_post_filter_the_fetched_prefix(feed):
+    feed.fetch_k = 2
+
+    # Without normalized filters the query fetches the top 2, then filters labels
+    assert ids(query(feed, labels=["help wanted"])) == []
+    feed.labels_in_filter = True
+    assert ids(query(feed, labels=["help wanted"])) == [3]
+
+
+def test_truncated_window_stops_at_its_lowest_score(feed):
+    feed.updated_complete = False
+    feed.updated_floor = 0.75  # matches 3 and 4 may have company that was cut off
+    feed.fetch_k = 2
+
+    assert ids(query(feed)) == [1, 2]
+    assert query(feed, languages=["Go"]) is None
+
+
+@pytest.mark.asyncio
+async def test_engine_serves_from_feed_after_refresh(search_engine):
+    matches = [make_match(1, hours_ago=1), make_match(2, hours_ago=3)]
+    search_engine.pinecone.search.return_value = matches
+
+    await search_engine.refresh_recent_feed()
+    calls = search_engine.pinecone.search.call_count
+    results = await search_engine.get_recent_issues(limit=5, sort_by="recently_discussed")
+
+    assert [r.issue_number for r in results] == [1, 2]
+    assert search_engine.pinecone.search.call_count == calls
+    assert search_metrics.count("recent_feed.hit") == 1
+
+
+@pytest.mark.asyncio
+async def test_invalidated_feed_falls_back_and_rebuilds(search_engine):
+    search_engine.pinecone.search.return_value = [make_match(1, hours_ago=1)]
+    await search_engine.refresh_recent_feed()
+    search_engine.invalidate_recent_feed()
+
+    await search_engine.get_recent_issues(limit=5, sort_by="recently_discussed")
+    assert search_metrics.count("recent_feed.miss") == 1
+
+    await asyncio.wait_for(search_engine._recent_feed_task, timeout=1)
+    await search_engine.get_recent_issues(limit=1, sort_by="recently_discussed")
+    assert search_metrics.count("recent_feed.hit") == 1
+
+
+@pytest.mark.asyncio
+async def test_startup_and_first_request_share_one_refresh(search_engine):
+    search_engine.pinecone.search.return_value = [make_match(1, hours_ago=1)]
+
+    await asyncio.gather(
+        search_engine.warm_up(),
+        search_engine.get_recent_issues(limit=1, sort_by="recently_discussed"),
+    )
+
+    # One rebuild queries the newest and recently-updated windows once each
+    refreshes = [
+        c for c in search_engine.pinecone.search.call_args_list
+        if c.kwargs["top_k"] == search_engine.recent_feed_top_k
+    ]
+    assert len(refreshes) == 2
+
+
+@pytest.mark.asyncio
+async def test_batch_feeds_share_one_vector_query(search_engine):
+    search_engine.recent_feed_enabled = False
+    search_engine.pinecone.search.return_value = [
+        make_match(1, hours_ago=1, score=0.9),
+        make_match(2, hours_ago=5, language="Rust", score=0.8),
+        make_match(3, hours_ago=48, created_hours_ago=200, labels=["help wanted"], score=0.7),
+    ]
+
+    feeds = await search_engine.get_recent_feeds([
+        RecentFeedSpec(sort_by="newest"),
+        RecentFeedSpec(languages=["Rust"]),
+        RecentFeedSpec(labels=["Help Wanted"]),
+    ])
+
+    assert [[r.issue_number for r in feed] for feed in feeds] == [[1, 2], [2], [3]]
+    search_engine.pinecone.search.assert_called_once()
+    assert "$or" in search_engine.pinecone.search.call_args.kwargs["filter_dict"]
+    search_engine.embedder.generate_query_embedding.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_batch_feed_short_of_truncated_window_queries_alone(search_engine, monkeypatch):
+    monkeypatch.setattr("app.services.search_engine.RECENT_FETCH_K", 2)
+    search_engine.recent_feed_enabled = False
+    search_engine.recent_feed_top_k = 2
+    search_engine.pinecone.search.return_value = [
+        make_match(1, hours_ago=1), make_match(2, hours_ago=2),
+    ]
+
+    feeds = await search_engine.get_recent_feeds([
+        RecentFeedSpec(limit=2),
+        RecentFeedSpec(limit=2, languages=["Go"]),
+    ])
+
+    assert [r.issue_number for r in feeds[0]] == [1, 2]
+    assert search_metrics.count("recent_batch.fallback") == 1
+    assert search_engine.pinecone.search.call_count == 2
@@ -0,0 +1,53 @@
+"""Tests for the columnar reranker against the per-match loop it replaced."""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from app.services import reranker
+from tests.rerank_cases import legacy_rank, make_matches
+
+
+@pytest.mark.parametrize("sort_by", [None, "stars", "recently_discussed"])
+@pytest.mark.parametrize("topics", [None, ["cli", "AI"]])
+def test_rank_matches_legacy_loop(sort_by, topics):
+    matches = make_matches(300, seed=11)
+    now_ts = datetime.now(timezone.utc).timestamp()
+
+    order, scores = reranker.rank(matches, now_ts=now_ts, sort_by=sort_by, topics=topics)
+
+    assert [(int(i), float(scores[i])) for i in order] == legacy_rank(matches, topics, sort_by)
+
+
+def test_labels_filter_is_case_insensitive():
+    matches = [
+        {"score": 0.9, "metadata": {"labels": ["Good First Issue"], "updated_at_ts": 1}},
+        {"score": 0.8, "metadata": {"labels": ["bug"], "updated_at_ts": 1}},
+    ]
+
+    order, _ = reranker.rank(matches, now_ts=2, labels=["good first issue"])
+
+    assert order.tolist() == [0]
+
+
+def test_missing_timestamp_falls_back_to_iso_then_default():
+    now_ts = datetime(2026, 1, 11, tzinfo=timezone.utc).timestamp()
+    matches = [
+        {"score": 1.0, "metadata": {"updated_at": "2026-01-01T00:00:00Z"}},
+        {"score": 1.0, "metadata": {"updated_at": "not a date"}},
+    ]
+
+    scores = reranker.combined_scores(matches, now_ts)
+
+    assert scores[0] == round(0.7 + 0.3 * (1 - 10 / reranker.MAX_AGE_DAYS), 4)
+    assert scores[1] == 0.7 + 0.3 * reranker.DEFAULT_RECENCY
+
+
+def test_top_k_keeps_original_order_for_ties_at_the_cut():
+    keys = np.array([1.0, 3.0, 2.0, 2.0, 2.0, 0.5])
+
+    assert reranker.top_k_desc(keys, 3).tolist() == [1, 2, 3]
+    assert reranker.top_k_desc(keys).tolist() == [1, 2, 3, 4, 0, 5]
+    assert reranker.top_k_desc(keys, 0).tolist() == []
@@ -0,0 +1,79 @@
+"""Tests for the deterministic keyword fast path."""
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+
+from app.services.rule_parser import RuleBasedParser
+from app.services.search_metrics import search_metrics
+
+
+@pytest.fixture
+def rules():
+    return RuleBasedParser()
+
+
+def test_keyword_query_is_fully_recognised(rules):
+    result = rules.try_parse("python good first issue unassigned")
+
+    assert result is not None
+    assert result.confidence == 1.0
+    parsed = result.parsed
+    assert parsed.language == "Python"
+    assert parsed.labels == ["good first issue"]
+    assert parsed.difficulty == "beginner"
+    assert parsed.unassigned_only is True
+    assert parsed.semantic_query == "beginner friendly contributions"
+
+
+def test_recency_and_popularity_intents(rules):
+    parsed = rules.try_parse("recent popular rust issues help wanted").parsed
+
+    assert parsed.days_ago == 7
+    assert parsed.sort_by == "recently_discussed"
+    assert parsed.min_stars == 1000
+    assert parsed.labels == ["help wanted"]
+    assert parsed.language == "Rust"
+
+
+def test_topics_become_semantic_query(rules):
+    parsed = rules.try_parse("machine learning projects unassigned").parsed
+
+    assert parsed.topics == ["machine-learning", "deep-learning", "ai"]
+    assert parsed.semantic_query == "machine learning AI"
+
+
+def test_leftover_text_defers_to_llm(rules):
+    result = rules.parse("python async websocket reconnection")
+
+    assert result.leftover == ["async", "websocket", "reconnection"]
+    assert result.confidence == 0.25
+    assert rules.try_parse("python async websocket reconnection") is None
+
+
+def test_pure_filler_defers_to_llm(rules):
+    assert rules.try_parse("open source issues") is None
+
+
+def test_lower_threshold_keeps_leftover_in_semantic_query():
+    parsed = RuleBasedParser(min_confidence=0.75).try_parse(
+        "rust good first issue parser"
+    ).parsed
+    assert parsed.semantic_query == "parser"
+    assert parsed.language == "Rust"
+
+
+def test_query_parser_skips_llm_for_keyword_queries():
+    from app.services.query_parser import QueryParser
+
+    search_metrics.reset()
+    with patch("app.services.query_parser.get_genai_client"):
+        qp = QueryParser()
+
+    parsed = qp.parse("typescript easy unclaimed")
+
+    assert parsed.language == "TypeScript"
+    assert parsed.unassigned_only is True
+    qp.client.models.generate_content.assert_not_called()
+    assert search_metrics.count("parse.fast_path") == 1
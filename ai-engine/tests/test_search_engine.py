@@ -0,0 +1,477 @@
+"""Tests for SearchEngine orchestration (parsing budget, fallbacks)."""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models.query import ParsedQuery, SearchQuery
+from app.services.request_timing import start_request
+from app.services.search_metrics import search_metrics
+
+
+# ─── Parse latency budget ────────────────────────────────────────────────────
+
+@pytest.mark.asyncio
+async def test_slow_parse_falls_back_to_raw_query(search_engine):
+    search_engine.parse_timeout = 0.05
+    async def slow_parse(q):
+        await asyncio.sleep(0.5)
+        return ParsedQuery(semantic_query="never used")
+    search_engine.query_parser.aparse_remote.side_effect = slow_parse
+
+    results, parsed = await search_engine.search(
+        SearchQuery(query="rust async runtime", language="Rust")
+    )
+
+    assert results == []
+    assert parsed.semantic_query == "rust async runtime"
+    assert parsed.language == "Rust"  # manual filters still applied
+    search_engine.embedder.generate_query_embedding.assert_called_once_with("rust async runtime")
+    assert search_metrics.count("parse.timeout") == 1
+    assert search_metrics.count("parse.fallback") == 1
+
+
+@pytest.mark.asyncio
+async def test_fast_parse_is_used(search_engine):
+    search_engine.query_parser.parse_remote.return_value = ParsedQuery(
+        semantic_query="machine learning", language="Python"
+    )
+
+    _, parsed = await search_engine.search(SearchQuery(query="python ml issues"))
+
+    assert parsed.semantic_query == "machine learning"
+    assert parsed.language == "Python"
+    assert search_metrics.count("parse.timeout") == 0
+    assert search_metrics.snapshot()["latency_ms"]["parse"]["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_parser_exception_falls_back(search_engine):
+    search_engine.query_parser.parse_remote.side_effect = RuntimeError("boom")
+
+    _, parsed = await search_engine.search(SearchQuery(query="docs typo"))
+
+    assert parsed.semantic_query == "docs typo"
+    assert search_metrics.count("parse.fallback") == 1
+
+
+@pytest.mark.asyncio
+async def test_search_records_stage_timings(search_engine):
+    search_engine.query_parser.parse_remote.return_value = ParsedQuery(semantic_query="machine learning")
+    timings = start_request()
+
+    await search_engine.search(SearchQuery(query="python ml issues"))
+
+    assert {"parse", "embed", "filter", "vector_query", "rerank", "serialize"} <= set(timings)
+    assert all(ms >= 0 for ms in timings.values())
+
+
+def test_latency_percentiles_from_histogram():
+    for ms in range(1, 101):
+        search_metrics.observe_ms("demo", float(ms))
+
+    stats = search_metrics.snapshot()["latency_ms"]["demo"]
+
+    assert stats["count"] == 100
+    assert stats["p50"] == pytest.approx(50, rel=0.1)
+    assert stats["p95"] == pytest.approx(95, rel=0.1)
+    assert stats["p99"] <= stats["max"] == 100
+
+
+# ─── Speculative embedding ───────────────────────────────────────────────────
+
+@pytest.mark.asyncio
+async def test_speculative_embedding_reused_when_text_unchanged(search_engine):
+    search_engine.query_parser.parse_remote.return_value = ParsedQuery(
+        semantic_query="Rust Async Runtime", language="Rust"
+    )
+
+    await search_engine.search(SearchQuery(query="rust async runtime"))
+
+    search_engine.embedder.generate_query_embedding.assert_called_once_with("rust async runtime")
+    assert search_metrics.count("speculation.hit") == 1
+    assert search_metrics.snapshot()["rates"]["speculation_hit_rate"] == 1.0
+
+
+@pytest.mark.asyncio
+async def test_speculative_embedding_discarded_when_text_rewritten(search_engine):
+    search_engine.query_parser.parse_remote.return_value = ParsedQuery(
+        semantic_query="machine learning AI"
+    )
+
+    await search_engine.search(SearchQuery(query="unassigned ml stuff for newbies"))
+
+    embedded = [c.args[0] for c in search_engine.embedder.generate_query_embedding.call_args_list]
+    assert embedded[-1] == "machine learning AI"
+    assert search_metrics.count("speculation.miss") == 1
+
+
+@pytest.mark.asyncio
+async def test_local_parse_does_not_speculate(search_engine):
+    search_engine.query_parser.parse_local.return_value = ParsedQuery(
+        semantic_query="beginner friendly contributions", language="Python"
+    )
+
+    await search_engine.search(SearchQuery(query="python good first issue"))
+
+    search_engine.query_parser.parse_remote.assert_not_called()
+    search_engine.embedder.generate_query_embedding.assert_called_once_with(
+        "beginner friendly contributions"
+    )
+    assert search_metrics.count("speculation.hit") == search_metrics.count("speculation.miss") == 0
+
+
+# ─── Query embedding cache ───────────────────────────────────────────────────
+
+@pytest.fixture
+def embedder():
+    from unittest.mock import MagicMock, patch
+
+    from app.services.embedder import EmbeddingService
+
+    search_metrics.reset()
+    with patch("app.services.embedder.get_genai_client"):
+        service = EmbeddingService()
+    embedding = MagicMock()
+    embedding.values = [0.5] * 4
+    service.client.models.embed_content.return_value.embeddings = [embedding]
+    return service
+
+
+def test_repeat_query_embedding_skips_gemini(embedder):
+    first = embedder.generate_query_embedding("rust cli")
+    second = embedder.generate_query_embedding("rust cli")
+
+    assert first == second == [0.5] * 4
+    assert embedder.client.models.embed_content.call_count == 1
+    assert search_metrics.count("embed_cache.hit") == 1
+
+
+def test_precomputed_query_survives_lru_eviction(embedder):
+    embedder._query_cache.maxsize = 1
+    embedder.precompute_query_embeddings(["homepage feed"])
+    embedder.generate_query_embedding("a")
+    embedder.generate_query_embedding("b")
+
+    calls = embedder.client.models.embed_content.call_count
+    embedder.generate_query_embedding("homepage feed")
+    assert embedder.client.models.embed_content.call_count == calls
+
+
+def test_cached_embedding_is_copied(embedder):
+    embedder.generate_query_embedding("go").append(1.0)
+    assert len(embedder.generate_query_embedding("go")) == 4
+
+
+# ─── Server-side label / topic filters ───────────────────────────────────────
+
+def _conditions(pinecone_filter: dict) -> list[dict]:
+    return pinecone_filter.get("$and", [pinecone_filter])
+
+
+def test_topics_pushed_down_when_enabled(search_engine):
+    search_engine.normalized_filters = True
+    parsed = ParsedQuery(
+        semantic_query="cli", topics=["CLI", "Terminal"], labels=["good first issue", "Docs"],
+    )
+
+    conditions = _conditions(search_engine._build_filter(parsed))
+
+    assert {"topics_norm": {"$in": ["cli", "terminal"]}} in conditions
+    assert {"is_good_first_issue": {"$eq": True}} in conditions
+    # Search never filtered on other labels; pushing them down would drop matches
+    assert not any("labels_norm" in c for c in conditions)
+
+
+def test_normalized_filters_off_by_default(search_engine):
+    parsed = ParsedQuery(semantic_query="cli", topics=["cli"], labels=["docs"])
+
+    conditions = _conditions(search_engine._build_filter(parsed))
+
+    assert not any("topics_norm" in c or "labels_norm" in c for c in conditions)
+
+
+@pytest.mark.asyncio
+async def test_recent_labels_filtered_in_pinecone_when_enabled(search_engine):
+    search_engine.normalized_filters = True
+    search_engine.recent_feed_enabled = False
+
+    await search_engine.get_recent_issues(labels=["Good First Issue"], sort_by="relevance")
+
+    filter_dict = search_engine.pinecone.search.call_args.kwargs["filter_dict"]
+    assert filter_dict["labels_norm"] == {"$in": ["good first issue"]}
+
+
+@pytest.mark.asyncio
+async def test_facets_apply_labels_and_recent_window(search_engine, tmp_path):
+    import time
+    from app.services.local_index import LocalIndex
+
+    now = int(time.time())
+    rows = {
+        "a/x#1": {"labels_norm": ["docs"], "language": "Python", "updated_at_ts": now - 86400},
+        "a/x#2": {"labels_norm": ["bug"], "language": "Python", "updated_at_ts": now - 86400},
+        "a/x#3": {"labels_norm": ["docs"], "language": "Go", "updated_at_ts": now - 86400 * 90},
+    }
+    local = LocalIndex.create(str(tmp_path / "index"), 4, reload_interval_seconds=0)
+    for vector_id, metadata in rows.items():
+        local.upsert(vector_id, [1.0, 0.0, 0.0, 0.0], metadata)
+    local.save()
+    search_engine.local_index = local
+
+    result = await search_engine.facets(["language"], labels=["Docs"])
+
+    # The bug issue fails the label, the Go one the default 30-day window
+    assert result["total"] == 1
+    assert result["facets"]["language"] == {"Python": 1}
+
+
+# ─── Adaptive fetch size ─────────────────────────────────────────────────────
+
+def _pool(size: int, every: int) -> list[dict]:
+    """Pinecone matches where every ``every``-th repo has the "cli" topic."""
+    return [
+        {
+            "id": f"owner/repo#{i}",
+            "score": 1.0 - i / 1000,
+            "metadata": {
+                "updated_at_ts": 1_700_000_000, "repo_stars": 1,
+                "repo_topics": ["cli"] if i % every == 0 else [],
+            },
+        }
+        for i in range(size)
+    ]
+
+
+def _serve(search_engine, pool: list[dict]) -> list[int]:
+    search_engine.adaptive_fetch = True
+    top_ks = []
+
+    def search(query_embedding, top_k, filter_dict, **kwargs):
+        top_ks.append(top_k)
+        return pool[:top_k]
+
+    search_engine.pinecone.search.side_effect = search
+    search_engine.query_parser.parse_local.return_value = ParsedQuery(semantic_query="cli", topics=["cli"])
+    return top_ks
+
+
+@pytest.mark.asyncio
+async def test_unfiltered_search_fetches_about_one_page(search_engine):
+    top_ks = _serve(search_engine, _pool(500, every=1))
+    search_engine.query_parser.parse_local.return_value = ParsedQuery(semantic_query="python")
+
+    candidates, _, complete = await search_engine.search_candidates(SearchQuery(query="python", limit=10))
+
+    assert top_ks == [20]
+    assert len(candidates) == 20
+    assert complete is False
+
+
+@pytest.mark.asyncio
+async def test_selective_filter_widens_until_page_is_filled(search_engine):
+    top_ks = _serve(search_engine, _pool(500, every=5))
+
+    candidates, _, _ = await search_engine.search_candidates(SearchQuery(query="cli", limit=10))
+
+    assert len(candidates) >= 10
+    assert top_ks == [30, 75]
+    assert search_metrics.count("fetch.rounds") == 2
+    assert search_metrics.count("fetch.wasted") == 105 - 10
+
+
+@pytest.mark.asyncio
+async def test_learned_selectivity_sizes_next_fetch(search_engine):
+    search_engine.semantic_cache = None  # the repeat query would be served from it
+    top_ks = _serve(search_engine, _pool(500, every=5))
+
+    await search_engine.search_candidates(SearchQuery(query="cli", limit=10))
+    await search_engine.search_candidates(SearchQuery(query="cli", limit=10))
+
+    assert top_ks[-1] == 75  # one round, sized from the observed 1-in-5 survival
+
+
+@pytest.mark.asyncio
+async def test_fetch_stops_at_ceiling(search_engine):
+    top_ks = _serve(search_engine, _pool(500, every=50))
+
+    candidates, _, complete = await search_engine.search_candidates(SearchQuery(query="cli", limit=10))
+
+    assert top_ks[-1] == search_engine.fetch_max_top_k
+    assert len(candidates) == 2
+    assert complete is True
+    assert search_metrics.count("fetch.ceiling_hit") == 1
+
+
+# ─── Semantic result cache ───────────────────────────────────────────────────
+
+@pytest.mark.asyncio
+async def test_paraphrase_reuses_cached_ranking(search_engine):
+    _serve(search_engine, _pool(100, every=1))
+    search_engine.query_parser.parse_local.side_effect = lambda q: ParsedQuery(semantic_query=q, language="Python")
+    embeddings = {"beginner python issues": [1.0, 0.0, 0.0, 0.0], "easy python issues": [0.99, 0.05, 0.0, 0.0]}
+    search_engine.embedder.generate_query_embedding.side_effect = lambda q: embeddings[q]
+
+    first, _, _ = await search_engine.search_candidates(SearchQuery(query="beginner python issues", limit=10))
+    calls = search_engine.pinecone.search.call_count
+    second, _, _ = await search_engine.search_candidates(SearchQuery(query="easy python issues", limit=10))
+
+    assert search_engine.pinecone.search.call_count == calls
+    assert [c.id for c in second] == [c.id for c in first]
+    assert search_metrics.count("semantic_cache.hit") == 1
+
+
+@pytest.mark.asyncio
+async def test_semantic_cache_needs_same_filters_and_close_vector(search_engine):
+    _serve(search_engine, _pool(100, every=1))
+    vectors = iter([[1.0, 0.0, 0.0, 0.0], [1.0, 0.0, 0.0, 0.0], [0.0, 1.0, 0.0, 0.0]])
+    search_engine.embedder.generate_query_embedding.side_effect = lambda q: next(vectors)
+
+    search_engine.query_parser.parse_local.return_value = ParsedQuery(semantic_query="python", language="Python")
+    await search_engine.search_candidates(SearchQuery(query="python issues", limit=10))
+    search_engine.query_parser.parse_local.return_value = ParsedQuery(semantic_query="python", language="Rust")
+    await search_engine.search_candidates(SearchQuery(query="rust issues", limit=10))
+    search_engine.query_parser.parse_local.return_value = ParsedQuery(semantic_query="python", language="Python")
+    await search_engine.search_candidates(SearchQuery(query="python docs", limit=10))
+
+    assert search_engine.pinecone.search.call_count == 3
+    assert search_metrics.count("semantic_cache.hit") == 0
+
+
+@pytest.mark.asyncio
+async def test_days_ago_queries_hit_semantic_cache(search_engine, monkeypatch):
+    import app.services.search_engine as engine_module
+
+    class _Clock(datetime):
+        """Each call is a minute later, so the built cutoff timestamps differ."""
+        ticks = 0
+
+        @classmethod
+        def now(cls, tz=None):
+            cls.ticks += 1
+            return datetime(2026, 10, 1, tzinfo=tz) + timedelta(minutes=cls.ticks)
+
+    monkeypatch.setattr(engine_module, "datetime", _Clock)
+    _serve(search_engine, _pool(100, every=1))
+    search_engine.query_parser.parse_local.return_value = ParsedQuery(semantic_query="python", days_ago=7)
+
+    await search_engine.search_candidates(SearchQuery(query="python this week", limit=10))
+    await search_engine.search_candidates(SearchQuery(query="python this week", limit=10))
+
+    assert search_engine.pinecone.search.call_count == 1
+    assert search_metrics.count("semantic_cache.hit") == 1
+
+
+@pytest.mark.asyncio
+async def test_index_change_drops_semantic_cache(search_engine):
+    _serve(search_engine, _pool(100, every=1))
+    search_engine.query_parser.parse_local.return_value = ParsedQuery(semantic_query="python")
+
+    await search_engine.search_candidates(SearchQuery(query="python", limit=10))
+    search_engine.invalidate_index_caches()
+    await search_engine.search_candidates(SearchQuery(query="python again", limit=10))
+
+    assert search_engine.pinecone.search.call_count == 2
+
+
+# ─── Slim (two-phase) retrieval ──────────────────────────────────────────────
+
+@pytest.mark.asyncio
+async def test_slim_mode_ranks_from_store_and_hydrates_page_only(search_engine):
+    from app.services.document_store import DocumentStore
+
+    full = {
+        f"owner/repo#{i}": {
+            "title": f"Issue {i}", "body": "x" * 2000, "updated_at_ts": 1_700_000_000 + i,
+            "repo_stars": i, "labels": [], "repo_topics": [],
+        }
+        for i in range(3)
+    }
+    search_engine.slim_metadata = True
+    search_engine.documents = DocumentStore(search_engine.pinecone)
+    search_engine.pinecone.search.return_value = [
+        {"id": vector_id, "score": 0.9, "metadata": {}} for vector_id in full
+    ]
+    search_engine.pinecone.fetch_by_ids.side_effect = lambda ids: {i: full[i] for i in ids}
+    search_engine.query_parser.parse_local.return_value = ParsedQuery(semantic_query="x", sort_by="stars")
+
+    candidates, _, _ = await search_engine.search_candidates(SearchQuery(query="x"))
+
+    assert search_engine.pinecone.search.call_args.kwargs["include_metadata"] is False
+    assert [c.id for c in candidates] == ["owner/repo#2", "owner/repo#1", "owner/repo#0"]
+    assert not any(c.full for c in candidates)
+    assert "body" not in candidates[0].metadata
+
+    search_engine.pinecone.fetch_by_ids.reset_mock()
+    await search_engine.hydrate(candidates[:1])
+
+    # The first fetch already cached the full documents
+    search_engine.pinecone.fetch_by_ids.assert_not_called()
+    assert candidates[0].full and candidates[0].metadata["body"]
+    assert not candidates[1].full
+
+
+@pytest.mark.asyncio
+async def test_slim_mode_dropped_rows_dont_end_the_result_set(search_engine):
+    from app.services.document_store import DocumentStore
+
+    pool = _pool(100, every=1)
+    _serve(search_engine, [{**m, "metadata": {}} for m in pool])
+    search_engine.query_parser.parse_local.return_value = ParsedQuery(semantic_query="python")
+    search_engine.slim_metadata = True
+    search_engine.documents = DocumentStore(search_engine.pinecone)
+    # One match was deleted between the vector query and the metadata fetch
+    stored = {m["id"]: m["metadata"] for m in pool[1:]}
+    search_engine.pinecone.fetch_by_ids.side_effect = lambda ids: {i: stored[i] for i in ids if i in stored}
+
+    candidates, _, complete = await search_engine.search_candidates(SearchQuery(query="python", limit=10))
+
+    assert len(candidates) == 19
+    assert complete is False
+
+
+# ─── Single-flight coalescing ────────────────────────────────────────────────
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_recent_requests_share_one_query(search_engine):
+    from tests.test_recent_feed import make_match
+
+    search_engine.recent_feed_enabled = False
+
+    async def slow_search(**kwargs):
+        await asyncio.sleep(0.01)
+        return [make_match(1, hours_ago=1)]
+
+    search_engine.pinecone.asearch.side_effect = slow_search
+
+    results = await asyncio.gather(*[
+        search_engine.get_recent_issues(sort_by="recently_discussed", languages=langs)
+        for langs in (["Python", "Go"], ["Go", "Python"], ["Python", "Go"], ["Rust"])
+    ])
+
+    assert search_engine.pinecone.asearch.call_count == 2  # Python+Go once, Rust once
+    assert results[0] == results[1] == results[2]
+    assert results[0] is not results[1]  # each caller gets its own list
+    assert search_metrics.count("singleflight.recent.shared") == 2
+    assert search_engine.single_flight_stats()["recent"]["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_coalesced_failure_reaches_every_caller(search_engine):
+    async def failing_parse(q):
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    search_engine.query_parser.aparse_remote.side_effect = failing_parse
+    search_engine.pinecone.search.side_effect = RuntimeError("pinecone down")
+
+    outcomes = await asyncio.gather(
+        *[search_engine.search_candidates(SearchQuery(query="Rust  CLI")) for _ in range(3)],
+        return_exceptions=True
+    )
+
+    assert all(isinstance(o, RuntimeError) for o in outcomes)
+    assert search_engine.pinecone.asearch.call_count == 1
+    assert search_metrics.count("singleflight.search.shared") == 2
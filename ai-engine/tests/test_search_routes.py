@@ -0,0 +1,295 @@
+"""Route-level tests for /api/search using a stub SearchEngine."""
+from __future__ import annotations
+
+import json
+import time
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.models.index_stats import IndexStats
+from app.models.query import ParsedQuery, SearchResult
+from app.middleware.server_timing import ServerTimingMiddleware
+from app.routes import search as search_routes
+from app.services.candidates import Candidate
+from app.services.search_metrics import search_metrics
+from app.services.search_snapshots import SearchSnapshotStore
+
+
+def make_result(n: int) -> SearchResult:
+    return SearchResult(
+        issue_id=n, issue_number=n, title=f"Issue {n}", body="body",
+        repo_name="repo", repo_full_name="owner/repo", repo_stars=10,
+        repo_forks=1, language="Python", labels=[], created_at="2026-01-01T00:00:00Z",
+        updated_at="2026-01-02T00:00:00Z", comments_count=0,
+        issue_url=f"https://github.com/owner/repo/issues/{n}",
+        repo_url="https://github.com/owner/repo", score=1.0 - n / 100,
+    )
+
+
+def make_candidate(n: int) -> Candidate:
+    # Pinecone returns stored numbers as floats
+    metadata = {
+        key: float(value) if isinstance(value, int) and not isinstance(value, bool) else value
+        for key, value in make_result(n).model_dump(exclude={"score"}).items()
+    }
+    return Candidate(id=f"owner/repo#{n}", score=1.0 - n / 100, metadata=metadata)
+
+
+@pytest.fixture
+def engine():
+    stub = MagicMock()
+    stub.search_candidates = AsyncMock(return_value=(
+        [make_candidate(n) for n in range(25)],
+        ParsedQuery(semantic_query="python"),
+        True,
+    ))
+    stub.parse_search_query = AsyncMock(return_value=(ParsedQuery(semantic_query="python"), None))
+    stub.retrieve_candidates = AsyncMock(return_value=([make_candidate(n) for n in range(25)], True))
+    stub.snapshots = SearchSnapshotStore()
+    stub.hydrate = AsyncMock()
+    return stub
+
+
+@pytest.fixture
+def client(engine):
+    app = FastAPI()
+    app.add_middleware(ServerTimingMiddleware)
+    app.include_router(search_routes.router)
+    app.dependency_overrides[search_routes.get_search_engine] = lambda: engine
+    return TestClient(app)
+
+
+def test_first_page_returns_cursor(client):
+    body = client.post("/api/search", json={"query": "python", "limit": 10}).json()
+
+    assert body["cursor"]
+    assert body["total"] == 25
+    assert body["total_pages"] == 3
+    assert [r["issue_number"] for r in body["results"]] == list(range(10))
+
+
+def test_server_timing_header_and_route_series(client):
+    search_metrics.reset()
+    response = client.post("/api/search", json={"query": "python", "limit": 10})
+
+    header = response.headers["server-timing"]
+    assert "serialize;dur=" in header and "total;dur=" in header
+    latency = search_metrics.snapshot()["latency_ms"]
+    assert latency["route:POST /api/search"]["count"] == 1
+    assert {"p50", "p95", "p99"} <= set(latency["route:POST /api/search.serialize"])
+
+
+def test_page_rows_match_validated_results(client):
+    body = client.post("/api/search", json={"query": "python", "limit": 10}).json()
+
+    assert body["results"][3] == make_result(3).model_dump()
+    assert isinstance(body["results"][3]["repo_stars"], int)
+
+
+def test_cursor_serves_later_pages_without_searching(client, engine):
+    first = client.post("/api/search", json={"query": "python", "limit": 10}).json()
+    second = client.post("/api/search", json={
+        "query": "python", "limit": 10, "page": 3, "cursor": first["cursor"],
+    }).json()
+
+    assert engine.search_candidates.await_count == 1
+    assert [r["issue_number"] for r in second["results"]] == list(range(20, 25))
+    assert second["has_next"] is False
+    assert second["cursor"] == first["cursor"]
+
+
+def test_cursor_for_different_query_is_ignored(client, engine):
+    first = client.post("/api/search", json={"query": "python", "limit": 10}).json()
+    client.post("/api/search", json={
+        "query": "python", "language": "Rust", "page": 2, "cursor": first["cursor"],
+    })
+
+    assert engine.search_candidates.await_count == 2
+
+
+def test_unknown_cursor_reruns_search(client, engine):
+    body = client.post("/api/search", json={"query": "python", "cursor": "stale"}).json()
+
+    assert engine.search_candidates.await_count == 1
+    assert body["cursor"] != "stale"
+
+
+def test_stats_served_from_stats_record(client, engine):
+    engine.get_index_stats = AsyncMock(return_value=IndexStats(
+        total_issues=42, unique_repos=7, last_updated="2026-01-02T00:00:00Z",
+        last_updated_ts=1767312000, language_counts={"Python": 42},
+    ))
+
+    body = client.get("/api/search/stats").json()
+
+    assert body["total_issues"] == 42
+    assert body["total_repos"] == 7
+    assert body["languages"] == {"Python": 42}
+    engine.pinecone.get_index_stats.assert_not_called()
+
+
+def test_recent_batch_returns_feeds_in_order_with_stats(client, engine):
+    engine.get_recent_feeds = AsyncMock(return_value=[[make_result(1), make_result(2)], []])
+    engine.get_index_stats = AsyncMock(return_value=IndexStats(
+        total_issues=42, last_updated="2026-01-02T00:00:00Z", last_updated_ts=1767312000,
+    ))
+
+    body = client.post("/api/search/recent/batch", json={
+        "feeds": [{"sort_by": "newest"}, {"languages": ["Rust"], "limit": 5}],
+    }).json()
+
+    assert [feed["total"] for feed in body["feeds"]] == [2, 0]
+    assert body["stats"]["timestamp"] == 1767312000.0
+    specs = engine.get_recent_feeds.await_args.args[0]
+    assert specs[1].languages == ["Rust"] and specs[1].limit == 5
+
+
+def test_stats_revalidates_with_etag(client, engine):
+    engine.get_index_stats = AsyncMock(return_value=IndexStats(total_issues=42, generation=3))
+
+    first = client.get("/api/search/stats")
+    again = client.get("/api/search/stats", headers={"If-None-Match": first.headers["ETag"]})
+    engine.get_index_stats.return_value = IndexStats(total_issues=43, generation=4)
+    changed = client.get("/api/search/stats", headers={"If-None-Match": first.headers["ETag"]})
+
+    assert first.headers["Cache-Control"].startswith("public, max-age=")
+    assert again.status_code == 304 and again.content == b""
+    assert again.headers["ETag"] == first.headers["ETag"]
+    assert changed.status_code == 200 and changed.json()["total_issues"] == 43
+
+
+def test_recent_304_skips_the_query(client, engine):
+    engine.recent_issues_version = AsyncMock(return_value=(3, 1000))
+    engine.get_recent_issues = AsyncMock(return_value=[make_result(1)])
+
+    first = client.get("/api/search/recent?sort_by=recently_discussed")
+    etag = first.headers["ETag"]
+    again = client.get("/api/search/recent?sort_by=recently_discussed", headers={"If-None-Match": f'"x", {etag}'})
+    other = client.get("/api/search/recent?sort_by=stars", headers={"If-None-Match": etag})
+
+    assert again.status_code == 304
+    assert other.status_code == 200
+    assert engine.get_recent_issues.await_count == 2
+
+
+def test_last_updated_served_from_stats_record(client, engine):
+    engine.get_index_stats = AsyncMock(return_value=IndexStats(
+        total_issues=42, last_updated="2026-03-04T00:00:00Z", last_updated_ts=1772582400,
+    ))
+    engine.get_recent_issues = AsyncMock()
+
+    body = client.get("/api/search/last-updated").json()
+
+    assert body == {"last_updated": "2026-03-04T00:00:00Z", "timestamp": 1772582400.0}
+    engine.get_recent_issues.assert_not_awaited()
+
+
+def test_last_updated_falls_back_without_stats_record(client, engine):
+    engine.get_index_stats = AsyncMock(return_value=None)
+    engine.get_recent_issues = AsyncMock(return_value=[make_result(1)])
+
+    body = client.get("/api/search/last-updated").json()
+
+    assert body["last_updated"] == "2026-01-02T00:00:00Z"
+    engine.get_recent_issues.assert_awaited_once()
+
+
+def test_incomplete_snapshot_reruns_search_for_deeper_page(client, engine):
+    engine.search_candidates.return_value = (
+        [make_candidate(n) for n in range(20)], ParsedQuery(semantic_query="python"), False,
+    )
+    first = client.post("/api/search", json={"query": "python", "limit": 10}).json()
+    assert first["has_next"] is True
+
+    client.post("/api/search", json={"query": "python", "limit": 10, "page": 2, "cursor": first["cursor"]})
+    assert engine.search_candidates.await_count == 1
+
+    client.post("/api/search", json={"query": "python", "limit": 10, "page": 3, "cursor": first["cursor"]})
+    assert engine.search_candidates.await_count == 2
+
+
+def test_fields_drops_body_from_results(client):
+    body = client.post("/api/search", json={
+        "query": "python", "limit": 5, "fields": ["issue_number", "title", "score"],
+    }).json()
+
+    assert body["results"][0] == {"issue_number": 0, "title": "Issue 0", "score": 1.0}
+
+
+def _events(response) -> list[dict]:
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_stream_sends_parsed_query_then_page_rows_in_order(client):
+    response = client.post("/api/search/stream", json={"query": "python", "limit": 10, "page": 2})
+
+    events = _events(response)
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert events[0] == {"type": "parsed", "parsed_query": ParsedQuery(semantic_query="python").model_dump()}
+    rows = [e for e in events if e["type"] == "result"]
+    assert [e["rank"] for e in rows] == list(range(11, 21))
+    assert [e["result"]["issue_number"] for e in rows] == list(range(10, 20))
+    done = events[-1]
+    assert done["type"] == "done" and done["total"] == 25 and done["has_next"]
+    assert set(done["timing_ms"]) == {"parsed", "first_result", "total"}
+
+
+def test_stream_cursor_is_shared_with_search(client, engine):
+    done = _events(client.post("/api/search/stream", json={"query": "python", "limit": 10}))[-1]
+
+    body = client.post("/api/search", json={
+        "query": "python", "limit": 10, "page": 2, "cursor": done["cursor"],
+    }).json()
+
+    assert body["page"] == 2
+    engine.search_candidates.assert_not_awaited()
+
+
+def test_stream_reports_failure_after_parsed_event(client, engine):
+    engine.retrieve_candidates.side_effect = RuntimeError("pinecone down")
+
+    events = _events(client.post("/api/search/stream", json={"query": "python"}))
+
+    assert [e["type"] for e in events] == ["parsed", "error"]
+
+
+def test_adaptive_fetch_pages_have_no_duplicates_or_gaps(search_engine):
+    """Deeper pages widen the fetch; rows already served must keep their place."""
+    search_engine.adaptive_fetch = True
+    search_engine.semantic_cache = None
+    search_engine.query_parser.parse_local.return_value = ParsedQuery(semantic_query="python")
+    # Recency varies independently of similarity, so every window ranks differently
+    now = time.time()
+    pool = [
+        {
+            "id": f"owner/repo#{i}",
+            "score": 1.0 - i / 1000,
+            "metadata": {
+                **make_result(i).model_dump(),
+                "updated_at_ts": now - (i * 7919 % 300) * 86400,
+            },
+        }
+        for i in range(300)
+    ]
+    search_engine.pinecone.search.side_effect = lambda top_k, **kw: pool[:top_k]
+    app = FastAPI()
+    app.include_router(search_routes.router)
+    app.dependency_overrides[search_routes.get_search_engine] = lambda: search_engine
+    client = TestClient(app)
+
+    seen, cursor, page = [], None, 1
+    while True:
+        body = client.post("/api/search", json={
+            "query": "python", "limit": 10, "page": page, "cursor": cursor,
+        }).json()
+        seen += [r["issue_number"] for r in body["results"]]
+        cursor = body["cursor"]
+        if not body["has_next"]:
+            break
+        page += 1
+
+    assert len(seen) == len(set(seen))
+    assert sorted(seen) == list(range(search_engine.fetch_max_top_k))